@@ -1,6 +1,11 @@
 """Multi-Language Support Module - 5 Languages with AI Translation"""
 import os
+import re
 import json
+import atexit
+import asyncio
+import hashlib
+from functools import cached_property, lru_cache
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
@@ -9,6 +14,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 프로세스마다 달라지는 hash() 기반 구버전 캐시 키 (예: "en_es_-8123456789")
+_LEGACY_CACHE_KEY = re.compile(r"^[a-z]{2}_[a-z]{2}_-?\d{1,20}$")
+
 
 class Language(Enum):
     """지원 언어"""
@@ -20,55 +34,281 @@ class Language(Enum):
     KOREAN = ("ko", "Korean", "한국어", "₩")
 
 
+# 언어 코드 조회 테이블 (Language 순회 없이 조회)
+_CODE_TO_LANG = {lang.value[0]: lang for lang in Language}
+_CODE_TO_CURRENCY = {lang.value[0]: lang.value[3] for lang in Language}
+_HREFLANG_CODES = tuple(code for code, lang in _CODE_TO_LANG.items() if lang != Language.KOREAN)  # 한국어는 제외 (모국어)
+
+# 언어별 SEO 키워드 확장
+_SEO_EXPANSIONS_BY_LANG = {
+    Language.ENGLISH: ("template", "download", "digital"),
+    Language.SPANISH: ("plantilla", "descargar", "digital"),
+    Language.PORTUGUESE: ("modelo", "baixar", "digital"),
+    Language.JAPANESE: ("テンプレート", "ダウンロード", "デジタル"),
+    Language.GERMAN: ("vorlage", "herunterladen", "digital")
+}
+
+# 문자 체계로 판별 가능한 언어의 Unicode 범위 (이미 해당 언어인 텍스트는 번역 생략)
+_SCRIPT_RANGES = {
+    Language.JAPANESE: ((0x3040, 0x30FF), (0x4E00, 0x9FFF)),               # 히라가나/가타카나, 한자
+    Language.KOREAN: ((0xAC00, 0xD7AF), (0x1100, 0x11FF), (0x3130, 0x318F))  # 한글 음절/자모
+}
+
+# 긴 텍스트는 문단/문장 단위 청크로 나눠 번역 (청크별로 캐시되어 재사용)
+_MAX_CHUNK = 1500
+_MAX_TRANSLATION_TEXT = 100_000  # 이보다 긴 텍스트는 번역하지 않음
+_PARAGRAPH_SPLIT = re.compile(r"(\n\s*\n)")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])(\s+)")
+_WHITESPACE_SPLIT = re.compile(r"(\s+)")
+
+# 구매력 기반 가격 조정
+_PRICE_ADJUSTMENTS = {
+    "en": 1.0,      # 미국 - 기본가
+    "es": 0.85,     # 스페인 - 15% 할인
+    "pt": 0.80,     # 브라질 - 20% 할인
+    "ja": 0.90,     # 일본 - 10% 할인
+    "de": 1.0       # 독일 - 기본가
+}
+
+
+def _looks_like(text: str, lang: Language) -> bool:
+    """텍스트의 문자 대부분이 해당 언어의 문자 체계인지 확인"""
+    ranges = _SCRIPT_RANGES.get(lang)
+    if not ranges:
+        return False
+    
+    letters = matched = 0
+    for ch in text:
+        if not ch.isalpha():
+            continue
+        letters += 1
+        code = ord(ch)
+        if any(low <= code <= high for low, high in ranges):
+            matched += 1
+    return letters > 0 and matched * 2 > letters
+
+
+def _hard_split(unit: str, sep: str) -> List[tuple]:
+    """문장 구분으로도 _MAX_CHUNK를 넘는 단위를 공백 기준으로, 공백이 없으면 고정 폭으로 분할"""
+    words = _WHITESPACE_SPLIT.split(unit)
+    pieces = []
+    for word, space in zip(words[0::2], words[1::2] + [sep]):
+        cuts = [word[i:i + _MAX_CHUNK] for i in range(0, len(word), _MAX_CHUNK)] or [""]
+        pieces.extend((cut, "") for cut in cuts[:-1])
+        pieces.append((cuts[-1], space))
+    return pieces
+
+
+def _chunk_text(text: str) -> List[tuple]:
+    """텍스트를 (청크, 뒤따르는 구분자) 목록으로 분할 - 이어 붙이면 원문과 동일"""
+    units = []
+    parts = _PARAGRAPH_SPLIT.split(text)
+    for para, sep in zip(parts[0::2], parts[1::2] + [""]):
+        if len(para) <= _MAX_CHUNK:
+            units.append((para, sep))
+            continue
+        sentences = _SENTENCE_SPLIT.split(para)
+        pairs = list(zip(sentences[0::2], sentences[1::2] + [""]))
+        pairs[-1] = (pairs[-1][0], pairs[-1][1] + sep)
+        for sentence, gap in pairs:
+            if len(sentence) > _MAX_CHUNK:
+                units.extend(_hard_split(sentence, gap))
+            else:
+                units.append((sentence, gap))
+    
+    # 연속된 문단/문장을 _MAX_CHUNK 이하로 묶음
+    chunks = []
+    body, trail = units[0]
+    for unit, sep in units[1:]:
+        if len(body) + len(trail) + len(unit) > _MAX_CHUNK:
+            chunks.append((body, trail))
+            body, trail = unit, sep
+        else:
+            body, trail = body + trail + unit, sep
+    chunks.append((body, trail))
+    
+    # 번역 결과는 앞뒤 공백이 제거되므로 공백은 구분자 쪽으로 옮김
+    normalized = []
+    for body, trail in chunks:
+        core = body.strip()
+        lead = body[:len(body) - len(body.lstrip())]
+        rest = body[len(lead) + len(core):] + trail
+        if not core:
+            lead, rest = lead + rest, ""
+        if lead:
+            if normalized:
+                normalized[-1] = (normalized[-1][0], normalized[-1][1] + lead)
+            else:
+                normalized.append(("", lead))
+        if core:
+            normalized.append((core, rest))
+    return normalized or [("", text)]
+
+
+@lru_cache(maxsize=1024)
+def _hreflang_urls(slug: str) -> tuple:
+    """slug별 hreflang URL (불변 튜플로 캐시)"""
+    return tuple((code, f"https://yoursite.com/{code}/templates/{slug}") for code in _HREFLANG_CODES)
+
+
 class TranslationEngine:
     """AI 번역 엔진 - 무료 API 활용"""
     
     def __init__(self):
         self.openai_key = os.getenv("OPENAI_API_KEY")
-        self.cache_file = "translations_cache.json"
+        self.cache_file = "translations_cache.jsonl"
+        self.legacy_cache_file = "translations_cache.json"
+        self.max_concurrent_requests = 5  # 비동기 번역 동시 요청 상한
+        self._pending = {}  # 아직 파일에 추가되지 않은 번역
+        self._save_threshold = 50  # 새 번역 N건마다 디스크에 저장
         self.load_cache()
+        atexit.register(self.flush_cache)
     
-    def load_cache(self):
-        """번역 캐시 로드"""
-        if os.path.exists(self.cache_file):
+    @cached_property
+    def openai_client(self):
+        """공유 OpenAI 클라이언트 - 연결 풀을 재사용해 호출마다 TLS 연결을 새로 맺지 않음"""
+        if not self.openai_key:
+            return None
+        try:
+            import openai
+        except ImportError as e:
+            logger.warning(f"OpenAI SDK not available: {e}")
+            return None
+        
+        http_client = None
+        http_factory = getattr(openai, "DefaultHttpxClient", None)
+        if http_factory is not None:
+            import httpx
+            limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
-            except:
-                self.cache = {}
-        else:
+                http_client = http_factory(http2=True, limits=limits)
+            except ImportError:  # h2 패키지가 없으면 HTTP/1.1 keep-alive
+                http_client = http_factory(limits=limits)
+        
+        client = openai.Client(api_key=self.openai_key, http_client=http_client)
+        atexit.register(client.close)
+        return client
+    
+    def load_cache(self):
+        """번역 캐시 로드 (JSONL: 한 줄에 {key: translation} 하나, 나중 줄이 우선)"""
+        self.cache = {}
+        
+        if not os.path.exists(self.cache_file):
+            self._migrate_legacy_cache()
+            return
+        
+        corrupted = False
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    self.cache.update(json.loads(line))
+                except ValueError:
+                    corrupted = True  # 중단된 쓰기로 잘린 줄은 건너뜀
+        
+        if corrupted:
+            logger.warning(f"Skipped corrupted lines in {self.cache_file}")
+            # 잘린 줄 뒤에 이어 쓰지 않도록 파일 정리
+            self.compact_cache()
+        self._drop_legacy_keys()
+    
+    def _migrate_legacy_cache(self):
+        """구버전 translations_cache.json을 JSONL 형식으로 변환"""
+        if not os.path.exists(self.legacy_cache_file):
+            return
+        try:
+            with open(self.legacy_cache_file, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Legacy translation cache unreadable, starting empty ({type(e).__name__}: {e})")
             self.cache = {}
+            return
+        self._drop_legacy_keys()
+        self.compact_cache()
+    
+    def _drop_legacy_keys(self):
+        """재시작 후 재사용할 수 없는 구버전 캐시 항목 제거"""
+        legacy = [key for key in self.cache if _LEGACY_CACHE_KEY.match(key)]
+        for key in legacy:
+            del self.cache[key]
+        if legacy:
+            logger.info(f"Dropped {len(legacy)} legacy translation cache entries")
+            self.compact_cache()
+    
+    def _dumps_line(self, key: str, value: str) -> str:
+        """캐시 한 줄 직렬화"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps({key: value}).decode("utf-8") + "\n"
+        return json.dumps({key: value}, ensure_ascii=False) + "\n"
+    
+    def flush_cache(self):
+        """아직 저장되지 않은 번역만 캐시 파일 끝에 추가"""
+        if not self._pending:
+            return
+        with open(self.cache_file, 'a', encoding='utf-8') as f:
+            f.writelines(self._dumps_line(key, value) for key, value in self._pending.items())
+        self._pending.clear()
+    
+    def compact_cache(self):
+        """캐시 파일을 현재 캐시 내용으로 다시 작성 (중복/삭제 항목 정리)
+        
+        임시 파일에 쓴 뒤 교체하므로 도중에 중단되어도 기존 캐시가 손상되지 않는다.
+        """
+        tmp_file = self.cache_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.writelines(self._dumps_line(key, value) for key, value in self.cache.items())
+        os.replace(tmp_file, self.cache_file)
+        self._pending.clear()
+    
+    def _store(self, cache_key: str, translated: str):
+        """캐시에 번역 추가 - 파일 저장은 일정 건수마다 일괄 처리"""
+        self.cache[cache_key] = translated
+        self._pending[cache_key] = translated
+        if len(self._pending) >= self._save_threshold:
+            self.flush_cache()
+    
+    def _cache_key(self, text: str, source_lang: Language, target_lang: Language) -> str:
+        """번역 캐시 키 생성 - 프로세스 간에 안정적인 BLAKE2b 다이제스트 사용"""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{source_lang.value[0]}_{target_lang.value[0]}_{digest}"
     
-    def save_cache(self):
-        """번역 캐시 저장"""
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(self.cache, f, ensure_ascii=False, indent=2)
+    def _needs_translation(self, text: str, source_lang: Language, target_lang: Language) -> bool:
+        """빈 텍스트, 같은 언어, 이미 대상 언어 문자로 된 텍스트는 번역하지 않음"""
+        if not text or text.strip() == "":
+            return False
+        if source_lang == target_lang:
+            return False
+        return not _looks_like(text, target_lang)
     
     def translate_text(self, text: str, target_lang: Language, source_lang: Language = Language.ENGLISH) -> str:
         """텍스트 번역 - 무료 대안 포함"""
-        if not text or text.strip() == "":
+        if not self._needs_translation(text, source_lang, target_lang):
             return text
         
-        cache_key = f"{source_lang.value[0]}_{target_lang.value[0]}_{hash(text)}"
+        if len(text) > _MAX_TRANSLATION_TEXT:
+            logger.warning(f"Text too long to translate ({len(text)} chars), keeping original")
+            return text
+        
+        if len(text) > _MAX_CHUNK:
+            return self._translate_chunked(text, target_lang, source_lang)
+        
+        return self._translate_single(text, target_lang, source_lang)
+    
+    def _translate_single(self, text: str, target_lang: Language, source_lang: Language) -> str:
+        """_MAX_CHUNK 이하 텍스트를 캐시 또는 번역 백엔드로 번역 (청크 분할 없음)"""
+        cache_key = self._cache_key(text, source_lang, target_lang)
         if cache_key in self.cache:
             return self.cache[cache_key]
         
         translated = text
         
         try:
-            if hasattr(self, 'openai_key') and self.openai_key:
+            client = self.openai_client
+            if client is not None:
                 try:
-                    import openai
-                    client = openai.Client(api_key=self.openai_key)
-                    
                     response = client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": f"Translate from {source_lang.value[1]} to {target_lang.value[1]}. Only return translated text."},
-                            {"role": "user", "content": text}
-                        ],
-                        max_tokens=2000,
-                        temperature=0.3
+                        **self._single_request(text, source_lang, target_lang)
                     )
                     
                     if response.choices:
@@ -86,16 +326,322 @@ class TranslationEngine:
             if translated == text:
                 translated = self._translate_google_free(text, source_lang, target_lang)
             
-            self.cache[cache_key] = translated
-            self.save_cache()
+            self._store(cache_key, translated)
             return translated
             
         except Exception as e:
             logger.error(f"Translation error: {e}")
             return text
     
-    def translate_template_content(self, content: Dict, target_langs: List[Language]) -> Dict:
-        """템플릿 콘텐츠 다국어 번역"""
+    def _single_request(self, text: str, source_lang: Language, target_lang: Language) -> Dict:
+        """단일 텍스트 번역 요청 파라미터"""
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": f"Translate from {source_lang.value[1]} to {target_lang.value[1]}. Only return translated text."},
+                {"role": "user", "content": text}
+            ],
+            "max_tokens": 2000,
+            "temperature": 0.3
+        }
+    
+    def translate_batch(self, texts: List[str], target_lang: Language, source_lang: Language = Language.ENGLISH) -> List[str]:
+        """여러 텍스트를 한 번의 요청으로 일괄 번역 - 실패 시 개별 번역"""
+        results, pending = self._split_cached(texts, source_lang, target_lang)
+        if not pending:
+            return results
+        
+        translated = {}
+        client = self.openai_client
+        if client is not None:
+            try:
+                response = client.chat.completions.create(
+                    **self._batch_request(self._unique_texts(texts, pending), source_lang, target_lang)
+                )
+                translated = self._parse_batch_response(response, len(pending))
+            except Exception as e:
+                logger.warning(f"Batch translation failed, falling back to per-item: {e}")
+        
+        return self._merge_batch(texts, results, pending, translated, target_lang, source_lang)
+    
+    async def _atranslate_batch(self, client, semaphore: asyncio.Semaphore, texts: List[str],
+                                target_lang: Language, source_lang: Language = Language.ENGLISH) -> List[str]:
+        """translate_batch의 비동기 버전 - 세마포어로 동시 요청 수 제한"""
+        results, pending = self._split_cached(texts, source_lang, target_lang)
+        if not pending:
+            return results
+        
+        translated = {}
+        if client is not None:
+            try:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        **self._batch_request(self._unique_texts(texts, pending), source_lang, target_lang)
+                    )
+                translated = self._parse_batch_response(response, len(pending))
+            except Exception as e:
+                logger.warning(f"Async batch translation failed, falling back to per-item: {e}")
+        
+        # 폴백은 캐시를 공유하므로 스레드로 넘기지 않고 순차 처리
+        return self._merge_batch(texts, results, pending, translated, target_lang, source_lang)
+    
+    def _translate_chunked(self, text: str, target_lang: Language, source_lang: Language) -> str:
+        """긴 텍스트를 청크로 나눠 일괄 번역 후 원래 구분자로 재조립"""
+        chunks = _chunk_text(text)
+        if len(chunks) == 1:
+            body, trail = chunks[0]
+            if not self._needs_translation(body, source_lang, target_lang):
+                return text
+            return self._translate_single(body, target_lang, source_lang) + trail
+        translated = self.translate_batch([body for body, _ in chunks], target_lang, source_lang)
+        return "".join(body + trail for body, (_, trail) in zip(translated, chunks))
+    
+    def _cached_chunked(self, text: str, source_lang: Language, target_lang: Language) -> Optional[str]:
+        """긴 텍스트의 모든 청크가 캐시에 있으면 재조립한 번역 반환"""
+        parts = []
+        for body, trail in _chunk_text(text):
+            if self._needs_translation(body, source_lang, target_lang):
+                cache_key = self._cache_key(body, source_lang, target_lang)
+                if cache_key not in self.cache:
+                    return None
+                body = self.cache[cache_key]
+            parts.append(body + trail)
+        return "".join(parts)
+    
+    def _lookup_cached(self, texts: List[str], source_lang: Language, target_lang: Language) -> List[str]:
+        """API 호출 없이 캐시된 번역만 적용 (없으면 원문)"""
+        return self._split_cached(texts, source_lang, target_lang, translate_long=False)[0]
+    
+    def _split_cached(self, texts: List[str], source_lang: Language, target_lang: Language,
+                      translate_long: bool = True):
+        """캐시 적중 항목을 채우고 번역이 필요한 항목 반환
+        
+        pending은 cache_key -> 해당 텍스트가 나온 index 목록으로, 같은 문자열은 한 번만 번역된다.
+        _MAX_CHUNK보다 긴 텍스트는 pending에 넣지 않고 청크 단위로 따로 처리한다.
+        """
+        results = list(texts)
+        pending = {}
+        
+        for i, text in enumerate(texts):
+            if not self._needs_translation(text, source_lang, target_lang):
+                continue
+            if len(text) > _MAX_CHUNK:
+                cached = self._cached_chunked(text, source_lang, target_lang)
+                if cached is not None:
+                    results[i] = cached
+                elif translate_long:
+                    results[i] = self.translate_text(text, target_lang, source_lang)
+                continue
+            cache_key = self._cache_key(text, source_lang, target_lang)
+            if cache_key in self.cache:
+                results[i] = self.cache[cache_key]
+            else:
+                pending.setdefault(cache_key, []).append(i)
+        
+        return results, pending
+    
+    def _unique_texts(self, texts: List[str], pending: Dict[str, List[int]]) -> List[str]:
+        """번역이 필요한 고유 문자열 (pending 순서)"""
+        return [texts[indices[0]] for indices in pending.values()]
+    
+    def _merge_batch(self, texts: List[str], results: List[str], pending: Dict[str, List[int]],
+                     translated: Dict[int, str], target_lang: Language, source_lang: Language) -> List[str]:
+        """일괄 번역 결과를 결과 목록과 캐시에 반영 - 응답에서 누락된 항목만 개별 번역"""
+        for position, (cache_key, indices) in enumerate(pending.items()):
+            if position in translated:
+                value = translated[position]
+                self._store(cache_key, value)
+            else:
+                value = self._translate_single(texts[indices[0]], target_lang, source_lang)
+            for i in indices:
+                results[i] = value
+        
+        return results
+    
+    def _batch_request(self, texts: List[str], source_lang: Language, target_lang: Language) -> Dict:
+        """번호가 매겨진 JSON 목록 형태의 일괄 번역 요청 파라미터"""
+        payload = {"items": [{"i": i, "t": text} for i, text in enumerate(texts)]}
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": (
+                    f"Translate each item's \"t\" from {source_lang.value[1]} to {target_lang.value[1]}. "
+                    'Return JSON {"items":[{"i":<same i>,"t":"<translated>"},...]} with every item.'
+                )},
+                {"role": "user", "content": json.dumps(payload, ensure_ascii=False)}
+            ],
+            "response_format": {"type": "json_object"},
+            "max_tokens": 4000,
+            "temperature": 0.3
+        }
+    
+    def _parse_batch_response(self, response, count: int) -> Dict[int, str]:
+        """일괄 번역 응답 파싱 (index -> 번역문)"""
+        if not response.choices or not response.choices[0].message or not response.choices[0].message.content:
+            return {}
+        
+        items = json.loads(response.choices[0].message.content).get("items", [])
+        translated = {}
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get("i"), int) and isinstance(item.get("t"), str):
+                if 0 <= item["i"] < count and item["t"].strip():
+                    translated[item["i"]] = item["t"].strip()
+        return translated
+    
+    def submit_batch(self, jobs: List[Dict]) -> Optional[str]:
+        """OpenAI Batch API로 번역 작업 제출 (24시간 내 처리, 비용 약 50% 절감)
+        
+        jobs: [{"text": str, "target_lang": Language, "source_lang": Language}, ...]
+        결과는 poll_batch()로 가져와 기존 캐시 키 형식으로 저장된다.
+        """
+        if not self.openai_key:
+            logger.warning("OPENAI_API_KEY not set, batch translation skipped")
+            return None
+        
+        lines = []
+        queued = set()
+        for job in jobs:
+            full_text = job.get("text")
+            source_lang = job.get("source_lang", Language.ENGLISH)
+            if not self._needs_translation(full_text, source_lang, job["target_lang"]):
+                continue
+            if len(full_text) > _MAX_TRANSLATION_TEXT:
+                continue
+            
+            # 긴 텍스트는 청크별로 요청 (동기 경로와 같은 캐시 키)
+            texts = [body for body, _ in _chunk_text(full_text)] if len(full_text) > _MAX_CHUNK else [full_text]
+            for text in texts:
+                if not self._needs_translation(text, source_lang, job["target_lang"]):
+                    continue
+                cache_key = self._cache_key(text, source_lang, job["target_lang"])
+                if cache_key in self.cache or cache_key in queued:
+                    continue
+                queued.add(cache_key)
+                lines.append(json.dumps({
+                    "custom_id": cache_key,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._single_request(text, source_lang, job["target_lang"])
+                }, ensure_ascii=False))
+        
+        if not lines:
+            logger.info("All batch translations already cached")
+            return None
+        
+        client = self.openai_client
+        if client is None:
+            return None
+        
+        try:
+            batch_file = client.files.create(
+                file=("translations_batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            logger.info(f"Submitted translation batch {batch.id} ({len(lines)} requests)")
+            return batch.id
+            
+        except Exception as e:
+            logger.error(f"Batch submission error: {e}")
+            return None
+    
+    def poll_batch(self, batch_id: str) -> Dict:
+        """Batch 작업 상태 확인 - 완료 시 결과를 번역 캐시에 저장"""
+        result = {"batch_id": batch_id, "status": "unknown", "cached": 0}
+        
+        client = self.openai_client
+        if client is None:
+            result["error"] = "OpenAI client not available"
+            return result
+        
+        try:
+            batch = client.batches.retrieve(batch_id)
+            result["status"] = batch.status
+            if batch.status != "completed" or not batch.output_file_id:
+                return result
+            
+            output = client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    response = record["response"]
+                    content = response["body"]["choices"][0]["message"]["content"]
+                except (ValueError, KeyError, IndexError, TypeError):
+                    continue
+                
+                if response.get("status_code") == 200 and content and content.strip():
+                    self._store(record["custom_id"], content.strip())
+                    result["cached"] += 1
+            
+            self.flush_cache()
+            logger.info(f"Batch {batch_id}: {result['cached']} translations cached")
+            
+        except Exception as e:
+            logger.error(f"Batch polling error: {e}")
+            result["error"] = str(e)
+        
+        return result
+    
+    def template_batch_jobs(self, content: Dict, target_langs: List[Language]) -> List[Dict]:
+        """템플릿 번역 + SEO 설명에 필요한 Batch 작업 목록"""
+        jobs = []
+        for lang in target_langs:
+            if lang != Language.ENGLISH:
+                _, texts, _ = self._collect_translatable(content)
+                jobs.extend({"text": text, "target_lang": lang} for text in texts)
+            jobs.append({"text": content.get("description", "")[:160], "target_lang": lang})
+        return jobs
+    
+    def _collect_translatable(self, content: Dict):
+        """번역 대상 문자열을 하나의 목록으로 수집 (필드/키워드/태그)"""
+        lang_content = {}
+        texts = []
+        slots = []  # (field, list index or None)
+        
+        fields_to_translate = [
+            "name", "description", "full_description", 
+            "marketing_copy", "usage_guide"
+        ]
+        
+        for field in fields_to_translate:
+            if field in content:
+                original_text = str(content[field])
+                lang_content[field] = original_text
+                if len(original_text) > 10:  # 10자 이상만 번역
+                    texts.append(original_text)
+                    slots.append((field, None))
+        
+        for list_field in ("seo_keywords", "tags"):
+            if list_field in content:
+                lang_content[list_field] = list(content[list_field])
+                for j, item in enumerate(lang_content[list_field]):
+                    texts.append(item)
+                    slots.append((list_field, j))
+        
+        return lang_content, texts, slots
+    
+    def _apply_translations(self, lang_content: Dict, slots: List, translated: List[str], lang: Language) -> Dict:
+        """번역 결과를 원래 위치에 배치하고 메타데이터 추가"""
+        for (field, j), value in zip(slots, translated):
+            if j is None:
+                lang_content[field] = value
+            else:
+                lang_content[field][j] = value
+        
+        lang_content["language"] = lang.value[0]
+        lang_content["language_name"] = lang.value[1]
+        lang_content["translated_at"] = datetime.now().isoformat()
+        return lang_content
+    
+    def translate_template_content(self, content: Dict, target_langs: List[Language], cached_only: bool = False) -> Dict:
+        """템플릿 콘텐츠 다국어 번역 (cached_only=True면 API 호출 없이 캐시만 사용)"""
         translated_content = {
             "original": content,
             "translations": {}
@@ -106,74 +652,98 @@ class TranslationEngine:
                 translated_content["translations"][lang.value[0]] = content
                 continue
             
-            lang_content = {}
-            
-            # 각 필드 번역
-            fields_to_translate = [
-                "name", "description", "full_description", 
-                "marketing_copy", "usage_guide"
-            ]
-            
-            for field in fields_to_translate:
-                if field in content:
-                    original_text = str(content[field])
-                    if len(original_text) > 10:  # 10자 이상만 번역
-                        translated = self.translate_text(
-                            original_text, 
-                            lang,
-                            Language.ENGLISH
-                        )
-                    else:
-                        translated = original_text
-                    
-                    lang_content[field] = translated
-            
-            # SEO 키워드 번역
-            if "seo_keywords" in content:
-                translated_keywords = []
-                for keyword in content["seo_keywords"]:
-                    translated_kw = self.translate_text(keyword, lang, Language.ENGLISH)
-                    translated_keywords.append(translated_kw)
-                lang_content["seo_keywords"] = translated_keywords
-            
-            # 태그 번역
-            if "tags" in content:
-                translated_tags = []
-                for tag in content["tags"]:
-                    translated_tag = self.translate_text(tag, lang, Language.ENGLISH)
-                    translated_tags.append(translated_tag)
-                lang_content["tags"] = translated_tags
+            # 언어당 한 번의 요청으로 번역
+            lang_content, texts, slots = self._collect_translatable(content)
+            if cached_only:
+                translated = self._lookup_cached(texts, Language.ENGLISH, lang)
+            else:
+                translated = self.translate_batch(texts, lang, Language.ENGLISH)
+            translated_content["translations"][lang.value[0]] = self._apply_translations(
+                lang_content, slots, translated, lang
+            )
+        
+        return translated_content
+    
+    def _async_client(self):
+        """비동기 OpenAI 클라이언트 (키가 없거나 SDK가 없으면 None)"""
+        if not self.openai_key:
+            return None
+        try:
+            import openai
+            return openai.AsyncClient(api_key=self.openai_key)
+        except Exception as e:
+            logger.warning(f"Async OpenAI client not available: {e}")
+            return None
+    
+    async def atranslate_template_content(self, content: Dict, target_langs: List[Language],
+                                          seo_langs: Optional[List[Language]] = None) -> Dict:
+        """템플릿 콘텐츠 다국어 번역 - 언어별 요청을 동시에 실행
+        
+        seo_langs가 주어지면 해당 언어의 SEO 메타데이터도 함께 생성해 "seo_metadata"에 담는다.
+        """
+        client = self._async_client()
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        translate_langs = [lang for lang in target_langs if lang != Language.ENGLISH]
+        seo_langs = seo_langs or []
+        description = content.get("description", "")[:160]
+        
+        async def translate_lang(lang: Language) -> Dict:
+            # 콘텐츠와 SEO 설명을 한 요청에 묶어 중복 문자열(예: 짧은 description)도 한 번만 번역
+            if lang in translate_langs:
+                lang_content, texts, slots = self._collect_translatable(content)
+            else:
+                lang_content, texts, slots = {}, [], []
+            if lang in seo_langs:
+                texts = texts + [description]
             
-            # 메타데이터 추가
-            lang_content["language"] = lang.value[0]
-            lang_content["language_name"] = lang.value[1]
-            lang_content["translated_at"] = datetime.now().isoformat()
+            translated = await self._atranslate_batch(client, semaphore, texts, lang, Language.ENGLISH)
             
-            translated_content["translations"][lang.value[0]] = lang_content
+            entry = {}
+            if lang in translate_langs:
+                entry["content"] = self._apply_translations(lang_content, slots, translated, lang)
+            if lang in seo_langs:
+                entry["seo"] = self._build_seo_metadata(content, lang, translated[-1])
+            return entry
+        
+        langs = list(dict.fromkeys(translate_langs + list(seo_langs)))
+        try:
+            gathered = await asyncio.gather(*[translate_lang(lang) for lang in langs])
+        finally:
+            if client is not None:
+                await client.close()
+        
+        by_code = {lang.value[0]: entry for lang, entry in zip(langs, gathered)}
+        translated_content = {
+            "original": content,
+            "translations": {
+                lang.value[0]: content if lang == Language.ENGLISH else by_code[lang.value[0]]["content"]
+                for lang in target_langs
+            }
+        }
+        if seo_langs:
+            translated_content["seo_metadata"] = {
+                lang.value[0]: by_code[lang.value[0]]["seo"] for lang in seo_langs
+            }
         
         return translated_content
     
-    def generate_seo_metadata(self, template_data: Dict, lang: Language) -> Dict:
+    def generate_seo_metadata(self, template_data: Dict, lang: Language, cached_only: bool = False) -> Dict:
         """SEO 메타데이터 생성"""
+        description = template_data.get("description", "")[:160]
+        if cached_only:
+            meta_description = self._lookup_cached([description], Language.ENGLISH, lang)[0]
+        else:
+            meta_description = self.translate_text(description, lang)
+        return self._build_seo_metadata(template_data, lang, meta_description)
+    
+    def _build_seo_metadata(self, template_data: Dict, lang: Language, meta_description: str) -> Dict:
+        """번역된 설명으로 SEO 메타데이터 구성"""
         base_keywords = template_data.get("seo_keywords", [])
-        
-        # 언어별 SEO 키워드 확장
-        seo_expansions = {
-            Language.ENGLISH: ["template", "download", "digital"],
-            Language.SPANISH: ["plantilla", "descargar", "digital"],
-            Language.PORTUGUESE: ["modelo", "baixar", "digital"],
-            Language.JAPANESE: ["テンプレート", "ダウンロード", "デジタル"],
-            Language.GERMAN: ["vorlage", "herunterladen", "digital"]
-        }
-        
-        expanded_keywords = base_keywords + seo_expansions.get(lang, [])
+        expanded_keywords = [*base_keywords, *_SEO_EXPANSIONS_BY_LANG.get(lang, ())]
         
         return {
             "meta_title": f"{template_data['name']} - {lang.value[1]} Template",
-            "meta_description": self.translate_text(
-                template_data.get("description", "")[:160], 
-                lang
-            ),
+            "meta_description": meta_description,
             "keywords": expanded_keywords,
             "language": lang.value[0],
             "hreflang": self.generate_hreflang(template_data.get("slug", "")),
@@ -182,14 +752,7 @@ class TranslationEngine:
     
     def generate_hreflang(self, slug: str) -> Dict:
         """hreflang 태그 생성"""
-        hreflang = {}
-        
-        for lang in Language:
-            if lang == Language.KOREAN:  # 한국어는 제외 (모국어)
-                continue
-            hreflang[lang.value[0]] = f"https://yoursite.com/{lang.value[0]}/templates/{slug}"
-        
-        return hreflang
+        return dict(_hreflang_urls(slug))
 
 
 class MultiLanguageContentManager:
@@ -205,25 +768,58 @@ class MultiLanguageContentManager:
             Language.GERMAN
         ]
     
-    def create_multilingual_template(self, original_template: Dict) -> Dict:
-        """다국어 템플릿 생성"""
+    def create_multilingual_template(self, original_template: Dict, bulk: bool = False) -> Dict:
+        """다국어 템플릿 생성
+        
+        bulk=True면 번역을 OpenAI Batch API로 제출하고 현재 캐시된 번역만으로 결과를 구성한다.
+        poll_batch()로 결과를 받은 뒤 다시 호출하면 전체 번역이 채워진다.
+        """
         logger.info(f"Creating multilingual template: {original_template.get('name')}")
         
-        # 번역 생성
-        translated_content = self.translator.translate_template_content(
-            original_template,
-            self.supported_languages
-        )
-        
-        # SEO 메타데이터 생성
-        seo_metadata = {}
-        for lang in self.supported_languages:
-            seo_metadata[lang.value[0]] = self.translator.generate_seo_metadata(
-                original_template, 
-                lang
+        if bulk:
+            batch_id = self.translator.submit_batch(
+                self.translator.template_batch_jobs(original_template, self.supported_languages)
+            )
+            translated_content = self.translator.translate_template_content(
+                original_template,
+                self.supported_languages,
+                cached_only=True
+            )
+            seo_metadata = {
+                lang.value[0]: self.translator.generate_seo_metadata(original_template, lang, cached_only=True)
+                for lang in self.supported_languages
+            }
+            return self._assemble(original_template, translated_content, seo_metadata, batch_id)
+        
+        # 번역 + SEO 메타데이터를 언어별로 동시에 생성
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            translated_content = asyncio.run(self.translator.atranslate_template_content(
+                original_template,
+                self.supported_languages,
+                seo_langs=self.supported_languages
+            ))
+            seo_metadata = translated_content["seo_metadata"]
+        else:
+            # 이미 이벤트 루프 안에서 호출된 경우 동기 경로 사용
+            translated_content = self.translator.translate_template_content(
+                original_template,
+                self.supported_languages
             )
+            seo_metadata = {}
+            for lang in self.supported_languages:
+                seo_metadata[lang.value[0]] = self.translator.generate_seo_metadata(
+                    original_template, 
+                    lang
+                )
         
-        return {
+        return self._assemble(original_template, translated_content, seo_metadata)
+    
+    def _assemble(self, original_template: Dict, translated_content: Dict, seo_metadata: Dict,
+                  batch_id: Optional[str] = None) -> Dict:
+        """다국어 템플릿 결과 구성"""
+        result = {
             "template_id": original_template.get("id"),
             "original": original_template,
             "translations": translated_content["translations"],
@@ -231,6 +827,9 @@ class MultiLanguageContentManager:
             "supported_languages": [lang.value[0] for lang in self.supported_languages],
             "created_at": datetime.now().isoformat()
         }
+        if batch_id:
+            result["translation_batch_id"] = batch_id
+        return result
     
     def get_localized_product_data(self, template_id: str, language: str) -> Dict:
         """언어별 제품 데이터 반환"""
@@ -247,23 +846,11 @@ class MultiLanguageContentManager:
     
     def get_currency_symbol(self, language: str) -> str:
         """통화 기호 반환"""
-        for lang in Language:
-            if lang.value[0] == language:
-                return lang.value[3]
-        return "$"
+        return _CODE_TO_CURRENCY.get(language, "$")
     
     def get_localized_price(self, language: str, base_usd: float = 49) -> float:
         """지역별 가격 최적화"""
-        # 구매력 기반 가격 조정
-        price_adjustments = {
-            "en": 1.0,      # 미국 - 기본가
-            "es": 0.85,     # 스페인 - 15% 할인
-            "pt": 0.80,     # 브라질 - 20% 할인
-            "ja": 0.90,     # 일본 - 10% 할인
-            "de": 1.0       # 독일 - 기본가
-        }
-        
-        adjustment = price_adjustments.get(language, 1.0)
+        adjustment = _PRICE_ADJUSTMENTS.get(language, 1.0)
         return round(base_usd * adjustment, 2)
     
     def generate_language_report(self) -> Dict:
@@ -302,6 +889,25 @@ class MultiLanguageContentManager:
         }
 
 
-# Export
-translation_engine = TranslationEngine()
-multilingual_manager = MultiLanguageContentManager()
+# Export - 최초 사용 시 생성 (import만으로 캐시 파일을 읽지 않음)
+@lru_cache(maxsize=1)
+def get_translation_engine() -> TranslationEngine:
+    return TranslationEngine()
+
+
+@lru_cache(maxsize=1)
+def get_multilingual_manager() -> MultiLanguageContentManager:
+    return MultiLanguageContentManager()
+
+
+_LAZY_EXPORTS = {
+    "translation_engine": get_translation_engine,
+    "multilingual_manager": get_multilingual_manager
+}
+
+
+def __getattr__(name):
+    # 기존 `from ai.multilingual import multilingual_manager` 호환
+    if name in _LAZY_EXPORTS:
+        return _LAZY_EXPORTS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
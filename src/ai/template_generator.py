@@ -1,53 +1,140 @@
 """AI Template Generator - Core AI Engine for Autonomous Template Creation"""
-# ✅ 반드시 최상위에 위치해야 함!
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-# .env 파일 로드 (최초 1회만)
-ENV_LOADED = False
-try:
-    PROJECT_ROOT = Path(__file__).parent.parent
-    env_path = PROJECT_ROOT / ".env"
-    if env_path.exists():
-        load_dotenv(env_path, override=True)
-        ENV_LOADED = True
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        if api_key:
-            print(f"✅ API Key loaded successfully: {api_key[:20]}...")
-        else:
-            print("⚠️ OPENAI_API_KEY not found in .env")
-    else:
-        print("⚠️ .env file not found")
-except Exception as e:
-    print(f"⚠️ Error loading .env: {e}")
+import importlib.util
 
 import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+import re
 import json
+import time
+import random
 import uuid
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from functools import cached_property, lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
-# Try to import AI libraries, handle gracefully if not available
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# AI SDK는 실제로 클라이언트를 만들 때 import (모듈 import만으로 SDK를 로드하지 않음)
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+if not OPENAI_AVAILABLE:
     logger.warning("OpenAI not available")
 
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+if not ANTHROPIC_AVAILABLE:
     logger.warning("Anthropic not available")
 
+ENV_LOADED = False
+
+
+@lru_cache(maxsize=1)
+def load_env() -> bool:
+    """.env 파일 로드 (최초 1회만)"""
+    global ENV_LOADED
+    try:
+        from dotenv import load_dotenv
+        
+        PROJECT_ROOT = Path(__file__).parent.parent
+        env_path = PROJECT_ROOT / ".env"
+        if env_path.exists():
+            load_dotenv(env_path, override=True)
+            ENV_LOADED = True
+            api_key = os.getenv("OPENAI_API_KEY", "")
+            if api_key:
+                print(f"✅ API Key loaded successfully: {api_key[:20]}...")
+            else:
+                print("⚠️ OPENAI_API_KEY not found in .env")
+        else:
+            print("⚠️ .env file not found")
+    except Exception as e:
+        print(f"⚠️ Error loading .env: {e}")
+    return ENV_LOADED
+
+
+ANALYSIS_CACHE_FILE = "analysis_cache.jsonl"
+ANALYSIS_CACHE_TTL = 3600  # 1시간
+
+
+def _json_default(value):
+    """Enum/datetime을 JSON 값으로 변환"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _digest(data) -> str:
+    """정규화된 JSON의 안정적인 다이제스트 (키 순서 무관)"""
+    canonical = json.dumps(data, sort_keys=True, default=_json_default, ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class _JSONFieldStream:
+    """스트리밍 텍스트에서 최상위 JSON 객체의 필드가 완성될 때마다 (key, value) 반환
+    
+    문자열/중첩 깊이만 추적하는 단순한 괄호 매칭으로, 첫 '{' 이전의 텍스트는 무시한다.
+    """
+    
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+        self._done = False
+    
+    def feed(self, chunk: str) -> List[Tuple[str, object]]:
+        self.text += chunk
+        fields = []
+        
+        while self._pos < len(self.text) and not self._done:
+            ch = self.text[self._pos]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self._member_start is None:
+                if ch == "{":
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    fields.extend(self._member(self._pos))
+                    self._done = True
+            elif ch == "," and self._depth == 1:
+                fields.extend(self._member(self._pos))
+                self._member_start = self._pos + 1
+            
+            self._pos += 1
+        
+        return fields
+    
+    def _member(self, end: int) -> List[Tuple[str, object]]:
+        member = self.text[self._member_start:end].strip()
+        if not member:
+            return []
+        try:
+            return list(json.loads("{" + member + "}").items())
+        except ValueError:
+            return []
+
 
 class TemplateType(Enum):
     NOTION = "notion"
@@ -77,6 +164,36 @@ class PricingTier(Enum):
     BUNDLE_ALL_ACCESS = "bundle_all_access"
 
 
+# 가격 티어별 기본 가격 범위 (양 끝 포함)
+_TIER_PRICE_RANGES = {
+    PricingTier.LOW: (8, 19),
+    PricingTier.MID: (40, 80),
+    PricingTier.HIGH: (100, 250),
+    PricingTier.BUNDLE_BASIC: (49, 79),
+    PricingTier.BUNDLE_PREMIUM: (99, 149),
+    PricingTier.BUNDLE_ALL_ACCESS: (199, 389)
+}
+
+
+# 니치 키워드 -> 카테고리 (앞선 규칙이 우선)
+_NICHE_CATEGORY_RULES = (
+    (TemplateCategory.FINANCE, ("budget", "finance", "money", "investment")),
+    (TemplateCategory.PLANNING, ("plan", "schedule", "calendar", "organize")),
+    (TemplateCategory.MARKETING, ("marketing", "content", "social", "business")),
+    (TemplateCategory.EDUCATION, ("educate", "course", "learn", "student")),
+    (TemplateCategory.CREATIVE, ("creative", "design", "art")),
+    (TemplateCategory.BUSINESS, ("business", "project", "management")),
+)
+_NICHE_KEYWORD_PRIORITY = {}
+for _priority, (_, _keywords) in enumerate(_NICHE_CATEGORY_RULES):
+    for _keyword in _keywords:
+        _NICHE_KEYWORD_PRIORITY.setdefault(_keyword, _priority)
+# 전방탐색으로 겹치는 위치의 키워드도 모두 찾음 (부분 문자열 일치)
+_NICHE_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_NICHE_KEYWORD_PRIORITY, key=_NICHE_KEYWORD_PRIORITY.get)) + "))"
+)
+
+
 @dataclass
 class TemplateSpec:
     """템플릿 스펙"""
@@ -113,8 +230,12 @@ class TemplateAIGenerator:
     """AI 템플릿 생성기 - 핵심 자율 의사결정 엔진"""
     
     def __init__(self, openai_key: str = None, anthropic_key: str = None):
-        self.openai_client = openai.Client(api_key=openai_key or os.getenv("OPENAI_API_KEY"))
-        self.anthropic_client = Anthropic(api_key=anthropic_key or os.getenv("ANTHROPIC_API_KEY"))
+        if not ANTHROPIC_AVAILABLE:
+            raise ImportError("anthropic package is required for TemplateAIGenerator")
+        
+        load_env()
+        self._openai_key = openai_key or os.getenv("OPENAI_API_KEY")
+        self._anthropic_key = anthropic_key or os.getenv("ANTHROPIC_API_KEY")
         
         self.successful_sellers = [
             {"name": "Thomas Frank", "revenue": "$2.1M/year", "strategy": "bundling, youtube"},
@@ -124,9 +245,217 @@ class TemplateAIGenerator:
         
         self.trending_niches = []
         self.generated_templates = []
+        self._rng = random.Random()
+        
+        # AI 결과 캐시 (kind -> key -> (timestamp, value)), TTL 내 재실행 시 재사용
+        self.cache_file = ANALYSIS_CACHE_FILE
+        self.cache_ttl = ANALYSIS_CACHE_TTL
+        self._result_cache = {"analysis": {}, "spec": {}, "sections": {}}
+        self._cache_lock = threading.Lock()
+        self._load_result_cache()
+        
+        # 병렬 생성 시 분당 요청 한도를 넘지 않도록 동시 API 호출 수 제한
+        self.max_concurrent_requests = 4
+        self._api_slots = threading.Semaphore(self.max_concurrent_requests)
+    
+    def _create_message(self, prompt: str, max_tokens: int):
+        """Claude 호출 (동시 호출 수 제한)"""
+        with self._api_slots:
+            return self.anthropic_client.messages.create(
+                model="claude-sonnet-4-20250514",
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            )
+    
+    @cached_property
+    def openai_client(self):
+        """OpenAI 클라이언트 (최초 사용 시 생성)"""
+        import openai
+        return openai.Client(api_key=self._openai_key)
+    
+    @cached_property
+    def anthropic_client(self):
+        """Anthropic 클라이언트 (최초 사용 시 생성)"""
+        from anthropic import Anthropic
+        return Anthropic(api_key=self._anthropic_key)
+    
+    def _load_result_cache(self):
+        """디스크의 AI 결과 캐시 로드 (만료/손상된 줄이 있으면 파일 정리)"""
+        if not os.path.exists(self.cache_file):
+            return
+        
+        stale = False
+        now = time.time()
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    if now - entry["ts"] > self.cache_ttl:
+                        stale = True
+                        continue
+                    value = self._deserialize(entry["kind"], entry["value"])
+                    self._result_cache[entry["kind"]][entry["key"]] = (entry["ts"], value)
+                except (ValueError, KeyError, TypeError):
+                    stale = True
+        
+        if stale:
+            tmp_file = self.cache_file + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for kind, entries in self._result_cache.items():
+                    for key, (ts, value) in entries.items():
+                        f.write(self._cache_line(kind, key, ts, value))
+            os.replace(tmp_file, self.cache_file)
+    
+    def _cache_line(self, kind: str, key: str, ts: float, value) -> str:
+        """캐시 한 줄 직렬화"""
+        if kind in ("analysis", "spec"):
+            value = asdict(value)
+        return json.dumps(
+            {"kind": kind, "key": key, "ts": ts, "value": value},
+            default=_json_default, ensure_ascii=False
+        ) + "\n"
+    
+    def _deserialize(self, kind: str, data: Dict):
+        """캐시 값 복원"""
+        if kind == "analysis":
+            return TrendAnalysis(**{
+                **data,
+                "recommended_price_range": tuple(data["recommended_price_range"]),
+                "template_type": TemplateType(data["template_type"])
+            })
+        if kind == "spec":
+            return TemplateSpec(**{
+                **data,
+                "type": TemplateType(data["type"]),
+                "category": TemplateCategory(data["category"]),
+                "price_tier": PricingTier(data["price_tier"]),
+                "created_at": datetime.fromisoformat(data["created_at"])
+            })
+        return data
+    
+    def _cached(self, kind: str, key: str):
+        """TTL 내의 캐시 값 조회"""
+        entry = self._result_cache[kind].get(key)
+        if entry and time.time() - entry[0] <= self.cache_ttl:
+            return entry[1]
+        return None
+    
+    def _remember(self, kind: str, key: str, value):
+        """캐시 저장 (메모리 + 파일 끝에 추가)"""
+        ts = time.time()
+        with self._cache_lock:
+            self._result_cache[kind][key] = (ts, value)
+            try:
+                with open(self.cache_file, 'a', encoding='utf-8') as f:
+                    f.write(self._cache_line(kind, key, ts, value))
+            except OSError as e:
+                logger.warning(f"Could not persist AI result cache: {e}")
+    
+    def generate_template_end_to_end(self, market_data: List[Dict]) -> Dict:
+        """트렌드 분석/스펙/콘텐츠/디자인 프롬프트를 한 번의 AI 호출로 생성
+        
+        결과는 캐시되어 analyze_trends_and_decide, generate_template_spec,
+        generate_template_content, create_design_prompt가 추가 호출 없이 재사용한다.
+        """
+        key = _digest(market_data)
+        analysis = self._cached("analysis", key)
+        spec = self._cached("spec", _digest(asdict(analysis))) if analysis else None
+        sections = self._cached("sections", spec.id) if spec else None
+        if sections:
+            return {"trend_analysis": analysis, "spec": spec, **sections}
+        
+        logger.info("Generating template end-to-end with a single AI call...")
         
+        prompt = f"""
+You are an expert template business analyst and product designer. Analyze the following market data,
+make autonomous decisions, and produce a complete template in one pass.
+
+Market Data: {json.dumps(market_data, indent=2)}
+
+Successful Sellers Strategy:
+{json.dumps(self.successful_sellers, indent=2)}
+
+Return a single JSON object with exactly these four keys:
+
+"trend_analysis": {{
+  niche, trend_score (0-1), competition_level (low/medium/high), growth_rate,
+  recommended_price_range ([min, max]), top_performers (top 3 templates),
+  market_gap (3 opportunities competitors are missing), recommendations (5 items),
+  template_type (notion/canva/pdf/excel/digital_planner), bundle_opportunities
+}},
+"spec": {{
+  name, description (150-200 chars), features (5-7 items), target_audience,
+  price_tier (low/mid/high/bundle_basic/bundle_premium/bundle_all_access),
+  estimated_price (within recommended_price_range), bundle_products (empty if not a bundle)
+}},
+"content": {{
+  full_description, template_structure, page_contents, usage_guide,
+  marketing_copy, seo_keywords
+}},
+"design_prompt": "detailed Canva/DALL-E design prompt for the template: modern clean aesthetic,
+  clear visual hierarchy, header with template name, sections matching features, footer/CTA"
+"""
+        
+        try:
+            response = self._create_message(
+                max_tokens=5000,
+                prompt=prompt
+            )
+            
+            result = json.loads(response.content[0].text)
+            
+            analysis = self._trend_from_result(result["trend_analysis"])
+            spec = self._spec_from_result(result["spec"], analysis, self._calculate_optimal_price(analysis))
+            sections = {
+                "content": result.get("content") or self._fallback_content(spec),
+                "design_prompt": str(result.get("design_prompt") or "").strip() or self._fallback_design_prompt(spec)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in end-to-end generation: {e}")
+            analysis = self._fallback_trend_analysis()
+            spec = self._fallback_template_spec(analysis)
+            return {
+                "trend_analysis": analysis,
+                "spec": spec,
+                "content": self._fallback_content(spec),
+                "design_prompt": self._fallback_design_prompt(spec)
+            }
+        
+        self._remember("analysis", key, analysis)
+        self._remember("spec", _digest(asdict(analysis)), spec)
+        self._remember("sections", spec.id, sections)
+        return {"trend_analysis": analysis, "spec": spec, **sections}
+    
+    def run_for_template(self, market_chunk: List[Dict]) -> Dict:
+        """시장 데이터 한 묶음으로 템플릿 하나 생성"""
+        return self.generate_template_end_to_end(market_chunk)
+    
+    def generate_templates(self, market_chunks: List[List[Dict]], max_workers: int = 8) -> Dict:
+        """여러 템플릿을 병렬 생성한 뒤 번들 전략 결정
+        
+        각 생성은 네트워크 대기 위주라 스레드로 동시에 실행하고, 실제 API 동시 호출 수는
+        max_concurrent_requests로 제한된다.
+        """
+        logger.info(f"Generating {len(market_chunks)} templates in parallel...")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            templates = list(executor.map(self.run_for_template, market_chunks))
+        
+        return {
+            "templates": templates,
+            "bundle_strategy": self.decide_bundle_strategy([t["spec"] for t in templates])
+        }
+    
     def analyze_trends_and_decide(self, market_data: List[Dict]) -> TrendAnalysis:
         """트렌드 분석 후 자율 결정"""
+        key = _digest(market_data)
+        cached = self._cached("analysis", key)
+        if cached:
+            return cached
+        
         logger.info("Analyzing market trends for template decisions...")
         
         prompt = f"""
@@ -158,33 +487,43 @@ Return your decision as a JSON object with these fields:
 """
         
         try:
-            response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
+            response = self._create_message(
                 max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
+                prompt=prompt
             )
             
             result = json.loads(response.content[0].text)
             
-            return TrendAnalysis(
-                niche=result.get("niche", "Productivity"),
-                trend_score=result.get("trend_score", 0.7),
-                competition_level=result.get("competition_level", "medium"),
-                growth_rate=result.get("growth_rate", 0.15),
-                recommended_price_range=tuple(result.get("recommended_price_range", [29, 79])),
-                top_performers=result.get("top_performers", []),
-                market_gap=result.get("market_gap", []),
-                recommendations=result.get("recommendations", []),
-                template_type=TemplateType(result.get("template_type", "notion")),
-                bundle_opportunities=result.get("bundle_opportunities", [])
-            )
+            analysis = self._trend_from_result(result)
+            self._remember("analysis", key, analysis)
+            return analysis
             
         except Exception as e:
             logger.error(f"Error in trend analysis: {e}")
             return self._fallback_trend_analysis()
     
+    def _trend_from_result(self, result: Dict) -> TrendAnalysis:
+        """AI 응답(JSON)을 TrendAnalysis로 변환"""
+        return TrendAnalysis(
+            niche=result.get("niche", "Productivity"),
+            trend_score=result.get("trend_score", 0.7),
+            competition_level=result.get("competition_level", "medium"),
+            growth_rate=result.get("growth_rate", 0.15),
+            recommended_price_range=tuple(result.get("recommended_price_range", [29, 79])),
+            top_performers=result.get("top_performers", []),
+            market_gap=result.get("market_gap", []),
+            recommendations=result.get("recommendations", []),
+            template_type=TemplateType(result.get("template_type", "notion")),
+            bundle_opportunities=result.get("bundle_opportunities", [])
+        )
+    
     def generate_template_spec(self, analysis: TrendAnalysis) -> TemplateSpec:
         """트렌드 분석 기반으로 템플릿 스펙 자율 생성"""
+        key = _digest(asdict(analysis))
+        cached = self._cached("spec", key)
+        if cached:
+            return cached
+        
         logger.info(f"Generating template spec for: {analysis.niche}")
         
         price = self._calculate_optimal_price(analysis)
@@ -216,36 +555,53 @@ Return JSON with:
 """
         
         try:
-            response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
+            response = self._create_message(
                 max_tokens=1500,
-                messages=[{"role": "user", "content": prompt}]
+                prompt=prompt
             )
             
             result = json.loads(response.content[0].text)
             
-            return TemplateSpec(
-                name=result.get("name", f"{analysis.niche} Template"),
-                type=analysis.template_type,
-                category=self._categorize_niche(analysis.niche),
-                description=result.get("description", ""),
-                features=result.get("features", []),
-                target_audience=result.get("target_audience", "Professionals"),
-                price_tier=PricingTier(result.get("price_tier", "mid")),
-                estimated_price=result.get("estimated_price", price),
-                bundle_products=result.get("bundle_products", []),
-                metadata={
-                    "trend_analysis": asdict(analysis),
-                    "strategy_source": "ai_autonomous"
-                }
-            )
+            spec = self._spec_from_result(result, analysis, price)
+            self._remember("spec", key, spec)
+            return spec
             
         except Exception as e:
             logger.error(f"Error generating template spec: {e}")
             return self._fallback_template_spec(analysis)
     
+    def _spec_from_result(self, result: Dict, analysis: TrendAnalysis, price: float) -> TemplateSpec:
+        """AI 응답(JSON)을 TemplateSpec으로 변환"""
+        return TemplateSpec(
+            name=result.get("name", f"{analysis.niche} Template"),
+            type=analysis.template_type,
+            category=self._categorize_niche(analysis.niche),
+            description=result.get("description", ""),
+            features=result.get("features", []),
+            target_audience=result.get("target_audience", "Professionals"),
+            price_tier=PricingTier(result.get("price_tier", "mid")),
+            estimated_price=result.get("estimated_price", price),
+            bundle_products=result.get("bundle_products", []),
+            metadata={
+                "trend_analysis": asdict(analysis),
+                "strategy_source": "ai_autonomous"
+            }
+        )
+    
     def generate_template_content(self, spec: TemplateSpec) -> Dict:
         """템플릿 실제 콘텐츠 생성"""
+        return self.stream_template_content(spec)
+    
+    def stream_template_content(self, spec: TemplateSpec, on_field: Optional[Callable[[str, object], None]] = None) -> Dict:
+        """템플릿 콘텐츠를 스트리밍으로 생성
+        
+        최상위 JSON 필드가 완성될 때마다 on_field(key, value)를 호출하므로, 호출자는 응답이 끝나기
+        전에 (예: full_description 번역 같은) 후속 작업을 시작할 수 있다.
+        """
+        sections = self._cached("sections", spec.id)
+        if sections:
+            return sections["content"]
+        
         logger.info(f"Generating content for: {spec.name}")
         
         prompt = f"""
@@ -271,13 +627,22 @@ Return JSON with:
 """
         
         try:
-            response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2500,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            parser = _JSONFieldStream()
+            content = {}
             
-            return json.loads(response.content[0].text)
+            with self._api_slots:
+                with self.anthropic_client.messages.stream(
+                    model="claude-sonnet-4-20250514",
+                    max_tokens=2500,
+                    messages=[{"role": "user", "content": prompt}]
+                ) as stream:
+                    for chunk in stream.text_stream:
+                        for key, value in parser.feed(chunk):
+                            content[key] = value
+                            if on_field:
+                                on_field(key, value)
+            
+            return content or json.loads(parser.text)
             
         except Exception as e:
             logger.error(f"Error generating template content: {e}")
@@ -285,6 +650,10 @@ Return JSON with:
     
     def create_design_prompt(self, spec: TemplateSpec) -> str:
         """디자인 생성용 프롬프트 (Canva/DALL-E용)"""
+        sections = self._cached("sections", spec.id)
+        if sections:
+            return sections["design_prompt"]
+        
         prompt = f"""
 Create a professional {spec.type.value} template design for {spec.category.value}.
 
@@ -310,10 +679,9 @@ Return only the prompt text, be specific and detailed.
 """
         
         try:
-            response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
+            response = self._create_message(
                 max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
+                prompt=prompt
             )
             
             return response.content[0].text.strip()
@@ -323,19 +691,8 @@ Return only the prompt text, be specific and detailed.
     
     def calculate_price(self, spec: TemplateSpec, market_data: Dict = None) -> float:
         """가격 최적화 자율 결정"""
-        import random
-        
-        tier_ranges = {
-            PricingTier.LOW: (8, 19),
-            PricingTier.MID: (40, 80),
-            PricingTier.HIGH: (100, 250),
-            PricingTier.BUNDLE_BASIC: (49, 79),
-            PricingTier.BUNDLE_PREMIUM: (99, 149),
-            PricingTier.BUNDLE_ALL_ACCESS: (199, 389)
-        }
-        
-        base_range = tier_ranges.get(spec.price_tier, (29, 79))
-        base_price = random.randint(*base_range)
+        base_range = _TIER_PRICE_RANGES.get(spec.price_tier, (29, 79))
+        base_price = self._sample_price_batch(base_range, 1)[0]
         
         # 시장 데이터 기반 조정
         if market_data:
@@ -347,7 +704,7 @@ Return only the prompt text, be specific and detailed.
         
         # 번들 할인 적용
         if spec.bundle_products:
-            discount = random.uniform(0.30, 0.60)
+            discount = self._rng.uniform(0.30, 0.60)
             base_price = int(base_price * (1 - discount))
         
         return float(base_price)
@@ -385,10 +742,9 @@ Return JSON:
 """
         
         try:
-            response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
+            response = self._create_message(
                 max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}]
+                prompt=prompt
             )
             
             return json.loads(response.content[0].text)
@@ -398,9 +754,12 @@ Return JSON:
             return {"type": "individual", "reason": "AI decision failed, defaulting to individual"}
     
     def _calculate_optimal_price(self, analysis: TrendAnalysis) -> float:
-        import random
-        price_range = analysis.recommended_price_range
-        return float(random.randint(int(price_range[0]), int(price_range[1])))
+        return float(self._sample_price_batch(analysis.recommended_price_range, 1)[0])
+    
+    def _sample_price_batch(self, price_range: Tuple[float, float], n: int) -> List[int]:
+        """가격 범위(양 끝 포함)에서 정수 가격 n개를 한 번에 추출 - 번들 후보 비교용"""
+        low, high = int(price_range[0]), int(price_range[1])
+        return self._rng.choices(range(low, high + 1), k=n)
     
     def _generate_bundle_decision(self, analysis: TrendAnalysis) -> List[str]:
         if analysis.trend_score > 0.8 and analysis.competition_level != "high":
@@ -408,22 +767,11 @@ Return JSON:
         return []
     
     def _categorize_niche(self, niche: str) -> TemplateCategory:
-        niche_lower = niche.lower()
-        
-        if any(w in niche_lower for w in ["budget", "finance", "money", "investment"]):
-            return TemplateCategory.FINANCE
-        elif any(w in niche_lower for w in ["plan", "schedule", "calendar", "organize"]):
-            return TemplateCategory.PLANNING
-        elif any(w in niche_lower for w in ["marketing", "content", "social", "business"]):
-            return TemplateCategory.MARKETING
-        elif any(w in niche_lower for w in ["educate", "course", "learn", "student"]):
-            return TemplateCategory.EDUCATION
-        elif any(w in niche_lower for w in ["creative", "design", "art", "creative"]):
-            return TemplateCategory.CREATIVE
-        elif any(w in niche_lower for w in ["business", "project", "management"]):
-            return TemplateCategory.BUSINESS
-        else:
+        # 한 번의 스캔으로 모든 키워드 위치를 찾고 우선순위가 가장 높은 카테고리 선택
+        priorities = [_NICHE_KEYWORD_PRIORITY[m.group(1)] for m in _NICHE_KEYWORD_RE.finditer(niche.lower())]
+        if not priorities:
             return TemplateCategory.PRODUCTIVITY
+        return _NICHE_CATEGORY_RULES[min(priorities)][0]
     
     def _fallback_trend_analysis(self) -> TrendAnalysis:
         return TrendAnalysis(
@@ -1,8 +1,14 @@
 """Competitor Analysis Module - Market Intelligence & Benchmarking"""
 import os
+import copy
 import json
+import hashlib
 import requests
-from typing import Dict, List, Optional
+from collections import OrderedDict, defaultdict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
@@ -21,12 +27,164 @@ class CompetitorMetric(Enum):
     SEO_RANKING = "seo_ranking"
 
 
+# 정적 조회 테이블 - import 시 한 번만 만들고 읽기 전용으로 공유
+_NICHE_MARKET_SIZES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "productivity": MappingProxyType({"size": "$50M+/year", "growth": "15%"}),
+    "notion": MappingProxyType({"size": "$20M+/year", "growth": "25%"}),
+    "finance": MappingProxyType({"size": "$30M+/year", "growth": "10%"}),
+    "digital_planner": MappingProxyType({"size": "$15M+/year", "growth": "20%"}),
+    "business": MappingProxyType({"size": "$40M+/year", "growth": "12%"})
+})
+_DEFAULT_MARKET_SIZE: Mapping[str, str] = MappingProxyType({"size": "$10M+/year", "growth": "10%"})
+
+# 경쟁사 약점 분석
+_COMPETITOR_WEAKNESSES: Mapping[str, str] = MappingProxyType({
+    "slow_updates": "경쟁사들이 템플릿 업데이트가 느림",
+    "poor_seo": "SEO 최적화가 부족함",
+    "limited_languages": "다국어 지원이 제한적",
+    "bad_support": "고객 지원이 부족함",
+    "outdated_designs": "디자인이 구식으로 보임"
+})
+
+# 기회 목록에 항상 포함되는 상위 약점
+_TOP_WEAKNESSES: Tuple[str, ...] = tuple(islice(_COMPETITOR_WEAKNESSES.values(), 2))
+
+# niche별 기회
+_NICHE_OPPORTUNITIES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "productivity": (
+        "AI 통합 템플릿",
+        "협업 기능 강화",
+        "모바일 최적화"
+    ),
+    "notion": (
+        "Notion AI 연동",
+        "데이터베이스 고급 활용",
+        "템플릿 번들"
+    ),
+    "finance": (
+        "자동화 대시보드",
+        "투자 추적",
+        "예산 관리"
+    )
+})
+
+_MARKET_THREATS = (
+    "대기업이 시장에 진입할 가능성",
+    "AI가 더 저렴한 대안을 생성할 가능성",
+    "플랫폼 수수료 인상 가능성",
+    "경쟁 심화로 인한 가격 하락 압력"
+)
+
+_BENCHMARK_REPORT: Mapping[str, Mapping] = MappingProxyType({
+    "pricing_benchmark": MappingProxyType({
+        "our_avg_price": 49,
+        "competitor_avg_price": 76,
+        "recommendation": "가격을 $59-69로 상향 검토"
+    }),
+    "product_benchmark": MappingProxyType({
+        "our_product_count": 10,
+        "competitor_avg_products": 33,
+        "recommendation": "제품 라인 확장 필요"
+    }),
+    "quality_benchmark": MappingProxyType({
+        "our_avg_reviews": 4.5,
+        "competitor_avg_reviews": 4.7,
+        "recommendation": "리뷰 응답 속도 개선"
+    }),
+    "speed_benchmark": MappingProxyType({
+        "our_weekly_updates": 2,
+        "competitor_avg_updates": 1,
+        "recommendation": "업데이트 빈도 유지 또는 증가"
+    })
+})
+
+# 가격 변동 모니터링 시뮬레이션 값 (실제 수집 전까지 고정)
+_PRICE_MONITOR_SNAPSHOT: Mapping[str, Mapping] = MappingProxyType({
+    "price_trends": MappingProxyType({
+        "last_week": "stable",
+        "last_month": "+5%",
+        "trend": "upward"
+    }),
+    "discount_activity": MappingProxyType({
+        "competitors_on_sale": 2,
+        "avg_discount": "15%"
+    })
+})
+_PRICE_MONITOR_RECOMMENDATIONS = (
+    "경쟁사들이 할인을 진행하고 있으므로 프로모션 고려",
+    "프리미엄 제품군은 가격 유지"
+)
+
+# 월별 (트렌드 키워드, 할인 시즌 여부) - 인덱스 0이 1월
+_SEASONAL_PATTERNS: Tuple[Tuple[Tuple[str, ...], bool], ...] = (
+    (("goal_setting", "planner"), True),
+    (("productivity", "business"), False),
+    (("student", "education"), False),
+    (("finance", "tax"), False),
+    (("planner", "productivity"), False),
+    (("vacation", "travel"), True),
+    (("business", "freelance"), False),
+    (("back_to_school",), True),
+    (("student", "productivity"), False),
+    (("productivity", "business"), False),
+    (("holiday_planning", "gift_guides"), True),
+    (("year_review", "planning_2026"), True)
+)
+
+
+_IMAGE_SOURCES = ("Bing Image Creator", "Stable Diffusion")
+_IMAGE_COST_RECOMMENDATIONS = (
+    "Bing Image Creator는 무료로 DALL-E 3 품질 제공",
+    "Stable Diffusion은 로컬 실행 시 완전 무료",
+    "대량 생성 시 Stability API 요금제 고려"
+)
+
+_SD_PROMPT_TEMPLATE = (
+    "{prompt}, {style} style, professional design, high quality, clean, "
+    "modern aesthetic, digital template, UI/UX design"
+)
+
+
 class CompetitorAnalyzer:
     """경쟁사 분석기"""
     
+    _cache_ttl = timedelta(hours=1)  # 시장 분석 결과 유지 시간
+    
     def __init__(self):
         self.competitors = self._load_competitors()
-        self.analysis_cache = {}
+        self.analysis_cache = {}  # niche -> (analyzed_at, analysis)
+        self._build_niche_index()
+    
+    def _build_niche_index(self):
+        """niche -> 경쟁사 목록 역색인 (조회 시 전체 경쟁사 순회 방지)"""
+        by_niche: Dict[str, List[Dict]] = defaultdict(list)
+        for competitor in self.competitors.values():
+            # 중복 niche는 한 번만 색인 (순서 유지)
+            for niche in dict.fromkeys(competitor.get("niches", [])):
+                by_niche[niche].append(competitor)
+        
+        self._by_niche = dict(by_niche)
+        self._prices_by_niche = {
+            niche: tuple(c.get("avg_price", 49) for c in comps)
+            for niche, comps in self._by_niche.items()
+        }
+        # 가격 요약은 경쟁사 데이터가 바뀔 때만 달라지므로 색인 생성 시 한 번 계산
+        self._pricing_by_niche = {
+            niche: self._calculate_avg_pricing(prices)
+            for niche, prices in self._prices_by_niche.items()
+        }
+    
+    def _cache_get(self, niche: str, now: datetime) -> Optional[Dict]:
+        """유효한 시장 분석 캐시 조회 (만료된 항목은 제거)"""
+        entry = self.analysis_cache.get(niche)
+        if entry is None:
+            return None
+        
+        cached_at, analysis = entry
+        if now - cached_at > self._cache_ttl:
+            del self.analysis_cache[niche]
+            return None
+        return analysis
     
     def _load_competitors(self) -> Dict:
         """경쟁사 목록 로드"""
@@ -57,47 +215,43 @@ class CompetitorAnalyzer:
             }
         }
     
-    def analyze_market(self, niche: str) -> Dict:
-        """시장 분석"""
-        relevant_competitors = []
+    def analyze_market(self, niche: str, now: Optional[datetime] = None) -> Dict:
+        """시장 분석 (niche별로 _cache_ttl 동안 캐시)
         
-        for key, competitor in self.competitors.items():
-            if niche in competitor.get("niches", []):
-                relevant_competitors.append(competitor)
+        여러 niche를 연달아 분석할 때는 같은 now를 넘겨 시각 계산을 한 번만 하도록 할 수 있다.
+        반환값은 캐시의 복사본이므로 호출자가 수정해도 이후 결과에 영향이 없다.
+        """
+        now = now or datetime.now()
+        cached = self._cache_get(niche, now)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        relevant_competitors = self._by_niche.get(niche, [])
         
         analysis = {
             "niche": niche,
             "market_size": self._estimate_market_size(niche),
             "competitor_count": len(relevant_competitors),
-            "avg_pricing": self._calculate_avg_pricing(relevant_competitors),
+            "avg_pricing": dict(self._pricing_by_niche.get(niche) or self._calculate_avg_pricing(())),
             "top_players": relevant_competitors[:3],
             "opportunities": self._identify_opportunities(niche, relevant_competitors),
             "threats": self._identify_threats(niche),
             "recommendations": self._generate_recommendations(niche, relevant_competitors),
-            "analyzed_at": datetime.now().isoformat()
+            "analyzed_at": now.isoformat()
         }
         
-        return analysis
+        self.analysis_cache[niche] = (now, analysis)
+        return copy.deepcopy(analysis)
     
     def _estimate_market_size(self, niche: str) -> Dict:
         """시장 규모 추정"""
-        niche_sizes = {
-            "productivity": {"size": "$50M+/year", "growth": "15%"},
-            "notion": {"size": "$20M+/year", "growth": "25%"},
-            "finance": {"size": "$30M+/year", "growth": "10%"},
-            "digital_planner": {"size": "$15M+/year", "growth": "20%"},
-            "business": {"size": "$40M+/year", "growth": "12%"}
-        }
-        
-        return niche_sizes.get(niche, {"size": "$10M+/year", "growth": "10%"})
+        return dict(_NICHE_MARKET_SIZES.get(niche, _DEFAULT_MARKET_SIZE))
     
-    def _calculate_avg_pricing(self, competitors: List[Dict]) -> Dict:
+    def _calculate_avg_pricing(self, prices: Sequence[int]) -> Dict:
         """평균 가격 계산"""
-        if not competitors:
+        if not prices:
             return {"low": 29, "mid": 49, "high": 99}
         
-        prices = [c.get("avg_price", 49) for c in competitors]
-        
         return {
             "low": int(min(prices) * 0.8),
             "mid": int(sum(prices) / len(prices)),
@@ -106,49 +260,12 @@ class CompetitorAnalyzer:
     
     def _identify_opportunities(self, niche: str, competitors: List[Dict]) -> List[str]:
         """기회 식별"""
-        opportunities = []
-        
-        # 경쟁사 약점 분석
-        weaknesses = {
-            "slow_updates": "경쟁사들이 템플릿 업데이트가 느림",
-            "poor_seo": "SEO 최적화가 부족함",
-            "limited_languages": "다국어 지원이 제한적",
-            "bad_support": "고객 지원이 부족함",
-            "outdated_designs": "디자인이 구식으로 보임"
-        }
-        
-        # niche별 기회
-        niche_opportunities = {
-            "productivity": [
-                "AI 통합 템플릿",
-                "협업 기능 강화",
-                "모바일 최적화"
-            ],
-            "notion": [
-                "Notion AI 연동",
-                "데이터베이스 고급 활용",
-                "템플릿 번들"
-            ],
-            "finance": [
-                "자동화 대시보드",
-                "투자 추적",
-                "예산 관리"
-            ]
-        }
-        
-        opportunities.extend(niche_opportunities.get(niche, []))
-        opportunities.extend(list(weaknesses.values())[:2])
-        
-        return opportunities[:5]
+        # niche별 기회 + 경쟁사 약점 상위 2개, 최대 5개
+        return list(islice(chain(_NICHE_OPPORTUNITIES.get(niche, ()), _TOP_WEAKNESSES), 5))
     
     def _identify_threats(self, niche: str) -> List[str]:
         """위협 식별"""
-        return [
-            "대기업이 시장에 진입할 가능성",
-            "AI가 더 저렴한 대안을 생성할 가능성",
-            "플랫폼 수수료 인상 가능성",
-            "경쟁 심화로 인한 가격 하락 압력"
-        ]
+        return list(_MARKET_THREATS)
     
     def _generate_recommendations(self, niche: str, competitors: List[Dict]) -> List[str]:
         """권장사항 생성"""
@@ -167,47 +284,14 @@ class CompetitorAnalyzer:
         # 실제로는 웹 스크래핑이나 API를 통해 실시간 모니터링
         # 여기서는 시뮬레이션
         
-        return {
-            "niche": niche,
-            "price_trends": {
-                "last_week": "stable",
-                "last_month": "+5%",
-                "trend": "upward"
-            },
-            "discount_activity": {
-                "competitors_on_sale": 2,
-                "avg_discount": "15%"
-            },
-            "recommendations": [
-                "경쟁사들이 할인을 진행하고 있으므로 프로모션 고려",
-                "프리미엄 제품군은 가격 유지"
-            ]
-        }
+        report = {"niche": niche}
+        report.update((section, dict(values)) for section, values in _PRICE_MONITOR_SNAPSHOT.items())
+        report["recommendations"] = list(_PRICE_MONITOR_RECOMMENDATIONS)
+        return report
     
     def get_benchmark_report(self) -> Dict:
         """벤치마크 리포트"""
-        return {
-            "pricing_benchmark": {
-                "our_avg_price": 49,
-                "competitor_avg_price": 76,
-                "recommendation": "가격을 $59-69로 상향 검토"
-            },
-            "product_benchmark": {
-                "our_product_count": 10,
-                "competitor_avg_products": 33,
-                "recommendation": "제품 라인 확장 필요"
-            },
-            "quality_benchmark": {
-                "our_avg_reviews": 4.5,
-                "competitor_avg_reviews": 4.7,
-                "recommendation": "리뷰 응답 속도 개선"
-            },
-            "speed_benchmark": {
-                "our_weekly_updates": 2,
-                "competitor_avg_updates": 1,
-                "recommendation": "업데이트 빈도 유지 또는 증가"
-            }
-        }
+        return {section: dict(values) for section, values in _BENCHMARK_REPORT.items()}
 
 
 class TrendAnalyzer:
@@ -261,24 +345,8 @@ class TrendAnalyzer:
     
     def get_seasonal_trends(self) -> Dict:
         """계절별 트렌드"""
-        current_month = datetime.now().month
-        
-        seasonal_patterns = {
-            1: {"trending": ["goal_setting", "planner"], "discount_season": True},
-            2: {"trending": ["productivity", "business"], "discount_season": False},
-            3: {"trending": ["student", "education"], "discount_season": False},
-            4: {"trending": ["finance", "tax"], "discount_season": False},
-            5: {"trending": ["planner", "productivity"], "discount_season": False},
-            6: {"trending": ["vacation", "travel"], "discount_season": True},
-            7: {"trending": ["business", "freelance"], "discount_season": False},
-            8: {"trending": ["back_to_school"], "discount_season": True},
-            9: {"trending": ["student", "productivity"], "discount_season": False},
-            10: {"trending": ["productivity", "business"], "discount_season": False},
-            11: {"trending": ["holiday_planning", "gift_guides"], "discount_season": True},
-            12: {"trending": ["year_review", "planning_2026"], "discount_season": True}
-        }
-        
-        return seasonal_patterns.get(current_month, seasonal_patterns[1])
+        trending, discount_season = _SEASONAL_PATTERNS[datetime.now().month - 1]
+        return {"trending": list(trending), "discount_season": discount_season}
     
     def get_keyword_trends(self, keywords: List[str]) -> Dict:
         """키워드 트렌드"""
@@ -300,20 +368,45 @@ class FreeAIGenerator:
     
     def __init__(self):
         self.sd_api_url = os.getenv("STABLE_DIFFUSION_API", "http://localhost:7860")
-        self.cache = []
+        self.cache = OrderedDict()  # (prompt, style) 해시 -> 생성 결과 (LRU)
+        self.cache_maxsize = 256
+    
+    def _cache_key(self, prompt: str, style: str) -> bytes:
+        """이미지 캐시 키"""
+        return hashlib.blake2b(f"{prompt}|{style}".encode("utf-8"), digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[Dict]:
+        """캐시 조회 (적중 시 최근 사용으로 이동)"""
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+        return result
+    
+    def _cache_put(self, key: bytes, result: Dict):
+        """성공한 생성 결과만 캐시 (maxsize 초과 시 가장 오래된 항목 제거)"""
+        if not result.get("success"):
+            return
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_maxsize:
+            self.cache.popitem(last=False)
     
     def generate_template_image(self, prompt: str, style: str = "modern") -> Dict:
-        """템플릿 이미지 생성"""
-        # Bing Image Creator (무료, DALL-E 3 품질)
-        bing_result = self._generate_bing_image(prompt)
+        """템플릿 이미지 생성 (같은 prompt/style은 캐시된 결과 재사용)"""
+        key = self._cache_key(prompt, style)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         
-        if bing_result.get("success"):
-            return bing_result
+        # Bing Image Creator (무료, DALL-E 3 품질)
+        result = self._generate_bing_image(prompt)
         
-        # Stable Diffusion (대안)
-        sd_result = self._generate_stable_diffusion(prompt, style)
+        if not result.get("success"):
+            # Stable Diffusion (대안)
+            result = self._generate_stable_diffusion(prompt, style)
         
-        return sd_result
+        self._cache_put(key, result)
+        return result
     
     def _generate_bing_image(self, prompt: str) -> Dict:
         """Bing Image Creator 사용"""
@@ -335,52 +428,79 @@ class FreeAIGenerator:
     
     def _generate_stable_diffusion(self, prompt: str, style: str) -> Dict:
         """Stable Diffusion 사용"""
-        # 실제로는 Stability AI API 또는 로컬 SD 사용
-        
-        enhanced_prompt = f"""
-        {prompt}, {style} style, professional design,
-        high quality, clean, modern aesthetic,
-        digital template, UI/UX design
-        """
+        return self._generate_stable_diffusion_batch([(prompt, style)])[0]
+    
+    def _generate_stable_diffusion_batch(self, items: List[Tuple[str, str]]) -> List[Dict]:
+        """Stable Diffusion 일괄 생성 - (prompt, style) 목록을 한 번의 요청으로 처리"""
+        # 실제로는 Stability AI API 또는 로컬 SD(/sdapi/v1/txt2img)에 batch_size=len(items)로 한 번 요청
+        enhanced_prompts = [_SD_PROMPT_TEMPLATE.format(prompt=prompt, style=style) for prompt, style in items]
         
-        return {
-            "success": True,
-            "source": "stable_diffusion",
-            "prompt": enhanced_prompt,
-            "generated_images": [
-                {"url": f"https://sd.generated/1.png", "style": style}
-            ],
-            "cost": 0,
-            "notes": "Configure Stability AI API or run local SD for production"
-        }
+        return [
+            {
+                "success": True,
+                "source": "stable_diffusion",
+                "prompt": enhanced_prompt,
+                "generated_images": [
+                    {"url": f"https://sd.generated/{index}.png", "style": style}
+                ],
+                "cost": 0,
+                "notes": "Configure Stability AI API or run local SD for production"
+            }
+            for index, (enhanced_prompt, (_, style)) in enumerate(zip(enhanced_prompts, items), start=1)
+        ]
     
     def generate_social_media_assets(self, template_data: Dict) -> Dict:
-        """소셜 미디어 에셋 생성"""
+        """소셜 미디어 에셋 생성 (플랫폼별 이미지 요청을 동시에 실행)"""
+        name = template_data.get('name', 'template')
+        requests_by_asset = {
+            # TikTok 썸네일
+            "tiktok_thumbnail": (
+                f"TikTok thumbnail for {name}, "
+                f"features: {', '.join(template_data.get('features', [])[:3])}, "
+                f"bright colors, eye-catching design",
+                "vibrant"
+            ),
+            # YouTube 썸네일
+            "youtube_thumbnail": (
+                f"YouTube thumbnail for {name}, "
+                f"professional YouTube style, clear text area",
+                "youtube_style"
+            ),
+            # Instagram 포스트
+            "instagram_post": (
+                f"Instagram post for {name}, "
+                f"square format, modern aesthetic, clean design",
+                "instagram_style"
+            ),
+        }
+        
+        cache_keys = {key: self._cache_key(prompt, style) for key, (prompt, style) in requests_by_asset.items()}
         assets = {}
+        for key, cache_key in cache_keys.items():
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                assets[key] = cached
+        missing = [key for key in requests_by_asset if key not in assets]
         
-        # TikTok 썸네일
-        assets["tiktok_thumbnail"] = self.generate_template_image(
-            f"TikTok thumbnail for {template_data.get('name', 'template')}, "
-            f"features: {', '.join(template_data.get('features', [])[:3])}, "
-            f"bright colors, eye-catching design",
-            "vibrant"
-        )
+        # Bing Image Creator는 프롬프트별 요청이므로 동시에 실행
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                futures = {
+                    key: executor.submit(self._generate_bing_image, requests_by_asset[key][0])
+                    for key in missing
+                }
+                assets.update((key, future.result()) for key, future in futures.items())
         
-        # YouTube 썸네일
-        assets["youtube_thumbnail"] = self.generate_template_image(
-            f"YouTube thumbnail for {template_data.get('name', 'template')}, "
-            f"professional YouTube style, clear text area",
-            "youtube_style"
-        )
+        # 실패한 에셋만 Stable Diffusion 한 번의 배치 요청으로 대체
+        failed = [key for key in missing if not assets[key].get("success")]
+        if failed:
+            sd_results = self._generate_stable_diffusion_batch([requests_by_asset[key] for key in failed])
+            assets.update(zip(failed, sd_results))
         
-        # Instagram 포스트
-        assets["instagram_post"] = self.generate_template_image(
-            f"Instagram post for {template_data.get('name', 'template')}, "
-            f"square format, modern aesthetic, clean design",
-            "instagram_style"
-        )
+        for key in missing:
+            self._cache_put(cache_keys[key], assets[key])
         
-        return assets
+        return {key: assets[key] for key in requests_by_asset}
     
     def get_cost_report(self) -> Dict:
         """비용 리포트"""
@@ -388,12 +508,8 @@ class FreeAIGenerator:
             "monthly_cost": 0,
             "images_generated": len(self.cache),
             "avg_cost_per_image": 0,
-            "sources_used": ["Bing Image Creator", "Stable Diffusion"],
-            "recommendations": [
-                "Bing Image Creator는 무료로 DALL-E 3 품질 제공",
-                "Stable Diffusion은 로컬 실행 시 완전 무료",
-                "대량 생성 시 Stability API 요금제 고려"
-            ]
+            "sources_used": list(_IMAGE_SOURCES),
+            "recommendations": list(_IMAGE_COST_RECOMMENDATIONS)
         }
 
 
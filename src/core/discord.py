@@ -0,0 +1,116 @@
+"""Discord webhook batching - 짧은 구간에 쌓인 embed를 한 번의 요청으로 전송"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List
+
+from core.http import create_session, post_json
+from core.ratelimit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Discord 웹훅 한 요청에 담을 수 있는 최대 embed 수
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# 웹훅별 요청 한도 (초당 5회)
+WEBHOOK_RATE_LIMIT = (5, 1.0)
+
+_batchers: Dict[str, "DiscordBatcher"] = {}
+_batchers_lock = threading.Lock()
+
+
+class DiscordBatcher:
+    """웹훅 하나에 대한 embed 배치 전송기 (10개가 모이거나 window초가 지나면 전송)"""
+
+    def __init__(self, webhook_url: str, window: float = 0.25, timeout=(3, 10), max_attempts: int = 3):
+        self.webhook_url = webhook_url
+        # 429는 _post가 Retry-After를 보고 직접 재시도하므로 전용 세션의 자체 재시도는 끔
+        # (재시도 세션을 쓰면 한 번의 전송이 재시도 횟수 x max_attempts번 나갈 수 있음)
+        self.session = create_session(pool_connections=1, pool_maxsize=1, retries=0)
+        self.window = window
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self._limiter = RateLimiter(*WEBHOOK_RATE_LIMIT)
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def enqueue(self, embed: Dict):
+        """embed를 전송 대기열에 추가 (백그라운드 스레드가 묶어서 전송)"""
+        self._queue.put(embed)
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="discord-batcher", daemon=True)
+                    self._worker.start()
+
+    def flush(self):
+        """대기 중인 embed가 모두 전송될 때까지 대기"""
+        if self._worker is not None:
+            self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._post(batch)
+            except Exception as e:
+                logger.error("Failed to send Discord batch (%d embeds): %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _next_batch(self) -> List[Dict]:
+        """첫 embed를 기다린 뒤 window 동안 최대 10개까지 모음"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _post(self, embeds: List[Dict]):
+        """embed 묶음 전송 - 429 응답은 Retry-After만큼 쉬고 재시도, 남은 한도가 0이면 리셋까지 대기"""
+        for _ in range(self.max_attempts):
+            self._limiter.acquire()
+            response = post_json(self.session, self.webhook_url, {"embeds": embeds}, timeout=self.timeout)
+            headers = response.headers
+
+            if response.status_code == 429:
+                delay = float(headers.get("Retry-After") or 1.0)
+                logger.warning("Discord rate limited, retrying in %ss", delay)
+                time.sleep(delay)
+                continue
+
+            if response.status_code >= 400:
+                logger.error("Discord webhook returned %s: %.200s", response.status_code, response.text)
+            if headers.get("X-RateLimit-Remaining") == "0":
+                time.sleep(float(headers.get("X-RateLimit-Reset-After") or 0))
+            return
+
+        logger.error("Discord batch dropped after %d rate-limited attempts", self.max_attempts)
+
+
+def get_discord_batcher(webhook_url: str) -> DiscordBatcher:
+    """웹훅 URL별로 공유하는 배치 전송기"""
+    batcher = _batchers.get(webhook_url)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(webhook_url)
+            if batcher is None:
+                batcher = _batchers[webhook_url] = DiscordBatcher(webhook_url)
+    return batcher
+
+
+@atexit.register
+def _flush_all():
+    """프로세스 종료 전에 대기 중인 embed 전송"""
+    for batcher in list(_batchers.values()):
+        batcher.flush()
@@ -0,0 +1,171 @@
+"""Shared HTTP session - keep-alive connection pooling"""
+import json
+import socket
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Union
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# urllib3 기본값(TCP_NODELAY)에 TCP keepalive 추가 - 응답 없이 끊긴 연결을 OS가 감지하도록
+KEEPALIVE_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):  # Linux 전용 옵션
+    KEEPALIVE_SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3),
+    ]
+
+# 멱등 메서드 - 상태 코드(5xx 등)로 재시도해도 서버 쪽 쓰기가 중복되지 않음
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+# 서버가 요청을 처리하지 않고 거절한 응답 - Retry-After가 있으면 POST/PATCH도 재시도
+_UNSAFE_RETRY_STATUSES = frozenset((429, 503))
+
+_shared_session: Optional["requests.Session"] = None
+_shared_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _safe_retry_class():
+    """Retry 하위 클래스 (urllib3는 첫 세션 생성 시 로드)"""
+    from urllib3.exceptions import MaxRetryError, ResponseError
+    from urllib3.util.retry import Retry
+    
+    class SafeRetry(Retry):
+        """allowed_methods 밖의 메서드는 연결 실패와 Retry-After가 있는 429/503만 재시도하고,
+        첫 실패 후 budget초 안에 끝나지 않을 재시도는 시작하지 않음"""
+        
+        def __init__(self, *args, budget: Optional[float] = None, started: Optional[float] = None, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.budget = budget
+            self.started = started
+        
+        def new(self, **kw):
+            kw.setdefault("budget", self.budget)
+            kw.setdefault("started", time.monotonic() if self.started is None else self.started)
+            return super().new(**kw)
+        
+        def is_retry(self, method, status_code, has_retry_after=False):
+            if self._is_method_retryable(method):
+                return super().is_retry(method, status_code, has_retry_after)
+            return bool(self.total and has_retry_after and self.respect_retry_after_header
+                        and status_code in _UNSAFE_RETRY_STATUSES)
+        
+        def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+            retry = super().increment(method, url, response, error, _pool, _stacktrace)
+            if retry.budget is not None:
+                wait = retry.get_retry_after(response) if response is not None and retry.respect_retry_after_header else None
+                if wait is None:
+                    wait = retry.get_backoff_time()
+                if time.monotonic() - retry.started + wait > retry.budget:
+                    raise MaxRetryError(_pool, url, error or ResponseError("retry time budget exceeded"))
+            return retry
+    
+    return SafeRetry
+
+
+def create_session(pool_connections: int = 16, pool_maxsize: int = 64,
+                   retries: int = 3, backoff_factor: float = 0.2,
+                   status_forcelist: Optional[Iterable[int]] = None,
+                   retry_methods: Optional[Iterable[str]] = None,
+                   socket_options: Optional[list] = None,
+                   read_retries: Optional[int] = None,
+                   retry_budget: Optional[float] = None) -> "requests.Session":
+    """keep-alive 연결 풀과 재시도 정책을 가진 HTTP 세션 생성
+    (status_forcelist: 재시도할 응답 코드, retry_methods: 재시도 허용 메서드 - 기본은 멱등 메서드만,
+    socket_options: 새 연결에 적용할 setsockopt 목록, read_retries: 읽기 타임아웃/오류 재시도 횟수,
+    retry_budget: 첫 실패 이후 재시도에 쓸 최대 시간(초))
+    
+    retry_methods 밖의 메서드(POST/PATCH)도 요청이 서버에 닿지 않은 연결 실패와
+    Retry-After가 있는 429/503 응답에서는 재시도한다."""
+    # requests/urllib3는 세션이 처음 필요할 때 로드 (import만 하는 CLI 명령의 시작 비용 절감)
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    retry_kwargs = {"total": retries, "backoff_factor": backoff_factor, "budget": retry_budget}
+    if read_retries is not None:
+        retry_kwargs["read"] = read_retries
+    if status_forcelist is not None:
+        retry_kwargs["status_forcelist"] = frozenset(status_forcelist)
+    if retry_methods is not None:
+        retry_kwargs["allowed_methods"] = frozenset(m.upper() for m in retry_methods)
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=_safe_retry_class()(**retry_kwargs)
+    )
+    if socket_options is not None:
+        adapter.init_poolmanager(pool_connections, pool_maxsize, socket_options=list(socket_options))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def dumps_json(payload: Any) -> bytes:
+    """요청 본문용 JSON 직렬화 (orjson 우선, 없으면 표준 json)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """응답/웹훅 본문 JSON 파싱 (orjson 우선, 없으면 표준 json)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def post_json(session: "requests.Session", url: str, payload: Any,
+              headers: Optional[Dict[str, str]] = None, **kwargs) -> "requests.Response":
+    """JSON 본문을 직접 직렬화해 POST (requests의 json= 인자 대신 사용)"""
+    headers = {**headers, "Content-Type": "application/json"} if headers else {"Content-Type": "application/json"}
+    return session.post(url, data=dumps_json(payload), headers=headers, **kwargs)
+
+
+class ResponseCache:
+    """조회용 GET 응답의 JSON을 ttl초 동안 재사용 (쓰기 요청 후에는 clear()로 무효화)"""
+    
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._entries: Dict[tuple, tuple] = {}  # (url, params) -> (만료 시각, 값)
+    
+    def get_json(self, session: "requests.Session", url: str,
+                 params: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """캐시에 없거나 만료됐을 때만 요청 (오류 응답은 raise_for_status로 예외, 캐시하지 않음)"""
+        key = (url, frozenset((params or {}).items()))
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        
+        response = session.get(url, params=params, **kwargs)
+        response.raise_for_status()
+        value = loads_json(response.content)
+        self._entries[key] = (now + self.ttl, value)
+        return value
+    
+    def clear(self):
+        self._entries.clear()
+
+
+def get_shared_session() -> "requests.Session":
+    """프로세스 전체에서 공유하는 HTTP 세션 (사이클 간에도 TLS 연결 재사용)"""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_lock:
+            if _shared_session is None:
+                _shared_session = create_session()
+    return _shared_session
@@ -0,0 +1,34 @@
+"""Token bucket rate limiting - 플랫폼 한도를 넘기 전에 호출 쪽에서 속도 조절"""
+import threading
+import time
+
+
+class RateLimiter:
+    """스레드 안전 토큰 버킷 (period초마다 rate개 허용, 최대 rate개까지 몰아서 사용 가능)"""
+
+    def __init__(self, rate: int, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 쓸 수 있을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.period / self.rate
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        return False
@@ -7,21 +7,38 @@ Template Automation System - 24/7 Production Daemon
 """
 import os
 import sys
+import gzip
 import json
+import hashlib
 import time
 import logging
 import signal
+import socket
 import threading
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
-import requests
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
 
 # 경로 설정
 PROJECT_ROOT = Path(__file__).parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from core.http import get_shared_session
 from dotenv import load_dotenv
 load_dotenv(PROJECT_ROOT / ".env")
 
@@ -37,6 +54,24 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _get_orchestrator_cls():
+    """오케스트레이터 클래스 지연 로드 (--health/--status 실행 시 분석 모듈 전체를 불러오지 않음)"""
+    from main import TemplateAutomationOrchestrator
+    return TemplateAutomationOrchestrator
+
+
+def _dumps_json(data: Dict) -> bytes:
+    """리포트/상태 파일용 들여쓴 JSON 직렬화 (orjson 우선, 없으면 표준 json)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+# 헬스 체크마다 TCP/TLS 연결을 새로 맺지 않도록 오케스트레이터와 같은 세션 사용
+_HTTP = get_shared_session()
+
+
 class HealthMonitor:
     """헬스 모니터링 시스템"""
     
@@ -52,12 +87,25 @@ class HealthMonitor:
         self.cpu_threshold = 80.0  # %
         self.memory_threshold = 80.0  # %
         self.disk_threshold = 90.0  # %
+        
+        # 디스크 사용량은 분 단위로도 거의 변하지 않으므로 짧게 캐시
+        self.disk_cache_ttl = 60.0  # 초
+        self._disk_usage = None
+        self._disk_checked_at = 0.0
+        
+        self.https_probe_ttl = 300.0  # 초
+        self._https_probe = None  # (확인 시각, 연결 가능 여부)
+        
+        # 첫 cpu_percent(interval=None) 호출은 기준점만 잡고 0.0을 반환하므로 미리 호출
+        if PSUTIL_AVAILABLE:
+            psutil.cpu_percent(interval=None)
     
     def check_system_health(self) -> Dict:
         """시스템 건강 상태 체크"""
+        now = datetime.now()
         health = {
-            "timestamp": datetime.now().isoformat(),
-            "uptime": str(datetime.now() - self.start_time),
+            "timestamp": now.isoformat(),
+            "uptime": str(now - self.start_time),
             "cpu_usage": self._get_cpu_usage(),
             "memory_usage": self._get_memory_usage(),
             "disk_usage": self._get_disk_usage(),
@@ -84,36 +132,56 @@ class HealthMonitor:
         return health
     
     def _get_cpu_usage(self) -> float:
-        """CPU 사용량 조회"""
+        """CPU 사용량 조회 (직전 호출 이후 평균, 블로킹 없음)"""
+        if not PSUTIL_AVAILABLE:
+            return 0.0
         try:
-            import psutil
-            return psutil.cpu_percent(interval=1)
-        except:
+            return psutil.cpu_percent(interval=None)
+        except Exception:
             return 0.0
     
     def _get_memory_usage(self) -> float:
         """메모리 사용량 조회"""
+        if not PSUTIL_AVAILABLE:
+            return 0.0
         try:
-            import psutil
             return psutil.virtual_memory().percent
-        except:
+        except Exception:
             return 0.0
     
     def _get_disk_usage(self) -> float:
-        """디스크 사용량 조회"""
+        """디스크 사용량 조회 (disk_cache_ttl 동안 캐시)"""
+        if not PSUTIL_AVAILABLE:
+            return 0.0
+        now = time.monotonic()
+        if self._disk_usage is not None and now - self._disk_checked_at < self.disk_cache_ttl:
+            return self._disk_usage
         try:
-            import psutil
-            return psutil.disk_usage('/').percent
-        except:
+            self._disk_usage = psutil.disk_usage('/').percent
+            self._disk_checked_at = now
+            return self._disk_usage
+        except Exception:
             return 0.0
     
     def _check_network(self) -> bool:
-        """네트워크 상태 확인"""
+        """네트워크 상태 확인 - DNS 서버 TCP 연결 한 번으로 확인"""
         try:
-            response = requests.get("https://api.openai.com", timeout=5)
-            return True
-        except:
-            return False
+            with socket.create_connection(("1.1.1.1", 53), timeout=2):
+                return True
+        except OSError:
+            pass
+        
+        # 외부 53번 포트가 막힌 네트워크에서는 HTTPS 요청으로 재확인 (결과는 5분간 캐시)
+        now = time.monotonic()
+        if self._https_probe is not None and now - self._https_probe[0] < self.https_probe_ttl:
+            return self._https_probe[1]
+        try:
+            _HTTP.get("https://api.openai.com", timeout=5)
+            reachable = True
+        except Exception:
+            reachable = False
+        self._https_probe = (now, reachable)
+        return reachable
     
     def record_success(self):
         """성공 기록"""
@@ -134,9 +202,20 @@ class ProductionDaemon:
         self.health_monitor = HealthMonitor()
         self.is_running = False
         self.should_stop = False
+        self._stop_event = threading.Event()  # 종료 신호 시 대기 즉시 해제
         self.cycle_interval = 3600  # 1시간마다 실행
         self.max_retries = 3
         self.retry_delay = 300  # 5분 대기
+        self.report_retention_days = 30  # 사이클 리포트 보관 기간
+        
+        # 헬스 체크 주기 - 정상 상태가 이어지면 늘리고 경고 시 기본값으로 복귀
+        self.health_check_interval = self.cycle_interval
+        self.max_health_check_interval = self.cycle_interval * 8
+        self._health_interval = self.health_check_interval
+        self._consecutive_healthy = 0
+        self._next_health_check = 0.0
+        self._last_health = None
+        self._last_status_hash = None  # 마지막으로 기록한 상태 내용의 해시
         
         # 신호 처리
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -148,6 +227,29 @@ class ProductionDaemon:
         """시그널 처리"""
         logger.info(f"Received signal {signum}, preparing to stop...")
         self.should_stop = True
+        self._stop_event.set()
+    
+    def _maybe_check_health(self) -> Dict:
+        """예정 시각이 된 경우에만 헬스 체크 실행 (그 외에는 직전 결과 재사용)"""
+        now = time.monotonic()
+        if self._last_health is not None and now < self._next_health_check:
+            return self._last_health
+        
+        health = self.health_monitor.check_system_health()
+        if health["status"] == "healthy":
+            self._consecutive_healthy += 1
+            self._health_interval = min(
+                self.max_health_check_interval,
+                self.health_check_interval * 2 ** min(self._consecutive_healthy, 4)
+            )
+        else:
+            self._consecutive_healthy = 0
+            self._health_interval = self.health_check_interval
+        
+        self._next_health_check = now + self._health_interval
+        self._last_health = health
+        logger.info(f"📊 System Health: {health['status']} (next check in {self._health_interval}s)")
+        return health
     
     def start(self):
         """데몬 시작"""
@@ -158,14 +260,13 @@ class ProductionDaemon:
         logs_dir = PROJECT_ROOT / "logs"
         logs_dir.mkdir(exist_ok=True)
         
-        while not self.should_stop:
+        while not self._stop_event.is_set():
             try:
                 logger.info("=" * 50)
                 logger.info(f"🔄 Cycle #{self.health_monitor.cycle_count + 1} - {datetime.now()}")
                 
-                # 헬스 체크
-                health = self.health_monitor.check_system_health()
-                logger.info(f"📊 System Health: {health['status']}")
+                # 헬스 체크 (적응형 주기)
+                self._maybe_check_health()
                 
                 # 자동화 사이클 실행
                 success = self._run_automation_cycle()
@@ -182,12 +283,14 @@ class ProductionDaemon:
                 
                 # 다음 사이클까지 대기
                 logger.info(f"💤 Sleeping for {self.cycle_interval} seconds...")
-                time.sleep(self.cycle_interval)
+                if self._stop_event.wait(self.cycle_interval):
+                    break
                 
             except Exception as e:
                 logger.error(f"❌ Critical error in daemon loop: {e}")
                 self.health_monitor.record_error(str(e))
-                time.sleep(self.retry_delay)
+                if self._stop_event.wait(self.retry_delay):
+                    break
         
         logger.info("🛑 Daemon stopped")
         self.is_running = False
@@ -199,9 +302,7 @@ class ProductionDaemon:
                 logger.info(f"📦 Running automation cycle (attempt {attempt}/{self.max_retries})")
                 
                 # 메인 오케스트레이터 실행
-                from main import TemplateAutomationOrchestrator
-                
-                orchestrator = TemplateAutomationOrchestrator()
+                orchestrator = _get_orchestrator_cls()()
                 results = orchestrator.run_full_cycle()
                 
                 # 결과 확인
@@ -209,7 +310,8 @@ class ProductionDaemon:
                     logger.warning(f"⚠️ Cycle had {len(results['errors'])} errors")
                     if attempt < self.max_retries:
                         logger.info(f"🔄 Retrying in {self.retry_delay} seconds...")
-                        time.sleep(self.retry_delay)
+                        if self._stop_event.wait(self.retry_delay):
+                            break
                         continue
                 else:
                     # 성공 리포트 저장
@@ -227,19 +329,39 @@ class ProductionDaemon:
         report_dir = PROJECT_ROOT / "reports"
         report_dir.mkdir(exist_ok=True)
         
-        filename = f"cycle_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        filename = f"cycle_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json.gz"
         filepath = report_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with gzip.open(filepath, 'wb', compresslevel=3) as f:
+            f.write(_dumps_json(results))
         
         logger.info(f"💾 Cycle report saved: {filename}")
+        self._prune_cycle_reports(report_dir)
+    
+    def _prune_cycle_reports(self, report_dir: Path):
+        """보관 기간이 지난 사이클 리포트 삭제"""
+        cutoff = time.time() - self.report_retention_days * 86400
+        removed = 0
+        with os.scandir(report_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith("cycle_") or not entry.is_file():
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError as e:
+                    logger.warning(f"Failed to prune report {entry.name}: {e}")
+        
+        if removed:
+            logger.info(f"🧹 Removed {removed} cycle reports older than {self.report_retention_days} days")
     
     def _log_system_status(self):
         """시스템 상태 로깅"""
+        now = datetime.now()
         status = {
-            "timestamp": datetime.now().isoformat(),
-            "uptime": str(datetime.now() - self.health_monitor.start_time),
+            "timestamp": now.isoformat(),
+            "uptime": str(now - self.health_monitor.start_time),
             "total_cycles": self.health_monitor.cycle_count,
             "total_errors": self.health_monitor.error_count,
             "last_success": self.health_monitor.last_success.isoformat() if self.health_monitor.last_success else None,
@@ -247,13 +369,31 @@ class ProductionDaemon:
             "current_status": self.health_monitor.system_status
         }
         
-        # 상태 파일 업데이트
+        # 시각 필드를 제외한 내용이 바뀌었을 때만 상태 파일 갱신
+        stable = {k: v for k, v in status.items() if k not in ("timestamp", "uptime")}
+        status_hash = hashlib.blake2b(_dumps_json(stable), digest_size=16).digest()
+        if status_hash == self._last_status_hash:
+            return
+        
         status_file = PROJECT_ROOT / "system_status.json"
-        with open(status_file, 'w') as f:
-            json.dump(status, f, indent=2)
+        self._write_atomic(status_file, _dumps_json(status))
+        self._last_status_hash = status_hash
         
         logger.info(f"📊 System status updated: {status['current_status']}")
     
+    def _write_atomic(self, path: Path, payload: bytes):
+        """임시 파일에 쓴 뒤 교체 - 중간에 종료돼도 잘린 파일이 남지 않음"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # 파일 단위 bind mount(docker-compose)는 교체할 수 없으므로 직접 덮어쓰기
+            with open(path, 'wb') as f:
+                f.write(payload)
+            tmp_path.unlink(missing_ok=True)
+    
     def get_status(self) -> Dict:
         """데몬 상태 조회"""
         return {
@@ -291,8 +431,7 @@ def main():
         
     elif args.run_once:
         # 한 번만 실행
-        from main import TemplateAutomationOrchestrator
-        orchestrator = TemplateAutomationOrchestrator()
+        orchestrator = _get_orchestrator_cls()()
         results = orchestrator.run_full_cycle()
         print(json.dumps(results, indent=2))
         
@@ -11,10 +11,26 @@
 import os
 import sys
 import json
+import time
+import random
+import signal
 import logging
+import threading
+import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Any
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # ✅ 자동 경로 설정 (이 부분이 핵심!)
 PROJECT_ROOT = Path(__file__).parent
@@ -24,117 +40,182 @@ if str(PROJECT_ROOT) not in sys.path:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 템플릿 스펙이 없을 때 사용하는 기본값
+DEFAULT_TEMPLATE_NAME = "AI Productivity Template"
+DEFAULT_TEMPLATE_DESCRIPTION = "Boost your productivity with AI-powered tools"
+DEFAULT_TEMPLATE_FEATURES = ("AI Integration", "Automation", "Analytics")
+DEFAULT_SEO_KEYWORDS = ("template", "AI", "productivity")
+
+# 개별 결과를 {"platform", "success"}로 기록하는 직접 배포 플랫폼 (오케스트레이터 속성, 메서드)
+DIRECT_PUBLISH_PLATFORMS = (
+    ("gumroad", "publish_template"),
+    ("lemon_squeezy", "publish_template"),
+)
+
+
+# 종합 리포트 틀 - 값 자리만 비워 두고 모듈 로드 시 한 번만 만듦
+REPORT_TEMPLATE = """
+╔════════════════════════════════════════════════════════════════╗
+║     🎯 TEMPLATE AUTOMATION SYSTEM - COMPLETE STATUS REPORT     ║
+║                    100% AUTONOMOUS OPERATION                   ║
+╠════════════════════════════════════════════════════════════════╣
+║ Generated: {generated}
+╠════════════════════════════════════════════════════════════════╣
+║ SYSTEM STATUS                                                  ║
+║ ├ Running: {running}                                          ║
+║ └ Last Run: {last_run}
+╠════════════════════════════════════════════════════════════════╣
+║ TODAY'S STATS                                                  ║
+║ ├ Templates Published: {templates_published}                               ║
+║ ├ Platforms Reached: {platforms_reached}                                   ║
+║ ├ Languages Supported: {languages_supported}                                 ║
+║ ├ Marketing Campaigns: {marketing_campaigns}                               ║
+║ └ Revenue Today: ${revenue:.2f}
+╠════════════════════════════════════════════════════════════════╣
+║ SYSTEM CAPABILITIES (✅ = Active, ❌ = Inactive)               ║
+{capabilities_block}╠════════════════════════════════════════════════════════════════╣
+║ KEY FEATURES                                                   ║
+║ ├ 🤖 AI Template Generation (Claude/GPT-4)                     ║
+║ ├ 🌐 5-Language Support (EN, ES, PT, JA, DE)                   ║
+║ ├ 📱 4-Platform Distribution (Gumroad, Etsy, Payhip, LS)       ║
+║ ├ 💰 Multi-Wallet Crypto Payments (ETH, SOL, BTC, USDC)       ║
+║ ├ 📢 Full Marketing Automation (TikTok, YouTube, Telegram)    ║
+║ ├ 📊 Competitor Analysis & Market Intelligence                ║
+║ ├ 🎨 Free AI Image Generation (Bing, Stable Diffusion)        ║
+║ └ 🔍 Quality Assurance & Risk Management                      ║
+╚════════════════════════════════════════════════════════════════╝
+"""
+
+
+def _dump(data: Any) -> str:
+    """CLI 출력용 들여쓴 JSON 문자열 (orjson 우선, 없으면 표준 json)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=2, default=str)
+
+
+@dataclass(slots=True)
+class DailyStats:
+    """오늘의 운영 통계"""
+    templates_published: int = 0
+    revenue: float = 0.0
+    platforms_reached: int = 0
+    languages_supported: int = 5
+    errors: List[Dict] = field(default_factory=list)
+    marketing_campaigns: int = 0
+
+
+@lru_cache(maxsize=None)
+def _module_installed(module_name: str) -> bool:
+    """모듈을 import하지 않고 설치 여부만 확인 (프로세스 동안 바뀌지 않으므로 캐시)"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# 리포트의 기능 행 - 이름 폭(35)과 테두리가 고정이므로 모듈 로드 시 (활성, 비활성) 행을 미리 만듦
+_CAP_ROWS = {
+    capability: tuple(
+        f"║ ├ {mark} {capability.replace('_', ' ').title():<35}    ║\n" for mark in ("✅", "❌")
+    )
+    for capability in ("ai_generation", "multilingual_5lang", "platforms_4", "crypto_payments",
+                       "marketing_automation", "competitor_analysis", "ai_images_free",
+                       "quality_assurance", "monitoring")
+}
+
 
 class TemplateAutomationOrchestrator:
     """✅ 완전 자율형 템플릿 비즈니스 오케스트레이터"""
     
+    # 속성 이름 -> (모듈, 모듈 속성, 호출 여부, 로그 이름)
+    # 처음 접근할 때 불러오므로 status/test 명령은 사용하지 않는 모듈을 로드하지 않음
+    _MODULE_REGISTRY = {
+        "ai_generator": ("ai.template_generator", "TemplateAIGenerator", True, "AI Template Generator"),
+        "multilingual": ("ai.multilingual", "get_multilingual_manager", True, "Multilingual Support (5 languages)"),
+        "gumroad": ("platforms.gumroad", "gumroad_automation", False, "Gumroad Automation"),
+        "lemon_squeezy": ("platforms.lemon_squeezy", "lemon_squeezy_automation", False, "Lemon Squeezy Automation"),
+        "platform_expansion": ("platforms.additional_platforms", "platform_expansion", False, "Platform Expansion (Etsy, Payhip)"),
+        "qa": ("qa.quality_assurance", "qa_system", False, "Quality Assurance System"),
+        "crypto": ("payments.multi_wallet_crypto", "crypto_optimizer", False, "Crypto Payment System"),
+        "marketing": ("marketing.automation", "marketing_automation", False, "Marketing Automation (TikTok, YouTube, Telegram, Discord, Email)"),
+        "competitor": ("analytics.competitor_analysis", "competitor_analyzer", False, "Competitor Analysis"),
+        "trends": ("analytics.competitor_analysis", "trend_analyzer", False, "Trend Analysis"),
+        "ai_images": ("analytics.competitor_analysis", "free_ai_generator", False, "AI Image Generation"),
+        "monitor": ("monitoring.monitor", "monitoring_system", False, "Monitoring System"),
+    }
+    
     def __init__(self):
-        self._init_all_modules()
+        self.deploy_timeout = 30  # 플랫폼 배포 전체 대기 시간 (초)
+        self._stop_event = threading.Event()  # 예약 사이클 종료 신호
+        self._rng = random.Random()  # 가격 변동용 (전역 random 상태와 분리)
+        
+        # 시장 데이터/경쟁사 분석은 시간 단위로만 바뀌므로 사이클 간 재사용
+        self.analysis_cache_ttl = 3600  # 초
+        self._ttl_cache = {}  # key -> (만료 시각, 값)
+        self._cache_hits = 0
+        self._cache_misses = 0
         
         # 상태 관리
         self.is_running = False
         self.last_run = None
-        self.daily_stats = {
-            "templates_published": 0,
-            "revenue": 0,
-            "platforms_reached": 0,
-            "languages_supported": 5,
-            "errors": [],
-            "marketing_campaigns": 0
-        }
+        self.daily_stats = DailyStats()
         
         logger.info("🎯 Template Automation Orchestrator initialized - 100% Autonomous Mode")
     
-    def _init_all_modules(self):
-        """✅ 모든 핵심 모듈 초기화"""
+    def __getattr__(self, name: str):
+        """등록된 모듈을 처음 접근할 때 로드 (실패 시 None, 결과는 인스턴스에 캐시)"""
+        entry = type(self)._MODULE_REGISTRY.get(name)
+        if entry is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
         
-        # 1. AI 템플릿 생성기 (직접 생성)
+        module_name, attr, call, label = entry
         try:
-            from ai.template_generator import TemplateAIGenerator
-            self.ai_generator = TemplateAIGenerator()
-            logger.info("✅ AI Template Generator loaded")
+            value = getattr(importlib.import_module(module_name), attr)
+            if call:
+                value = value()
+            logger.info("✅ %s loaded", label)
         except Exception as e:
-            logger.warning(f"⚠️ AI generator not available: {e}")
-            self.ai_generator = None
+            logger.warning("⚠️ %s not available: %s", label, e)
+            value = None
         
-        # 2. 다국어 지원
-        try:
-            from ai.multilingual import multilingual_manager
-            self.multilingual = multilingual_manager
-            logger.info("✅ Multilingual Support loaded (5 languages)")
-        except ImportError:
-            logger.warning("⚠️ Multilingual system not available")
-            self.multilingual = None
-        
-        # 3. 플랫폼 자동화
-        try:
-            from platforms.gumroad import gumroad_automation
-            from platforms.lemon_squeezy import lemon_squeezy_automation
-            from platforms.additional_platforms import platform_expansion
-            self.gumroad = gumroad_automation
-            self.lemon_squeezy = lemon_squeezy_automation
-            self.platform_expansion = platform_expansion
-            logger.info("✅ Platform Automation loaded (Gumroad, Lemon Squeezy, Etsy, Payhip)")
-        except ImportError:
-            logger.warning("⚠️ Platform automation not available")
-            self.gumroad = None
-            self.lemon_squeezy = None
-            self.platform_expansion = None
-        
-        # 4. 품질 보장
-        try:
-            from qa.quality_assurance import qa_system
-            self.qa = qa_system
-            logger.info("✅ Quality Assurance System loaded")
-        except ImportError:
-            logger.warning("⚠️ QA system not available")
-            self.qa = None
-        
-        # 5. 암호화페 결제
-        try:
-            from payments.multi_wallet_crypto import crypto_optimizer
-            self.crypto = crypto_optimizer
-            logger.info("✅ Crypto Payment System loaded")
-        except ImportError:
-            logger.warning("⚠️ Crypto payment system not available")
-            self.crypto = None
-        
-        # 6. 마케팅 자동화
-        try:
-            from marketing.automation import marketing_automation
-            self.marketing = marketing_automation
-            logger.info("✅ Marketing Automation loaded (TikTok, YouTube, Telegram, Discord, Email)")
-        except ImportError:
-            logger.warning("⚠️ Marketing automation not available")
-            self.marketing = None
-        
-        # 7. 경쟁사 분석
-        try:
-            from analytics.competitor_analysis import competitor_analyzer, trend_analyzer, free_ai_generator
-            self.competitor = competitor_analyzer
-            self.trends = trend_analyzer
-            self.ai_images = free_ai_generator
-            logger.info("✅ Competitor Analysis & AI Image Generation loaded")
-        except ImportError:
-            logger.warning("⚠️ Analytics systems not available")
-            self.competitor = None
-            self.trends = None
-            self.ai_images = None
-        
-        # 8. 모니터링
-        try:
-            from monitoring.monitor import monitoring_system
-            self.monitor = monitoring_system
-            logger.info("✅ Monitoring System loaded")
-        except ImportError:
-            logger.warning("⚠️ Monitoring system not available")
-            self.monitor = None
+        self.__dict__[name] = value
+        return value
+    
+    def _capability(self, name: str) -> bool:
+        """모듈 사용 가능 여부 - 아직 로드하지 않은 모듈은 import 없이 설치 여부만 확인"""
+        if name in self.__dict__:
+            return self.__dict__[name] is not None
+        return _module_installed(self._MODULE_REGISTRY[name][0])
+    
+    def _system_capabilities(self) -> Mapping[str, bool]:
+        """기능 활성 여부 - 등록된 모듈이 모두 로드된 뒤에는 값이 바뀌지 않으므로 한 번만 만들어 캐시"""
+        cached = self.__dict__.get("_capabilities")
+        if cached is not None:
+            return cached
+        
+        capabilities = {
+            "ai_generation": self._capability("ai_generator"),
+            "multilingual_5lang": self._capability("multilingual"),
+            "platforms_4": self._capability("gumroad") or self._capability("platform_expansion"),
+            "crypto_payments": self._capability("crypto"),
+            "marketing_automation": self._capability("marketing"),
+            "competitor_analysis": self._capability("competitor"),
+            "ai_images_free": self._capability("ai_images"),
+            "quality_assurance": self._capability("qa"),
+            "monitoring": self._capability("monitor")
+        }
+        if all(name in self.__dict__ for name in self._MODULE_REGISTRY):
+            capabilities = MappingProxyType(capabilities)
+            self.__dict__["_capabilities"] = capabilities
+        return capabilities
     
     def run_full_cycle(self) -> Dict:
         """✅ 완전 자동화 사이클 실행"""
         logger.info("🚀 Starting full autonomous automation cycle...")
         self.is_running = True
         cycle_start = datetime.now()
+        cycle_start_ts = time.perf_counter()
         
         results = {
             "cycle_start": cycle_start.isoformat(),
@@ -152,78 +233,75 @@ class TemplateAutomationOrchestrator:
         }
         
         try:
+            # 단계별로 예외를 격리 - 한 단계가 실패해도 오류만 기록하고 나머지 단계는 계속 진행
             # === Phase 1: 시장 분석 & 트렌드 ===
             logger.info("📊 Phase 1: Market Analysis & Trend Detection...")
-            market_data = self._collect_market_data()
-            trend_analysis = self._analyze_trends(market_data)
+            market_data = self._run_phase("market_data", results, self._collect_market_data)
+            trend_analysis = None
+            if market_data is not None:
+                trend_analysis = self._run_phase("trend_analysis", results, self._analyze_trends, market_data)
             
             # === Phase 2: AI 템플릿 생성 ===
             logger.info("🤖 Phase 2: AI Template Generation...")
-            template_spec = self._generate_template(trend_analysis)
-            
-            # === Phase 3: 다국어 콘텐츠 생성 ===
-            logger.info("🌐 Phase 3: Multilingual Content Generation...")
-            template_data_for_multilingual = {
-                "id": getattr(template_spec, 'id', f"template_{datetime.now().timestamp()}") if template_spec else f"template_{datetime.now().timestamp()}",
-                "name": getattr(template_spec, 'name', "AI Productivity Template") if template_spec else "AI Productivity Template",
-                "description": getattr(template_spec, 'description', "Boost your productivity with AI-powered tools") if template_spec else "Boost your productivity with AI-powered tools",
-                "features": getattr(template_spec, 'features', ["AI Integration", "Automation", "Analytics"]) if template_spec else ["AI Integration", "Automation", "Analytics"],
-                "seo_keywords": getattr(template_spec, 'metadata', {}).get("seo_keywords", ["template", "AI", "productivity"]) if template_spec else ["template", "AI", "productivity"]
-            }
+            template_spec = None
+            if trend_analysis is not None:
+                template_spec = self._run_phase("template_generation", results, self._generate_template, trend_analysis)
             
-            if self.multilingual:
-                multi_content = self.multilingual.create_multilingual_template(template_data_for_multilingual)
-                results["multi_language_versions"] = list(multi_content["translations"].keys())
-                logger.info(f"   ✅ Created {len(results['multi_language_versions'])} language versions")
-            
-            # === Phase 4: AI 이미지 생성 ===
-            logger.info("🎨 Phase 4: AI Image Generation...")
+            # Phase 3 이후 단계에서 공통으로 쓰는 템플릿 데이터 (스펙이 없으면 기본값)
+            template_data_for_multilingual = self._template_payload(template_spec, cycle_start)
             template_data_for_images = {
                 "name": template_data_for_multilingual["name"],
                 "features": template_data_for_multilingual["features"]
             }
+            category = template_data_for_multilingual.get("features", ["productivity"])[0] if template_data_for_multilingual else "productivity"
             
-            if self.ai_images:
-                images = self.ai_images.generate_social_media_assets(template_data_for_images)
-                results["ai_images_generated"] = list(images.keys())
-                logger.info(f"   ✅ Generated {len(results['ai_images_generated'])} image types")
+            # 지연 로드되는 모듈은 작업 스레드에서 처음 로드되지 않도록 미리 로드
+            for name in ("multilingual", "ai_images", "qa", "competitor", "marketing",
+                         "gumroad", "lemon_squeezy", "platform_expansion"):
+                getattr(self, name)
             
-            # === Phase 5: 품질 검증 ===
-            logger.info("🔍 Phase 5: Quality Assurance...")
-            qa_report = self._validate_template(template_data_for_multilingual)
-            if qa_report and not qa_report.passed:
-                logger.warning(f"   ⚠️ QA Issues: {qa_report.issues_found}")
+            # Phase 3/4/5/9는 서로 독립적인 I/O 작업이므로 동시에 실행
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                multilingual_future = executor.submit(self._run_phase, "multilingual", results,
+                                                      self._run_multilingual_phase, template_data_for_multilingual)
+                images_future = executor.submit(self._run_phase, "ai_images", results,
+                                                self._run_images_phase, template_data_for_images)
+                qa_future = executor.submit(self._run_phase, "quality_assurance", results,
+                                            self._run_qa_phase, template_data_for_multilingual, cycle_start)
+                insights_future = executor.submit(self._run_phase, "competitor_analysis", results,
+                                                  self._run_competitor_phase, category)
+                
+                results["multi_language_versions"] = multilingual_future.result() or []
+                results["ai_images_generated"] = images_future.result() or []
+                qa_report = qa_future.result()
+                results["competitor_insights"] = insights_future.result() or []
             
             # === Phase 6: 가격 최적화 ===
             logger.info("💰 Phase 6: Price Optimization...")
-            final_price = self._optimize_price(template_data_for_multilingual, qa_report)
+            final_price = self._run_phase("price_optimization", results,
+                                          self._optimize_price, template_data_for_multilingual, qa_report)
+            
+            # Phase 7(배포)과 Phase 8(마케팅)도 동시에 실행 - 배포는 가격이 정해졌을 때만
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                deploy_future = None
+                if final_price is not None:
+                    deploy_future = executor.submit(self._run_phase, "deploy", results, self._run_deploy_phase,
+                                                    template_data_for_multilingual, final_price, cycle_start)
+                marketing_future = executor.submit(self._run_phase, "marketing", results,
+                                                   self._run_marketing_phase, template_data_for_images)
+                
+                platform_results = (deploy_future.result() if deploy_future else None) or []
+                marketing_results = marketing_future.result()
             
-            # === Phase 7: 플랫폼 배포 (4개 플랫폼) ===
-            logger.info("🚀 Phase 7: Multi-Platform Distribution...")
-            platform_results = self._deploy_to_platforms(template_data_for_multilingual, final_price)
             results["platform_deployments"] = platform_results
             results["platforms_reached"] = len(platform_results)
-            logger.info(f"   ✅ Deployed to {len(platform_results)} platforms")
-            
-            # === Phase 8: 마케팅 자동화 ===
-            logger.info("📢 Phase 8: Marketing Automation...")
-            if self.marketing:
-                marketing_results = self._execute_marketing(template_data_for_images)
+            if marketing_results is not None:
                 results["marketing_campaigns"] = marketing_results
-                self.daily_stats["marketing_campaigns"] = len(marketing_results)
-                logger.info(f"   ✅ Executed {len(marketing_results)} marketing actions")
-            
-            # === Phase 9: 경쟁사 분석 ===
-            logger.info("📈 Phase 9: Competitor Intelligence...")
-            category = template_data_for_multilingual.get("features", ["productivity"])[0] if template_data_for_multilingual else "productivity"
-            if self.competitor:
-                insights = self._analyze_competition(category)
-                results["competitor_insights"] = [insights.get("niche", "general")]
-                logger.info(f"   ✅ Generated market insights")
+                self.daily_stats.marketing_campaigns = len(marketing_results)
             
             # === Phase 10: 모니터링 & 리포트 ===
             logger.info("📊 Phase 10: Monitoring & Reporting...")
-            self._update_monitoring()
+            self._run_phase("monitoring", results, self._update_monitoring)
             
             # 결과 집계
             results["templates_processed"].append({
@@ -234,25 +312,121 @@ class TemplateAutomationOrchestrator:
                 "qa_score": qa_report.risk_score if qa_report else 0
             })
             
-            self.daily_stats["templates_published"] += 1
-            self.daily_stats["platforms_reached"] = results["platforms_reached"]
-            
-        except Exception as e:
-            logger.error(f"❌ Error in automation cycle: {e}")
-            results["errors"].append({"step": "main_cycle", "error": str(e)})
+            self.daily_stats.templates_published += 1
+            self.daily_stats.platforms_reached = results["platforms_reached"]
         
         finally:
             self.is_running = False
             self.last_run = datetime.now()
             results["cycle_end"] = self.last_run.isoformat()
-            results["duration_seconds"] = (self.last_run - cycle_start).total_seconds()
+            results["duration_seconds"] = time.perf_counter() - cycle_start_ts
         
-        logger.info(f"✅ Automation cycle completed in {results['duration_seconds']:.2f} seconds")
-        logger.info(f"   📊 Stats: {self.daily_stats}")
+        logger.info("✅ Automation cycle completed in %.2f seconds", results['duration_seconds'])
+        logger.info("   📊 Stats: %s", self.daily_stats)
         
         return results
     
+    def _run_phase(self, name: str, results: Dict, fn, *args) -> Any:
+        """단계 하나 실행 - 실패하면 results["errors"]에 기록하고 None 반환"""
+        try:
+            return fn(*args)
+        except Exception as e:
+            logger.error("❌ Phase %s failed: %s", name, e)
+            results["errors"].append({"step": name, "error": str(e)})
+            return None
+    
+    def _run_multilingual_phase(self, template_data: Dict) -> List[str]:
+        """Phase 3: 다국어 콘텐츠 생성 - 생성된 언어 코드 목록"""
+        logger.info("🌐 Phase 3: Multilingual Content Generation...")
+        if not self.multilingual:
+            return []
+        multi_content = self.multilingual.create_multilingual_template(template_data)
+        languages = list(multi_content["translations"].keys())
+        logger.info("   ✅ Created %d language versions", len(languages))
+        return languages
+    
+    def _run_images_phase(self, template_data: Dict) -> List[str]:
+        """Phase 4: AI 이미지 생성 - 생성된 이미지 종류 목록"""
+        logger.info("🎨 Phase 4: AI Image Generation...")
+        if not self.ai_images:
+            return []
+        images = self.ai_images.generate_social_media_assets(template_data)
+        logger.info("   ✅ Generated %d image types", len(images))
+        return list(images.keys())
+    
+    def _run_qa_phase(self, template_data: Dict, now: Optional[datetime] = None) -> Any:
+        """Phase 5: 품질 검증"""
+        logger.info("🔍 Phase 5: Quality Assurance...")
+        qa_report = self._validate_template(template_data, now)
+        if qa_report and not qa_report.passed:
+            logger.warning("   ⚠️ QA Issues: %s", qa_report.issues_found)
+        return qa_report
+    
+    def _run_competitor_phase(self, category: str) -> List[str]:
+        """Phase 9: 경쟁사 분석"""
+        logger.info("📈 Phase 9: Competitor Intelligence...")
+        if not self.competitor:
+            return []
+        insights = self._analyze_competition(category)
+        logger.info("   ✅ Generated market insights")
+        return [insights.get("niche", "general")]
+    
+    def _run_deploy_phase(self, template_data: Dict, price: float, now: Optional[datetime] = None) -> List[Dict]:
+        """Phase 7: 플랫폼 배포 (4개 플랫폼)"""
+        logger.info("🚀 Phase 7: Multi-Platform Distribution...")
+        platform_results = self._deploy_to_platforms(template_data, price, now)
+        logger.info("   ✅ Deployed to %d platforms", len(platform_results))
+        return platform_results
+    
+    def _run_marketing_phase(self, template_data: Dict) -> Optional[List[Dict]]:
+        """Phase 8: 마케팅 자동화 (모듈이 없으면 None)"""
+        logger.info("📢 Phase 8: Marketing Automation...")
+        if not self.marketing:
+            return None
+        marketing_results = self._execute_marketing(template_data)
+        logger.info("   ✅ Executed %d marketing actions", len(marketing_results))
+        return marketing_results
+    
+    def _template_payload(self, template_spec, now: Optional[datetime] = None) -> Dict:
+        """Phase 3 이후 단계에서 쓰는 템플릿 데이터 (스펙이 없으면 기본값, now는 사이클 시작 시각)"""
+        now = now or datetime.now()
+        fallback_id = f"template_{now.timestamp()}"
+        if template_spec is None:
+            return {
+                "id": fallback_id,
+                "name": DEFAULT_TEMPLATE_NAME,
+                "description": DEFAULT_TEMPLATE_DESCRIPTION,
+                "features": list(DEFAULT_TEMPLATE_FEATURES),
+                "seo_keywords": list(DEFAULT_SEO_KEYWORDS)
+            }
+        
+        metadata = getattr(template_spec, 'metadata', None) or {}
+        return {
+            "id": getattr(template_spec, 'id', fallback_id),
+            "name": getattr(template_spec, 'name', DEFAULT_TEMPLATE_NAME),
+            "description": getattr(template_spec, 'description', DEFAULT_TEMPLATE_DESCRIPTION),
+            "features": getattr(template_spec, 'features', None) or list(DEFAULT_TEMPLATE_FEATURES),
+            "seo_keywords": metadata.get("seo_keywords") or list(DEFAULT_SEO_KEYWORDS)
+        }
+    
+    def _ttl_cached(self, key, compute):
+        """analysis_cache_ttl 동안 compute() 결과 재사용"""
+        now = time.monotonic()
+        entry = self._ttl_cache.get(key)
+        if entry is not None and entry[0] > now:
+            self._cache_hits += 1
+            return entry[1]
+        
+        self._cache_misses += 1
+        value = compute()
+        self._ttl_cache[key] = (now + self.analysis_cache_ttl, value)
+        return value
+    
     def _collect_market_data(self) -> List[Dict]:
+        """시장 데이터 수집 (analysis_cache_ttl 동안 캐시)"""
+        return self._ttl_cached(("market_data",), self._fetch_market_data)
+    
+    def _fetch_market_data(self) -> List[Dict]:
         """시장 데이터 수집"""
         if self.trends:
             trending = self.trends.get_trending_niches()
@@ -273,7 +447,8 @@ class TemplateAutomationOrchestrator:
     def _analyze_trends(self, market_data: List[Dict]) -> Any:
         """트렌드 분석 및 니치 선정"""
         if self.ai_generator:
-            return self.ai_generator.analyze_trends_and_decide(market_data)
+            # 스펙까지 한 번의 AI 호출로 생성 - Phase 2의 generate_template_spec은 캐시된 결과 사용
+            return self.ai_generator.generate_template_end_to_end(market_data)["trend_analysis"]
         
         # 폴백
         from ai.template_generator import TrendAnalysis, TemplateType
@@ -296,15 +471,16 @@ class TemplateAutomationOrchestrator:
             return self.ai_generator.generate_template_spec(trend_analysis)
         return None
     
-    def _validate_template(self, template_data: Dict) -> Any:
-        """품질 검증"""
+    def _validate_template(self, template_data: Dict, now: Optional[datetime] = None) -> Any:
+        """품질 검증 (now는 사이클 시작 시각 - ID 기본값과 리포트 생성 시각에 사용)"""
+        now = now or datetime.now()
         if self.qa:
             return self.qa.validate_template({
                 "name": template_data.get("name", "Template"),
                 "description": template_data.get("description", ""),
                 "price": template_data.get("price", 0),
                 "tags": template_data.get("features", []),
-                "template_id": template_data.get("id", str(datetime.now().timestamp()))
+                "template_id": template_data.get("id", str(now.timestamp()))
             })
         
         from qa.quality_assurance import QAReport
@@ -314,19 +490,22 @@ class TemplateAutomationOrchestrator:
             checks={},
             issues_found=[],
             recommendations=[],
-            created_at=datetime.now(),
+            created_at=now,
             risk_score=0.0
         )
     
     def _optimize_price(self, template_data: Dict, qa_report) -> float:
         """가격 최적화"""
-        base_price = template_data.get("price", 49)
-        # 기본 가격에 랜덤 변동 (-10% ~ +10%)
-        import random
-        return round(base_price * random.uniform(0.9, 1.1), 2)
+        return self._optimize_prices([template_data])[0]
+    
+    def _optimize_prices(self, templates: List[Dict]) -> List[float]:
+        """여러 템플릿 가격을 한 번에 최적화 - 기본 가격에 랜덤 변동 (-10% ~ +10%)"""
+        uniform = self._rng.uniform
+        return [round(t.get("price", 49) * uniform(0.9, 1.1), 2) for t in templates]
     
-    def _deploy_to_platforms(self, template_data: Dict, price: float) -> List[Dict]:
-        """4개 플랫폼에 배포"""
+    def _deploy_to_platforms(self, template_data: Dict, price: float, now: Optional[datetime] = None) -> List[Dict]:
+        """4개 플랫폼에 배포 (now는 사이클 시작 시각 - ID 기본값에 사용)"""
+        now = now or datetime.now()
         results = []
         
         data = {
@@ -336,41 +515,46 @@ class TemplateAutomationOrchestrator:
             "features": template_data.get("features", []),
             "category": template_data.get("features", ["productivity"])[0] if template_data else "productivity",
             "seo_keywords": template_data.get("seo_keywords", []),
-            "id": template_data.get("id", str(datetime.now().timestamp()))
+            "id": template_data.get("id", str(now.timestamp()))
         }
         
-        try:
-            if self.platform_expansion:
-                result = self.platform_expansion.distribute_template(data)
-                # result가 dict인지 확인
-                if isinstance(result, dict):
-                    results = result.get("deployments", [])
-                else:
-                    logger.warning(f"Unexpected result type from platform_expansion: {type(result)}")
-                    
-        except Exception as e:
-            logger.warning(f"Platform expansion failed: {e}")
-        
-        # 기본 배포 (플랫폼 API 키가 있을 때만)
-        try:
-            if self.gumroad:
-                result = self.gumroad.publish_template(data)
-                if isinstance(result, dict):
-                    results.append({
-                        "platform": "gumroad", 
-                        "success": result.get("success", False)
-                    })
-            
-            if self.lemon_squeezy:
-                result = self.lemon_squeezy.publish_template(data)
-                if isinstance(result, dict):
-                    results.append({
-                        "platform": "lemon_squeezy", 
-                        "success": result.get("success", False)
-                    })
-                    
-        except Exception as e:
-            logger.warning(f"Basic platform deployment failed: {e}")
+        # 플랫폼별 배포는 서로 독립적인 HTTP 요청이므로 동시에 실행
+        tasks = [
+            (name, getattr(client, method))
+            for name, method in (("platform_expansion", "distribute_template"),) + DIRECT_PUBLISH_PLATFORMS
+            for client in (getattr(self, name),) if client is not None
+        ]
+        outcomes = {}
+        if tasks:
+            executor = ThreadPoolExecutor(max_workers=len(tasks))
+            try:
+                futures = {executor.submit(fn, dict(data)): name for name, fn in tasks}
+                for future in as_completed(futures, timeout=self.deploy_timeout):
+                    name = futures[future]
+                    try:
+                        outcomes[name] = future.result()
+                    except Exception as e:
+                        logger.warning("%s deployment failed: %s", name, e)
+            except FuturesTimeoutError:
+                pending = [name for future, name in futures.items() if not future.done()]
+                logger.warning("Platform deployment timed out after %ss: %s", self.deploy_timeout, pending)
+            finally:
+                executor.shutdown(wait=False)
+        
+        # 결과는 기존 순서(확장 플랫폼 → Gumroad → Lemon Squeezy)로 정리
+        expansion = outcomes.get("platform_expansion")
+        if isinstance(expansion, dict):
+            results.extend(expansion.get("deployments", []))
+        elif "platform_expansion" in outcomes:
+            logger.warning("Unexpected result type from platform_expansion: %s", type(expansion))
+        
+        for name, _ in DIRECT_PUBLISH_PLATFORMS:
+            result = outcomes.get(name)
+            if isinstance(result, dict):
+                results.append({
+                    "platform": name,
+                    "success": result.get("success", False)
+                })
         
         # 결과가 없으면 시뮬레이션 (데모용)
         if not results:
@@ -381,8 +565,6 @@ class TemplateAutomationOrchestrator:
             ]
         
         return results
-        
-        return results
     
     def _execute_marketing(self, template_data: Dict) -> List[Dict]:
         """마케팅 자동화 실행"""
@@ -393,105 +575,82 @@ class TemplateAutomationOrchestrator:
         return result.get("campaigns_executed", [])
     
     def _analyze_competition(self, niche: str) -> Dict:
-        """경쟁사 분석"""
+        """경쟁사 분석 (analysis_cache_ttl 동안 캐시)"""
         if self.competitor:
-            return self.competitor.analyze_market(niche)
+            return self._ttl_cached(("market", niche), lambda: self.competitor.analyze_market(niche))
         return {"niche": niche, "status": "analyzed"}
     
     def _update_monitoring(self):
         """모니터링 업데이트"""
         if self.monitor:
             metrics = self.monitor.collect_metrics({
-                "published_today": self.daily_stats["templates_published"],
-                "daily_revenue": self.daily_stats["revenue"],
+                "published_today": self.daily_stats.templates_published,
+                "daily_revenue": self.daily_stats.revenue,
                 "platforms": {"gumroad": "healthy", "etsy": "healthy", "payhip": "healthy"},
-                "total_templates": self.daily_stats["templates_published"]
+                "total_templates": self.daily_stats.templates_published
             })
             alerts = self.monitor.check_alerts(metrics)
             for alert in alerts:
                 self.monitor.send_alert(alert)
     
     def run_scheduled_cycles(self, interval_hours: int = 6):
-        """예약된 사이클 실행"""
-        import time
-        logger.info(f"🔄 Starting scheduled cycles (every {interval_hours} hours)...")
+        """예약된 사이클 실행 (SIGINT/SIGTERM 시 진행 중인 사이클을 마치고 종료)"""
+        logger.info("🔄 Starting scheduled cycles (every %s hours)...", interval_hours)
+        
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda signum, frame: self.stop())
         
-        while True:
+        while not self._stop_event.is_set():
             try:
                 results = self.run_full_cycle()
-                logger.info(f"✅ Cycle completed: {len(results['templates_processed'])} templates, "
-                           f"{results['platforms_reached']} platforms, "
-                           f"{results['languages_reached']} languages")
-                time.sleep(interval_hours * 3600)
+                logger.info("✅ Cycle completed: %d templates, %s platforms, %s languages",
+                            len(results['templates_processed']), results['platforms_reached'],
+                            results['languages_reached'])
+                wait_seconds = interval_hours * 3600
                 
-            except KeyboardInterrupt:
-                logger.info("🛑 Stopping scheduled cycles...")
-                break
             except Exception as e:
-                logger.error(f"❌ Error in scheduled cycle: {e}")
-                time.sleep(300)
+                logger.error("❌ Error in scheduled cycle: %s", e)
+                wait_seconds = 300
+            
+            # 대기 중 종료 신호가 오면 바로 깨어남
+            if self._stop_event.wait(wait_seconds):
+                break
+        
+        logger.info("🛑 Stopping scheduled cycles...")
+    
+    def stop(self):
+        """예약 사이클 중지 요청"""
+        self._stop_event.set()
     
     def get_status(self) -> Dict:
         """시스템 상태 조회"""
         return {
             "is_running": self.is_running,
             "last_run": self.last_run.isoformat() if self.last_run else None,
-            "daily_stats": self.daily_stats,
-            "system_capabilities": {
-                "ai_generation": self.ai_generator is not None,
-                "multilingual_5lang": self.multilingual is not None,
-                "platforms_4": (self.gumroad is not None or self.platform_expansion is not None),
-                "crypto_payments": self.crypto is not None,
-                "marketing_automation": self.marketing is not None,
-                "competitor_analysis": self.competitor is not None,
-                "ai_images_free": self.ai_images is not None,
-                "quality_assurance": self.qa is not None,
-                "monitoring": self.monitor is not None
-            }
+            "daily_stats": asdict(self.daily_stats),
+            "analysis_cache": {"hits": self._cache_hits, "misses": self._cache_misses},
+            "system_capabilities": dict(self._system_capabilities())
         }
     
     def generate_comprehensive_report(self) -> str:
         """✅ 완전 종합 리포트"""
         status = self.get_status()
         
-        report = f"""
-╔════════════════════════════════════════════════════════════════╗
-║     🎯 TEMPLATE AUTOMATION SYSTEM - COMPLETE STATUS REPORT     ║
-║                    100% AUTONOMOUS OPERATION                   ║
-╠════════════════════════════════════════════════════════════════╣
-║ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-╠════════════════════════════════════════════════════════════════╣
-║ SYSTEM STATUS                                                  ║
-║ ├ Running: {'✅ Yes' if status['is_running'] else '❌ No'}                                          ║
-║ └ Last Run: {status['last_run'] or 'Never'}
-╠════════════════════════════════════════════════════════════════╣
-║ TODAY'S STATS                                                  ║
-║ ├ Templates Published: {status['daily_stats']['templates_published']}                               ║
-║ ├ Platforms Reached: {status['daily_stats']['platforms_reached']}                                   ║
-║ ├ Languages Supported: {status['daily_stats']['languages_supported']}                                 ║
-║ ├ Marketing Campaigns: {status['daily_stats']['marketing_campaigns']}                               ║
-║ └ Revenue Today: ${status['daily_stats']['revenue']:.2f}
-╠════════════════════════════════════════════════════════════════╣
-║ SYSTEM CAPABILITIES (✅ = Active, ❌ = Inactive)               ║
-"""
-        
-        for capability, available in status['system_capabilities'].items():
-            emoji = "✅" if available else "❌"
-            readable_name = capability.replace("_", " ").title()
-            report += f"║ ├ {emoji} {readable_name:<35}    ║\n"
-        
-        report += """╠════════════════════════════════════════════════════════════════╣
-║ KEY FEATURES                                                   ║
-║ ├ 🤖 AI Template Generation (Claude/GPT-4)                     ║
-║ ├ 🌐 5-Language Support (EN, ES, PT, JA, DE)                   ║
-║ ├ 📱 4-Platform Distribution (Gumroad, Etsy, Payhip, LS)       ║
-║ ├ 💰 Multi-Wallet Crypto Payments (ETH, SOL, BTC, USDC)       ║
-║ ├ 📢 Full Marketing Automation (TikTok, YouTube, Telegram)    ║
-║ ├ 📊 Competitor Analysis & Market Intelligence                ║
-║ ├ 🎨 Free AI Image Generation (Bing, Stable Diffusion)        ║
-║ └ 🔍 Quality Assurance & Risk Management                      ║
-╚════════════════════════════════════════════════════════════════╝
-"""
+        report = REPORT_TEMPLATE.format_map({
+            "generated": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "running": '✅ Yes' if status['is_running'] else '❌ No',
+            "last_run": status['last_run'] or 'Never',
+            "templates_published": status['daily_stats']['templates_published'],
+            "platforms_reached": status['daily_stats']['platforms_reached'],
+            "languages_supported": status['daily_stats']['languages_supported'],
+            "marketing_campaigns": status['daily_stats']['marketing_campaigns'],
+            "revenue": status['daily_stats']['revenue'],
+            "capabilities_block": "".join(
+                _CAP_ROWS[capability][0 if available else 1]
+                for capability, available in status['system_capabilities'].items()
+            )
+        })
         
         return report
 
@@ -505,7 +664,7 @@ def main():
         
         if command == "run":
             results = orchestrator.run_full_cycle()
-            print(json.dumps(results, indent=2))
+            print(_dump(results))
         
         elif command == "schedule":
             interval = int(sys.argv[2]) if len(sys.argv) > 2 else 6
@@ -516,17 +675,16 @@ def main():
         
         elif command == "test":
             status = orchestrator.get_status()
-            print(json.dumps(status, indent=2))
+            print(_dump(status))
         
         elif command == "quick":
-            import time
-            start = time.time()
+            start = time.perf_counter()
             results = orchestrator.run_full_cycle()
-            print(f"✅ Quick test completed in {time.time() - start:.2f} seconds")
+            print(f"✅ Quick test completed in {time.perf_counter() - start:.2f} seconds")
         
     else:
         results = orchestrator.run_full_cycle()
-        print(json.dumps(results, indent=2))
+        print(_dump(results))
 
 
 if __name__ == "__main__":
@@ -1,15 +1,157 @@
 """Marketing Automation Module - Social Media & Campaign Management"""
 import os
+import html
 import json
+import time
+import queue
+import atexit
+import sqlite3
+import threading
 import requests
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
+import heapq
 import logging
+from collections import deque
+from functools import lru_cache
+from operator import itemgetter
+
+from core.discord import get_discord_batcher
+from core.http import create_session, get_shared_session, post_json
+from core.ratelimit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# SendGrid v3 발송 API (요청 하나에 personalizations 최대 1000개)
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+SENDGRID_BATCH_SIZE = 1000
+
+# 보관할 예약 게시물 최대 개수
+MAX_SCHEDULED_POSTS = 1000
+
+# 플랫폼별로 예약 게시물을 이만큼 모은 뒤 한 번에 일정에 올림 (없는 플랫폼은 바로 올림)
+POST_BATCH_THRESHOLDS = {
+    "telegram": 3,
+    "tiktok": 5,
+    "youtube_shorts": 5
+}
+# 임계치를 못 채워도 가장 오래된 게시물이 이 시간(초)을 넘기면 쌓인 묶음을 배출
+POST_BATCH_MAX_AGE = 2 * 3600
+
+# 후속 이메일 시퀀스 (출시 후 일수, 제목, 본문 틀)
+_FOLLOW_UP_EMAILS = (
+    (1, "Did you see our new template? 🎁", "Quick reminder about {name}..."),
+    (3, "Last chance for launch discount! ⏰", "This special offer ends soon..."),
+    (7, "Missed it? Here's another chance 💫", "Get {name} at special price...")
+)
+
+# 템플릿에 태그가 없을 때 쓰는 기본 태그와 플랫폼별 고정 해시태그
+_DEFAULT_TAGS = ("template", "digital")
+_PLATFORM_HASHTAGS = {
+    "tiktok": ("#fyp", "#viral", "#trending", "#template"),
+    "youtube": ("#youtubeshorts", "#shorts", "#viralvideo"),
+    "instagram": ("#reels", "#instagramtips", "#digitaltemplate")
+}
+
+# 렌더링 함수는 입력이 같으면 결과도 같으므로 캐시 - 같은 템플릿을 여러 채널에 출시할 때 재사용
+@lru_cache(maxsize=2048)
+def _bullets(features: tuple, prefix: str) -> str:
+    """기능 목록을 글머리표 줄로 변환 - 한 번의 출시에서 여러 채널이 같은 목록을 공유"""
+    return "\n".join(f"{prefix} {f}" for f in features)
+
+
+# 가격을 받는 렌더러는 typed=True: 가격 49와 49.0이 같은 키로 취급되어 "$49.0"이 "$49"로 바뀌지 않도록 함
+@lru_cache(maxsize=2048, typed=True)
+def _render_tiktok_script(category: str, features: tuple, price) -> str:
+    """TikTok 스크립트 렌더링"""
+    return f"""
+(0-3초): "Stop scrolling! 😱 This {category} will change your life!"
+
+(3-8초): "Look at these features:"
+{_bullets(features, '-')}
+
+(8-12초): "It costs only ${price} but saves you hours of work!"
+
+(12-15초): "Link in bio to get yours now! ⬆️"
+"""
+
+
+@lru_cache(maxsize=2048, typed=True)
+def _render_shorts_script(category: str) -> str:
+    """YouTube Shorts 스크립트 렌더링"""
+    return f"""
+"Here's a {category} that nobody knows about..."
+
+Show quick demo of key features
+
+"Save hours every week with this tool. Link in description!"
+"""
+
+
+@lru_cache(maxsize=2048, typed=True)
+def _render_youtube_description(category: str, features: tuple, price) -> str:
+    """YouTube 설명 렌더링"""
+    return f"""
+Check out this {category}! 
+
+⭐ Key Features:
+{_bullets(features, '•')}
+
+💰 Price: ${price}
+
+📥 Get it here: [Link]
+
+#template #digital #productivity #ai
+"""
+
+
+@lru_cache(maxsize=2048, typed=True)
+def _render_telegram_message(name: str, price, description: str, features: tuple) -> str:
+    """Telegram 메시지 렌더링"""
+    return f"""
+🚀 <b>새 템플릿 출시!</b>
+
+📌 <b>{name}</b>
+
+💰 가격: ${price}
+
+📝 설명:
+{description}
+
+✨ 주요 기능:
+{_bullets(features, '•')}
+
+🔗 구매 링크: [_LINK_]
+
+#템플릿 #디지털 #新产品
+"""
+
+
+@lru_cache(maxsize=2048, typed=True)
+def _render_email_body(category: str, name, price, description: str, features: tuple) -> str:
+    """이메일 본문 렌더링"""
+    return f"""
+Hi {{first_name}},
+
+Great news! We just launched an amazing new {category}: **{name}**
+
+💰 Special Launch Price: ${price}
+
+{description}
+
+✨ What's Inside:
+{_bullets(features, '•')}
+
+👉 Get it now: [PURCHASE_LINK]
+
+Questions? Just reply to this email!
+
+Best,
+Your Template Team
+"""
+
 
 class SocialPlatform(Enum):
     """소셜 미디어 플랫폼"""
@@ -30,19 +172,63 @@ class CampaignType(Enum):
     AFFILIATE = "affiliate"
 
 
+class TelegramClient:
+    """Telegram Bot API 발신 전용 클라이언트 - 전용 연결 풀 사용"""
+    
+    API_URL = "https://api.telegram.org/bot{token}/{method}"
+    RETRY_DELAYS = (0.5, 1.0, 2.0)
+    # Bot API 전체 발송 한도 (초당 30건)
+    RATE_LIMIT = (30, 1.0)
+    
+    def __init__(self, token: str):
+        self.token = token
+        self.timeout = float(os.getenv("TELEGRAM_TIMEOUT", "10"))
+        pool_size = int(os.getenv("TELEGRAM_POOL_SIZE", "32"))
+        # 연결 타임아웃 재시도는 _call_with_retry가 담당하므로 세션 자체 재시도는 끔
+        self._session = create_session(pool_connections=1, pool_maxsize=pool_size, retries=0)
+        self._limiter = RateLimiter(*self.RATE_LIMIT)
+    
+    def send_message(self, chat_id: str, text: str) -> Dict:
+        """sendMessage 호출"""
+        url = self.API_URL.format(token=self.token, method="sendMessage")
+        payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
+        response = self._call_with_retry(
+            lambda: post_json(self._session, url, payload, timeout=self.timeout)
+        )
+        return response.json()
+    
+    def _call_with_retry(self, call):
+        """연결 타임아웃 시 지수 백오프(0.5 -> 1 -> 2초)로 재시도
+        (읽기 타임아웃은 메시지가 이미 게시됐을 수 있으므로 중복 공지를 막기 위해 재시도하지 않음)"""
+        for delay in self.RETRY_DELAYS:
+            try:
+                with self._limiter:
+                    return call()
+            except requests.ConnectTimeout:
+                logger.warning("Telegram connection timed out, retrying in %ss", delay)
+                time.sleep(delay)
+        with self._limiter:
+            return call()
+
+
 class SocialMediaManager:
     """소셜 미디어 관리자"""
     
     def __init__(self):
         self.telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
-        self.telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
+        # 공지를 보낼 채팅/채널 ID (쉼표로 여러 개) - 없으면 Telegram 공지는 건너뜀
+        self.telegram_chat_ids = tuple(
+            chat_id.strip() for chat_id in os.getenv("TELEGRAM_CHAT_ID", "").split(",") if chat_id.strip()
+        )
         self.discord_webhook = os.getenv("DISCORD_WEBHOOK_URL")
+        self.telegram = TelegramClient(self.telegram_token) if self.telegram_token else None
         
-        # 각 플랫폼별 게시물 캐시
-        self.scheduled_posts = []
+        # 각 플랫폼별 게시물 캐시 (최근 1000개만 유지)
+        self.scheduled_posts = deque(maxlen=MAX_SCHEDULED_POSTS)
     
-    def create_tiktok_content(self, template_data: Dict) -> Dict:
-        """TikTok 콘텐츠 생성"""
+    def create_tiktok_content(self, template_data: Dict, now: Optional[datetime] = None) -> Dict:
+        """TikTok 콘텐츠 생성 (now: 예약 시각 기준, 기본은 현재 시각)"""
+        now = now or datetime.now()
         # 실제로는 TikTok API 활용 (현재 제한적)
         # 시뮬레이션
         
@@ -51,10 +237,10 @@ class SocialMediaManager:
             "script": self._generate_tiktok_script(template_data),
             "hashtags": self._generate_hashtags(template_data, "tiktok"),
             "description": f"Check out this amazing {template_data.get('category', 'template')}! 🔥",
-            "scheduled_time": (datetime.now() + timedelta(hours=2)).isoformat()
+            "scheduled_time": (now + timedelta(hours=2)).isoformat()
         }
         
-        logger.info(f"TikTok content created: {content['script'][:50]}...")
+        logger.info("TikTok content created: %.50s...", content['script'])
         
         return {
             "success": True,
@@ -62,15 +248,16 @@ class SocialMediaManager:
             "platform_action": "Review and post manually for best results"
         }
     
-    def create_youtube_shorts(self, template_data: Dict) -> Dict:
-        """YouTube Shorts 콘텐츠 생성"""
+    def create_youtube_shorts(self, template_data: Dict, now: Optional[datetime] = None) -> Dict:
+        """YouTube Shorts 콘텐츠 생성 (now: 예약 시각 기준, 기본은 현재 시각)"""
+        now = now or datetime.now()
         content = {
             "platform": "youtube_shorts",
             "script": self._generate_shorts_script(template_data),
             "title": f"{template_data.get('name', 'Template')} - Quick Demo",
             "description": self._generate_youtube_description(template_data),
             "hashtags": self._generate_hashtags(template_data, "youtube"),
-            "scheduled_time": (datetime.now() + timedelta(hours=4)).isoformat()
+            "scheduled_time": (now + timedelta(hours=4)).isoformat()
         }
         
         return {
@@ -81,23 +268,35 @@ class SocialMediaManager:
     def post_telegram_announcement(self, template_data: Dict, channels: List[str] = None) -> Dict:
         """Telegram 공지 게시"""
         if not self.telegram_token:
-            return {"success": False, "error": "Telegram token not configured"}
+            return {"success": False, "status": "skipped", "error": "Telegram token not configured"}
+        
+        targets = list(channels or self.telegram_chat_ids)
+        if not targets:
+            return {"success": False, "status": "skipped", "error": "Telegram chat id not configured"}
         
         message = self._format_telegram_message(template_data)
         
-        # 실제로는 Telegram Bot API 호출
-        # https://api.telegram.org/bot{TOKEN}/sendMessage
+        delivered = {}
+        for chat_id in targets:
+            try:
+                delivered[chat_id] = bool(self.telegram.send_message(chat_id, message).get("ok"))
+            except Exception as e:
+                logger.error("Failed to send Telegram message to %s: %s", chat_id, e)
+                delivered[chat_id] = False
         
-        logger.info(f"Telegram announcement prepared for {len(channels or [])} channels")
+        sent = sum(delivered.values())
+        logger.info("Telegram announcement sent to %d/%d channels", sent, len(targets))
         
         return {
-            "success": True,
+            "success": sent > 0,
+            "status": "sent" if sent == len(targets) else "partial" if sent else "failed",
             "message": message,
-            "channels": channels or ["@your_channel"],
-            "action": "Configure Telegram bot for automatic posting"
+            "channels": targets,
+            "delivered": delivered
         }
     
-    def send_discord_notification(self, template_data: Dict, webhook_url: str = None) -> Dict:
+    def send_discord_notification(self, template_data: Dict, webhook_url: str = None,
+                                  now: Optional[datetime] = None) -> Dict:
         """Discord 알림 전송"""
         webhook = webhook_url or self.discord_webhook
         
@@ -114,84 +313,49 @@ class SocialMediaManager:
                 {"name": "🔗 Links", "value": "[Gumroad](link) | [Etsy](link) | [Website](link)"}
             ],
             "footer": {"text": "Template Automation System"},
-            "timestamp": datetime.now().isoformat()
+            "timestamp": (now or datetime.now()).isoformat()
         }
         
+        get_discord_batcher(webhook).enqueue(embed)
+        
         return {
             "success": True,
-            "embed": embed,
-            "action": "Discord webhook will auto-send on next cycle"
+            "status": "queued",
+            "embed": embed
         }
     
     def _generate_tiktok_script(self, template_data: Dict) -> str:
         """TikTok 스크립트 생성"""
-        return f"""
-(0-3초): "Stop scrolling! 😱 This {template_data.get('category', 'template')} will change your life!"
-
-(3-8초): "Look at these features:"
-{chr(10).join(f'- {f}' for f in template_data.get('features', ['Amazing features'])[:3])}
-
-(8-12초): "It costs only ${template_data.get('price', 0)} but saves you hours of work!"
-
-(12-15초): "Link in bio to get yours now! ⬆️"
-"""
+        return _render_tiktok_script(
+            template_data.get('category', 'template'),
+            tuple(template_data.get('features', ['Amazing features'])[:3]),
+            template_data.get('price', 0)
+        )
     
     def _generate_shorts_script(self, template_data: Dict) -> str:
         """YouTube Shorts 스크립트"""
-        return f"""
-"Here's a {template_data.get('category', 'template')} that nobody knows about..."
-
-Show quick demo of key features
-
-"Save hours every week with this tool. Link in description!"
-"""
+        return _render_shorts_script(template_data.get('category', 'template'))
     
     def _generate_youtube_description(self, template_data: Dict) -> str:
         """YouTube 설명 생성"""
-        return f"""
-Check out this {template_data.get('category', 'template')}! 
-
-⭐ Key Features:
-{chr(10).join(f'• {f}' for f in template_data.get('features', [])[:5])}
-
-💰 Price: ${template_data.get('price', 0)}
-
-📥 Get it here: [Link]
-
-#template #digital #productivity #ai
-"""
+        return _render_youtube_description(
+            template_data.get('category', 'template'),
+            tuple(template_data.get('features', [])[:5]),
+            template_data.get('price', 0)
+        )
     
-    def _generate_hashtags(self, template_data: Dict, platform: str) -> List[str]:
+    def _generate_hashtags(self, template_data: Dict, platform: str) -> Tuple[str, ...]:
         """플랫폼별 해시태그 생성"""
-        base_tags = template_data.get("tags", ["template", "digital"])
-        
-        platform_specific = {
-            "tiktok": ["#fyp", "#viral", "#trending", "#template"],
-            "youtube": ["#youtubeshorts", "#shorts", "#viralvideo"],
-            "instagram": ["#reels", "#instagramtips", "#digitaltemplate"]
-        }
-        
-        return base_tags + platform_specific.get(platform, [])
+        return tuple(template_data.get("tags", _DEFAULT_TAGS)) + _PLATFORM_HASHTAGS.get(platform, ())
     
     def _format_telegram_message(self, template_data: Dict) -> str:
-        """Telegram 메시지 형식화"""
-        return f"""
-🚀 *새 템플릿 출시!*
-
-📌 *{template_data.get('name', 'New Template')}*
-
-💰 가격: ${template_data.get('price', 0)}
-
-📝 설명:
-{template_data.get('description', 'Check it out!')}
-
-✨ 주요 기능:
-{chr(10).join(f'• {f}' for f in template_data.get('features', [])[:5])}
-
-🔗 구매 링크: [_LINK_]
-
-#템플릿 #디지털 #新产品
-"""
+        """Telegram 메시지 형식화 (parse_mode=HTML이므로 입력 값은 HTML 이스케이프)"""
+        return _render_telegram_message(
+            html.escape(str(template_data.get('name', 'New Template'))),
+            template_data.get('price', 0),
+            html.escape(str(template_data.get('description', 'Check it out!'))),
+            tuple(html.escape(str(f)) for f in template_data.get('features', [])[:5])
+        )
 
 
 class EmailMarketingManager:
@@ -202,73 +366,166 @@ class EmailMarketingManager:
         self.smtp_port = int(os.getenv("EMAIL_SMTP_PORT", 587))
         self.email = os.getenv("EMAIL_ADDRESS")
         self.password = os.getenv("EMAIL_PASSWORD")
+        self.sendgrid_api_key = os.getenv("SENDGRID_API_KEY")
+        
+        # 대량 발송은 백그라운드 스레드가 처리 (처음 작업이 들어올 때 시작)
+        self._jobs = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
     
-    def create_launch_email(self, template_data: Dict, subscriber_list: List[str]) -> Dict:
-        """신제품 출시 이메일 생성"""
+    def create_launch_email(self, template_data: Dict, subscriber_list: List[str],
+                            now: Optional[datetime] = None) -> Dict:
+        """신제품 출시 이메일 생성 (SendGrid가 설정돼 있으면 대량 발송 작업으로 예약)"""
+        scheduled_time = (now or datetime.now()) + timedelta(hours=1)
         email_content = {
             "subject": f"🚀 NEW: {template_data.get('name', 'Template')} is here!",
             "body": self._generate_email_body(template_data),
             "template": "product_launch",
             "recipients": subscriber_list,
-            "scheduled_time": (datetime.now() + timedelta(hours=1)).isoformat()
+            "scheduled_time": scheduled_time.isoformat()
         }
         
-        logger.info(f"Launch email prepared for {len(subscriber_list)} subscribers")
+        if not (self.sendgrid_api_key and self.email and subscriber_list):
+            logger.info("Launch email prepared for %d subscribers", len(subscriber_list))
+            return {
+                "success": True,
+                "email": email_content,
+                "action": "Connect email service (SendGrid/Mailchimp) for automatic sending"
+            }
+        
+        self._enqueue({**email_content, "send_at": int(scheduled_time.timestamp())})
+        logger.info("Launch email queued for %d subscribers", len(subscriber_list))
         
         return {
             "success": True,
-            "email": email_content,
-            "action": "Connect email service (SendGrid/Mailchimp) for automatic sending"
+            "status": "queued",
+            "email": email_content
         }
     
+    def flush(self):
+        """대기 중인 발송 작업이 모두 끝날 때까지 대기"""
+        if self._worker is not None:
+            self._jobs.join()
+    
+    def _enqueue(self, job: Dict):
+        """발송 작업 추가 - 워커 스레드가 없으면 시작"""
+        self._jobs.put(job)
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._email_worker, name="email-sender", daemon=True)
+                    self._worker.start()
+                    # 프로세스 종료 전에 남은 발송 작업 처리
+                    atexit.register(self.flush)
+    
+    def _email_worker(self):
+        """발송 작업 처리 루프"""
+        while True:
+            job = self._jobs.get()
+            try:
+                self._send_bulk(job)
+            except Exception as e:
+                logger.error("Failed to send launch email: %s", e)
+            finally:
+                self._jobs.task_done()
+    
+    def _send_bulk(self, job: Dict):
+        """수신자 1000명 단위로 SendGrid 요청 하나씩 전송"""
+        session = get_shared_session()
+        headers = {"Authorization": f"Bearer {self.sendgrid_api_key}"}
+        recipients = job["recipients"]
+        
+        for start in range(0, len(recipients), SENDGRID_BATCH_SIZE):
+            batch = recipients[start:start + SENDGRID_BATCH_SIZE]
+            response = post_json(session, SENDGRID_SEND_URL, headers=headers, timeout=(3, 30), payload={
+                "personalizations": [{"to": [{"email": email}]} for email in batch],
+                "from": {"email": self.email},
+                "subject": job["subject"],
+                "content": [{"type": "text/plain", "value": job["body"]}],
+                "send_at": job["send_at"]
+            })
+            if response.status_code >= 400:
+                logger.error("SendGrid returned %s: %.200s", response.status_code, response.text)
+            else:
+                logger.info("Launch email sent to %d subscribers", len(batch))
+    
     def create_follow_up_sequence(self, template_data: Dict) -> List[Dict]:
         """후속 이메일 시퀀스 생성"""
-        sequence = []
-        
-        # 이메일 1: 출시 후 1일
-        sequence.append({
-            "day": 1,
-            "subject": "Did you see our new template? 🎁",
-            "body": f"Quick reminder about {template_data.get('name')}..."
-        })
-        
-        # 이메일 2: 출시 후 3일
-        sequence.append({
-            "day": 3,
-            "subject": "Last chance for launch discount! ⏰",
-            "body": "This special offer ends soon..."
-        })
-        
-        # 이메일 3: 출시 후 7일
-        sequence.append({
-            "day": 7,
-            "subject": "Missed it? Here's another chance 💫",
-            "body": "Get {template_data.get('name')} at special price..."
-        })
-        
-        return sequence
+        name = template_data.get('name')
+        return [
+            {"day": day, "subject": subject, "body": body.format(name=name)}
+            for day, subject, body in _FOLLOW_UP_EMAILS
+        ]
     
     def _generate_email_body(self, template_data: Dict) -> str:
         """이메일 본문 생성"""
-        return f"""
-Hi {{first_name}},
-
-Great news! We just launched an amazing new {template_data.get('category', 'template')}: **{template_data.get('name')}**
-
-💰 Special Launch Price: ${template_data.get('price', 0)}
-
-{template_data.get('description', 'Check it out!')}
+        return _render_email_body(
+            template_data.get('category', 'template'),
+            template_data.get('name'),
+            template_data.get('price', 0),
+            template_data.get('description', 'Check it out!'),
+            tuple(template_data.get('features', [])[:5])
+        )
 
-✨ What's Inside:
-{chr(10).join(f'• {f}' for f in template_data.get('features', [])[:5])}
 
-👉 Get it now: [PURCHASE_LINK]
-
-Questions? Just reply to this email!
-
-Best,
-Your Template Team
-"""
+class PostReservoir:
+    """플랫폼별 예약 게시물 버퍼 - 임계치만큼 쌓이거나 max_age초가 지나면 한 묶음으로 배출 (SQLite 메모리 DB)"""
+    
+    def __init__(self, thresholds: Optional[Dict[str, int]] = None, max_age: float = POST_BATCH_MAX_AGE):
+        self.thresholds = thresholds if thresholds is not None else POST_BATCH_THRESHOLDS
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE posts (id INTEGER PRIMARY KEY, platform TEXT NOT NULL, payload TEXT NOT NULL, ts REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX idx_posts_platform ON posts (platform)")
+    
+    def push(self, platform: str, payload: Dict) -> List[Dict]:
+        """게시물 추가 - 임계치에 도달하면 쌓인 게시물 전체를 반환 (아니면 빈 목록)"""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO posts (platform, payload, ts) VALUES (?, ?, ?)",
+                (platform, json.dumps(payload, default=str), time.time())
+            )
+            return self._pop_locked(platform, self.thresholds.get(platform, 1))
+    
+    def pop(self, platform: str, force: bool = False) -> List[Dict]:
+        """임계치에 도달한 플랫폼의 게시물을 꺼냄 (force=True면 개수와 관계없이)"""
+        with self._lock, self._db:
+            return self._pop_locked(platform, 1 if force else self.thresholds.get(platform, 1))
+    
+    def release_expired(self) -> Dict[str, List[Dict]]:
+        """가장 오래된 게시물이 max_age를 넘긴 플랫폼의 묶음을 개수와 관계없이 배출"""
+        with self._lock, self._db:
+            platforms = [platform for (platform,) in self._db.execute(
+                "SELECT platform FROM posts GROUP BY platform HAVING MIN(ts) <= ?", (time.time() - self.max_age,)
+            )]
+            return {platform: self._pop_locked(platform, 1) for platform in platforms}
+    
+    def drain(self) -> Dict[str, List[Dict]]:
+        """대기 중인 모든 게시물을 플랫폼별로 배출"""
+        with self._lock, self._db:
+            platforms = [platform for (platform,) in self._db.execute("SELECT DISTINCT platform FROM posts")]
+            return {platform: self._pop_locked(platform, 1) for platform in platforms}
+    
+    def pending(self) -> Dict[str, int]:
+        """플랫폼별 대기 중인 게시물 수"""
+        with self._lock:
+            return dict(self._db.execute("SELECT platform, COUNT(*) FROM posts GROUP BY platform"))
+    
+    def _pop_locked(self, platform: str, threshold: int) -> List[Dict]:
+        count, oldest = self._db.execute(
+            "SELECT COUNT(*), MIN(ts) FROM posts WHERE platform = ?", (platform,)
+        ).fetchone()
+        if not count or (count < threshold and oldest > time.time() - self.max_age):
+            return []
+        
+        rows = self._db.execute(
+            "SELECT payload FROM posts WHERE platform = ? ORDER BY ts, id", (platform,)
+        ).fetchall()
+        self._db.execute("DELETE FROM posts WHERE platform = ?", (platform,))
+        return [json.loads(payload) for (payload,) in rows]
 
 
 class MarketingAutomationManager:
@@ -277,64 +534,83 @@ class MarketingAutomationManager:
     def __init__(self):
         self.social = SocialMediaManager()
         self.email = EmailMarketingManager()
+        # 준비된 TikTok/Shorts 콘텐츠는 플랫폼별로 모았다가 묶어서 일정에 올림
+        self.reservoir = PostReservoir()
         
         self.campaigns = []
     
     def execute_product_launch(self, template_data: Dict, subscribers: List[str]) -> Dict:
         """제품 출시 마케팅 실행"""
-        results = {
-            "template_id": template_data.get("id"),
-            "campaigns_executed": []
-        }
-        
+        # 모든 채널의 예약/타임스탬프를 같은 기준 시각으로 계산
+        now = datetime.now()
         # 1. Discord 알림
-        discord_result = self.social.send_discord_notification(template_data)
-        results["campaigns_executed"].append({
-            "type": "discord_notification",
-            "status": discord_result.get("status", "prepared")
-        })
+        discord_result = self.social.send_discord_notification(template_data, now=now)
         
-        # 2. Telegram 공지
-        telegram_result = self.social.post_telegram_announcement(
-            template_data, 
-            ["@your_channel", "@template_deals"]
-        )
-        results["campaigns_executed"].append({
-            "type": "telegram_announcement",
-            "status": telegram_result.get("status", "prepared")
-        })
+        # 2. Telegram 공지 (TELEGRAM_CHAT_ID가 설정된 경우만)
+        telegram_result = self.social.post_telegram_announcement(template_data)
         
         # 3. TikTok 콘텐츠 준비
-        tiktok_result = self.social.create_tiktok_content(template_data)
-        results["campaigns_executed"].append({
-            "type": "tiktok_content",
-            "status": tiktok_result.get("status", "prepared")
-        })
+        tiktok_result = self.social.create_tiktok_content(template_data, now)
         
         # 4. YouTube Shorts 준비
-        youtube_result = self.social.create_youtube_shorts(template_data)
-        results["campaigns_executed"].append({
-            "type": "youtube_shorts",
-            "status": youtube_result.get("status", "prepared")
-        })
+        youtube_result = self.social.create_youtube_shorts(template_data, now)
         
         # 5. 이메일 시퀀스
         email_sequence = self.email.create_follow_up_sequence(template_data)
-        results["campaigns_executed"].append({
-            "type": "email_sequence",
-            "emails_planned": len(email_sequence),
-            "status": "prepared"
-        })
         
-        logger.info(f"Marketing campaign executed for template: {template_data.get('name')}")
+        results = {
+            "template_id": template_data.get("id"),
+            "campaigns_executed": [
+                {"type": "discord_notification", "status": discord_result.get("status", "prepared")},
+                {"type": "telegram_announcement", "status": telegram_result.get("status", "prepared")},
+                {"type": "tiktok_content", "status": self._buffer_post(tiktok_result["content"], now)},
+                {"type": "youtube_shorts", "status": self._buffer_post(youtube_result["content"], now)},
+                {"type": "email_sequence", "emails_planned": len(email_sequence), "status": "prepared"}
+            ]
+        }
+        
+        logger.info("Marketing campaign executed for template: %s", template_data.get('name'))
         
         return results
     
+    def _buffer_post(self, content: Dict, now: datetime) -> str:
+        """준비된 게시물을 버퍼에 넣고, 임계치에 도달한 묶음은 예약 게시물 목록에 추가"""
+        released = self.reservoir.push(content["platform"], {**content, "buffered_at": now.isoformat()})
+        if not released:
+            return "buffered"
+        self._schedule(content["platform"], released, now)
+        return "scheduled"
+    
+    def _schedule(self, platform: str, posts: List[Dict], now: Optional[datetime] = None):
+        """버퍼에서 나온 게시물을 예약 목록에 추가 - 버퍼에서 기다린 만큼 예약 시각을 다시 계산"""
+        now = now or datetime.now()
+        for post in posts:
+            buffered_at = post.pop("buffered_at", None)
+            if buffered_at:
+                delay = datetime.fromisoformat(post["scheduled_time"]) - datetime.fromisoformat(buffered_at)
+                post["scheduled_time"] = (now + delay).isoformat()
+        self.social.scheduled_posts.extend(posts)
+        logger.info("Scheduled %d %s posts", len(posts), platform)
+    
+    def release_expired_posts(self):
+        """max_age를 넘긴 버퍼 묶음을 예약 목록으로"""
+        for platform, posts in self.reservoir.release_expired().items():
+            self._schedule(platform, posts)
+    
+    def flush_posts(self):
+        """버퍼에 남은 게시물을 임계치와 관계없이 모두 예약 목록으로"""
+        for platform, posts in self.reservoir.drain().items():
+            self._schedule(platform, posts)
+    
     def get_marketing_calendar(self, days: int = 30) -> Dict:
         """마케팅 캘린더 조회"""
+        self.release_expired_posts()
         calendar = {
             "today": datetime.now().isoformat(),
-            "scheduled_posts": self.scheduled_posts[:10],  # 최대 10개
+            # 가장 먼저 게시될 10개
+            "scheduled_posts": heapq.nsmallest(10, self.social.scheduled_posts, key=itemgetter("scheduled_time")),
+            # 묶음이 차기를 기다리는 플랫폼별 게시물 수
+            "buffered_posts": self.reservoir.pending(),
             "campaigns": self.campaigns,
             "recommendations": [
                 {"day": "Monday", "best_time": "9:00 AM", "platform": "TikTok"},
@@ -1,15 +1,66 @@
 """Monitoring Module - System Health and Performance Tracking"""
 import os
 import json
-from typing import Dict, List, Optional
+from collections import Counter, defaultdict, deque
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
-import requests
+
+from core.discord import get_discord_batcher
+from core.http import create_session, post_json
+from core.ratelimit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# 보관할 메트릭 수 - 5분 간격 수집 기준 7일치 (7 x 24 x 12)
+METRICS_HISTORY_SIZE = 7 * 24 * 12
+
+# 웹훅 요청 타임아웃 (연결, 읽기)
+WEBHOOK_TIMEOUT = (3, 10)
+
+# 리포트 틀 - 값 자리만 비워 두고 모듈 로드 시 한 번만 만듦
+DAILY_REPORT_TEMPLATE = """
+=== 📊 Template Automation Daily Report ===
+Generated: {generated}
+
+📈 Publishing Stats:
+- Templates Published Today: {templates_published_today}
+- Total Templates: {total_templates}
+
+💰 Revenue:
+- Daily Revenue: ${daily_revenue:.2f}
+- Weekly Revenue: ${weekly_revenue:.2f}
+
+🔧 System Health:
+{platform_rows}{errors_block}
+📊 Processing Rate: {processing_rate:.1%}
+📋 Queue Size: {queue_size}
+"""
+
+WEEKLY_REPORT_TEMPLATE = """
+=== 📊 Template Automation Weekly Report ===
+Period: Last 7 days
+Generated: {generated}
+
+📈 Publishing Summary:
+- Total Templates Published: {total_published}
+- Average Daily Publications: {avg_published:.1f}
+
+💰 Revenue Summary:
+- Total Weekly Revenue: ${weekly_revenue:.2f}
+- Average Daily Revenue: ${avg_revenue:.2f}
+
+🔧 System Performance:
+- Average Processing Rate: {avg_processing_rate:.1%}
+- Total Errors: {total_errors}
+- Uptime: {uptime:.1%}
+
+📋 Platform Breakdown:
+{platform_rows}"""
+
 
 class AlertLevel(Enum):
     INFO = "info"
@@ -18,6 +69,27 @@ class AlertLevel(Enum):
     CRITICAL = "critical"
 
 
+# 알림 레벨 값별 색상 코드 (AlertLevel과 문자열 레벨 모두 값으로 조회)
+_LEVEL_COLORS = {
+    AlertLevel.INFO.value: 0x00FF00,
+    AlertLevel.WARNING.value: 0xFFFF00,
+    AlertLevel.ERROR.value: 0xFF6600,
+    AlertLevel.CRITICAL.value: 0xFF0000
+}
+
+
+# 알림/성능 분석 기준값 (MonitoringSystem과 PerformanceOptimizer가 공유, 읽기 전용)
+ALERT_THRESHOLDS: Mapping[str, float] = MappingProxyType({
+    "sales_drop": 0.50,
+    "error_rate": 5,
+    "queue_size": 100,
+    "processing_rate_min": 0.5
+})
+
+# 플랫폼 상태별 건강도 점수
+_HEALTH_WEIGHTS = {"healthy": 1.0, "warning": 0.5, "error": 0.0}
+
+
 @dataclass
 class SystemMetrics:
     """시스템 메트릭"""
@@ -36,19 +108,23 @@ class MonitoringSystem:
     """모니터링 시스템"""
     
     def __init__(self):
-        self.metrics_history = []
-        self.alert_thresholds = {
-            "sales_drop": 0.50,
-            "error_rate": 5,
-            "queue_size": 100,
-            "processing_rate_min": 0.5
-        }
+        self.metrics_history = deque(maxlen=METRICS_HISTORY_SIZE)
         self.discord_webhook = os.getenv("DISCORD_WEBHOOK_URL")
         self.slack_webhook = os.getenv("SLACK_WEBHOOK_URL")
+        # 알림마다 TCP/TLS 연결을 새로 맺지 않도록 Slack 전송에 keep-alive 세션 재사용 (Discord는 배치 전송기 전용 세션)
+        # 웹훅 POST는 레이트 리밋(429)/일시적 5xx 응답에서도 재시도
+        self._session = create_session(
+            pool_connections=20, pool_maxsize=100,
+            retries=3, backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            retry_methods=("POST",)
+        )
+        # Slack 수신 웹훅 한도 (초당 1건)
+        self._slack_limiter = RateLimiter(1, 1.0)
     
     def collect_metrics(self, platform_stats: Dict) -> SystemMetrics:
-        """메트릭 수집"""
-        return SystemMetrics(
+        """메트릭 수집 (최근 METRICS_HISTORY_SIZE개는 metrics_history에 보관)"""
+        metrics = SystemMetrics(
             timestamp=datetime.now(),
             templates_published_today=platform_stats.get("published_today", 0),
             total_templates=platform_stats.get("total_templates", 0),
@@ -59,6 +135,8 @@ class MonitoringSystem:
             queue_size=self._get_queue_size(),
             processing_rate=self._calculate_processing_rate()
         )
+        self.metrics_history.append(metrics)
+        return metrics
     
     def _get_active_errors(self) -> List[str]:
         """활성 에러 조회"""
@@ -83,7 +161,7 @@ class MonitoringSystem:
             pass
         
         # 에러 알림
-        if len(metrics.active_errors) > self.alert_thresholds["error_rate"]:
+        if len(metrics.active_errors) > ALERT_THRESHOLDS["error_rate"]:
             alerts.append({
                 "level": AlertLevel.WARNING,
                 "message": f"High error count: {len(metrics.active_errors)}",
@@ -92,7 +170,7 @@ class MonitoringSystem:
             })
         
         # 큐 크기 알림
-        if metrics.queue_size > self.alert_thresholds["queue_size"]:
+        if metrics.queue_size > ALERT_THRESHOLDS["queue_size"]:
             alerts.append({
                 "level": AlertLevel.WARNING,
                 "message": f"Queue backup: {metrics.queue_size} items",
@@ -104,33 +182,31 @@ class MonitoringSystem:
     
     def send_alert(self, alert: Dict):
         """알림 전송"""
-        message = f"[{alert['level'].upper()}] {alert['message']}"
+        level = alert["level"]
+        level_name = level.value if isinstance(level, AlertLevel) else str(level)
+        color = _LEVEL_COLORS.get(level_name, 0x808080)
+        message = f"[{level_name.upper()}] {alert['message']}"
         
-        # Discord 알림
+        # Discord 알림 - 짧은 시간에 몰린 알림은 embed 묶음 하나로 전송
         if self.discord_webhook:
-            try:
-                requests.post(self.discord_webhook, json={
-                    "content": message,
-                    "embeds": [{
-                        "title": "Template Automation Alert",
-                        "description": alert["message"],
-                        "color": self._get_color_for_level(alert["level"]),
-                        "fields": [
-                            {"name": "Metric", "value": alert.get("metric", "N/A")},
-                            {"name": "Value", "value": str(alert.get("value", "N/A"))}
-                        ]
-                    }]
-                })
-            except Exception as e:
-                logger.error(f"Failed to send Discord alert: {e}")
+            get_discord_batcher(self.discord_webhook).enqueue({
+                "title": "Template Automation Alert",
+                "description": message,
+                "color": color,
+                "fields": [
+                    {"name": "Metric", "value": alert.get("metric", "N/A")},
+                    {"name": "Value", "value": str(alert.get("value", "N/A"))}
+                ]
+            })
         
         # Slack 알림
         if self.slack_webhook:
             try:
-                requests.post(self.slack_webhook, json={
+                self._slack_limiter.acquire()
+                post_json(self._session, self.slack_webhook, timeout=WEBHOOK_TIMEOUT, payload={
                     "text": message,
                     "attachments": [{
-                        "color": self._get_color_for_level(alert["level"]),
+                        "color": color,
                         "fields": [
                             {"title": "Alert", "value": alert["message"]},
                             {"title": "Metric", "value": alert.get("metric", "N/A")},
@@ -139,96 +215,81 @@ class MonitoringSystem:
                     }]
                 })
             except Exception as e:
-                logger.error(f"Failed to send Slack alert: {e}")
+                logger.error("Failed to send Slack alert: %s", e)
     
     def _get_color_for_level(self, level: AlertLevel) -> int:
         """레벨별 색상 코드"""
-        colors = {
-            AlertLevel.INFO: 0x00FF00,
-            AlertLevel.WARNING: 0xFFFF00,
-            AlertLevel.ERROR: 0xFF6600,
-            AlertLevel.CRITICAL: 0xFF0000
-        }
-        return colors.get(level, 0x808080)
+        return _LEVEL_COLORS.get(level.value if isinstance(level, AlertLevel) else level, 0x808080)
     
     def generate_daily_report(self, metrics: SystemMetrics) -> str:
         """일간 리포트 생성"""
-        report = f"""
-=== 📊 Template Automation Daily Report ===
-Generated: {metrics.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-
-📈 Publishing Stats:
-- Templates Published Today: {metrics.templates_published_today}
-- Total Templates: {metrics.total_templates}
-
-💰 Revenue:
-- Daily Revenue: ${metrics.daily_revenue:.2f}
-- Weekly Revenue: ${metrics.weekly_revenue:.2f}
-
-🔧 System Health:
-"""
-        
-        for platform, health in metrics.platform_health.items():
-            status_emoji = "✅" if health == "healthy" else "⚠️" if health == "warning" else "❌"
-            report += f"- {status_emoji} {platform}: {health}\n"
+        platform_rows = "".join(
+            f"- {'✅' if health == 'healthy' else '⚠️' if health == 'warning' else '❌'} {platform}: {health}\n"
+            for platform, health in metrics.platform_health.items()
+        )
         
         if metrics.active_errors:
-            report += f"\n⚠️ Active Errors ({len(metrics.active_errors)}):\n"
-            for error in metrics.active_errors[:5]:  # 최대 5개만
-                report += f"- {error}\n"
+            errors_block = f"\n⚠️ Active Errors ({len(metrics.active_errors)}):\n" + "".join(
+                f"- {error}\n" for error in metrics.active_errors[:5]  # 최대 5개만
+            )
         else:
-            report += "\n✅ No active errors\n"
+            errors_block = "\n✅ No active errors\n"
         
-        report += f"\n📊 Processing Rate: {metrics.processing_rate:.1%}\n"
-        report += f"📋 Queue Size: {metrics.queue_size}\n"
-        
-        return report
+        return DAILY_REPORT_TEMPLATE.format_map({
+            "generated": metrics.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            "templates_published_today": metrics.templates_published_today,
+            "total_templates": metrics.total_templates,
+            "daily_revenue": metrics.daily_revenue,
+            "weekly_revenue": metrics.weekly_revenue,
+            "platform_rows": platform_rows,
+            "errors_block": errors_block,
+            "processing_rate": metrics.processing_rate,
+            "queue_size": metrics.queue_size
+        })
     
     def generate_weekly_report(self, metrics_history: List[SystemMetrics]) -> str:
         """주간 리포트 생성"""
         if not metrics_history:
             return "No data available for weekly report"
         
-        total_published = sum(m.templates_published_today for m in metrics_history)
-        avg_revenue = sum(m.daily_revenue for m in metrics_history) / len(metrics_history)
-        total_errors = sum(len(m.active_errors) for m in metrics_history)
-        
-        report = f"""
-=== 📊 Template Automation Weekly Report ===
-Period: Last 7 days
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-📈 Publishing Summary:
-- Total Templates Published: {total_published}
-- Average Daily Publications: {total_published / 7:.1f}
-
-💰 Revenue Summary:
-- Total Weekly Revenue: ${sum(m.weekly_revenue for m in metrics_history):.2f}
-- Average Daily Revenue: ${avg_revenue:.2f}
-
-🔧 System Performance:
-- Average Processing Rate: {sum(m.processing_rate for m in metrics_history) / len(metrics_history):.1%}
-- Total Errors: {total_errors}
-- Uptime: {len([m for m in metrics_history if m.processing_rate > 0.9]) / len(metrics_history):.1%}
-
-📋 Platform Breakdown:
-"""
-        
-        # 플랫폼별 통계
-        platform_stats = {}
+        # 모든 집계를 메트릭 목록 한 번 순회로 계산
+        total_published = 0
+        revenue_sum = 0.0
+        weekly_revenue_sum = 0.0
+        total_errors = 0
+        processing_sum = 0.0
+        uptime_count = 0
+        platform_stats = defaultdict(Counter)
         for m in metrics_history:
+            total_published += m.templates_published_today
+            revenue_sum += m.daily_revenue
+            weekly_revenue_sum += m.weekly_revenue
+            total_errors += len(m.active_errors)
+            processing_sum += m.processing_rate
+            uptime_count += m.processing_rate > 0.9
             for platform, health in m.platform_health.items():
-                if platform not in platform_stats:
-                    platform_stats[platform] = {"healthy": 0, "warning": 0, "error": 0}
                 platform_stats[platform][health] += 1
         
+        # 플랫폼별 통계
+        platform_rows = []
         for platform, stats in platform_stats.items():
             total_days = sum(stats.values())
             health_ratio = stats["healthy"] / total_days
             status = "✅" if health_ratio > 0.9 else "⚠️" if health_ratio > 0.7 else "❌"
-            report += f"- {status} {platform}: {stats['healthy']}/{total_days} days healthy\n"
+            platform_rows.append(f"- {status} {platform}: {stats['healthy']}/{total_days} days healthy\n")
         
-        return report
+        count = len(metrics_history)
+        return WEEKLY_REPORT_TEMPLATE.format_map({
+            "generated": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "total_published": total_published,
+            "avg_published": total_published / 7,
+            "weekly_revenue": weekly_revenue_sum,
+            "avg_revenue": revenue_sum / count,
+            "avg_processing_rate": processing_sum / count,
+            "total_errors": total_errors,
+            "uptime": uptime_count / count,
+            "platform_rows": "".join(platform_rows)
+        })
 
 
 class PerformanceOptimizer:
@@ -242,7 +303,7 @@ class PerformanceOptimizer:
         recommendations = []
         
         # 처리율 분석
-        if metrics.processing_rate < self.alert_thresholds["processing_rate_min"]:
+        if metrics.processing_rate < ALERT_THRESHOLDS["processing_rate_min"]:
             recommendations.append({
                 "area": "processing",
                 "suggestion": "Consider scaling up workers or reducing batch size",
@@ -262,7 +323,7 @@ class PerformanceOptimizer:
             })
         
         # 큐 분석
-        if metrics.queue_size > self.alert_thresholds["queue_size"] * 0.7:
+        if metrics.queue_size > ALERT_THRESHOLDS["queue_size"] * 0.7:
             recommendations.append({
                 "area": "queue",
                 "suggestion": "Queue is building up. Consider increasing processing capacity.",
@@ -276,26 +337,18 @@ class PerformanceOptimizer:
         }
     
     def _calculate_health_score(self, metrics: SystemMetrics) -> float:
-        """건강도 점수 계산"""
-        score = 1.0
-        
-        # 처리율 가중치 (40%)
-        score *= metrics.processing_rate * 0.4
-        
-        # 플랫폼 건강도 가중치 (40%)
-        platform_health = [
-            1.0 if h == "healthy" else 0.5 if h == "warning" else 0.0
-            for h in metrics.platform_health.values()
-        ]
-        if platform_health:
-            score *= (sum(platform_health) / len(platform_health)) * 0.4
+        """건강도 점수 계산 - 처리율 40% + 플랫폼 건강도 40% + 에러 20% 가중합"""
+        # 플랫폼 건강도 (플랫폼 정보가 없으면 만점으로 간주)
+        platform_values = metrics.platform_health.values()
+        if platform_values:
+            platform_score = sum(_HEALTH_WEIGHTS.get(h, 0.0) for h in platform_values) / len(platform_values)
         else:
-            score *= 0.4  # 기본 점수
+            platform_score = 1.0
         
-        # 에러 가중치 (20%)
-        error_penalty = min(0.2, len(metrics.active_errors) * 0.02)
-        score *= (1.0 - error_penalty)
+        # 에러 10개 이상이면 에러 점수 0
+        error_score = 1.0 - min(1.0, len(metrics.active_errors) * 0.1)
         
+        score = 0.4 * metrics.processing_rate + 0.4 * platform_score + 0.2 * error_score
         return max(0.0, min(1.0, score))
 
 
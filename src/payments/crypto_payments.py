@@ -1,15 +1,99 @@
 """Payment Module - Crypto Payment Automation"""
 import os
 import json
-import requests
-from typing import Dict, List, Optional
+import secrets
+import time
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
 import logging
 
+from core.http import create_session, loads_json, post_json
+
 logger = logging.getLogger(__name__)
 
+# 시세/익스플로러 API 호출 타임아웃 (연결, 읽기)
+API_TIMEOUT = (3, 10)
+
+# 환율 캐시 유지 시간(초) - 실패(0) 결과는 장애 시 재요청 폭주를 막을 정도로만 짧게 보관
+CRYPTO_PRICE_TTL = float(os.getenv("CRYPTO_PRICE_TTL", "60"))
+NEGATIVE_PRICE_TTL = 5.0
+
+
+# 심볼별 최소 단위 자릿수 (wei 18, lamports 9, satoshi 8, 스테이블코인 6)
+TOKEN_DECIMALS = {"ETH": 18, "USDC": 6, "USDT": 6, "SOL": 9, "BTC": 8, "BNB": 18, "MATIC": 18}
+
+# 안내하는 송금 금액은 소수 6자리까지
+AMOUNT_QUANTUM = Decimal("0.000001")
+
+# 같은 주문의 재시도에 기존 PaymentIntent를 돌려주는 시간(초)
+INTENT_CACHE_TTL = 5 * 60
+
+# 여러 건을 동시에 조회할 때 스레드 수 (세션 풀 크기 64 이내)
+MAX_LOOKUP_WORKERS = 8
+
+# JSON-RPC 배치 한 번에 담을 receipt 조회 수 (공급자 한도를 넘지 않도록 작게 유지)
+RPC_BATCH_SIZE = 20
+
+# 트랜잭션 확정 대기 - 1초 간격으로 확인하다가 연속 미확정이 쌓이면 간격을 두 배씩 늘림
+TX_POLL_INTERVAL = 1.0
+TX_POLL_MAX_INTERVAL = 30.0
+TX_POLL_BACKOFF_AFTER = 10
+TX_WATCH_TIMEOUT = 30 * 60
+
+_stripe_client_configured = False
+
+# (crypto, currency) -> (price, fetched_at_monotonic)
+_exchange_rate_cache: Dict[tuple, tuple] = {}
+
+
+@lru_cache(maxsize=1)
+def get_api_session():
+    """결제 모듈 공용 HTTP 세션 - 첫 호출 때 생성하고 이후 TCP/TLS 연결 재사용"""
+    return create_session(pool_connections=16, pool_maxsize=64, retries=3,
+                          backoff_factor=0.2, status_forcelist=(429, 502, 503, 504))
+
+
+def new_order_id() -> str:
+    """시간 순으로 정렬되는 주문 ID (나노초 시각 + 난수 - 동시 호출에도 충돌하지 않음)"""
+    return f"ord_{time.time_ns():x}_{secrets.token_hex(3)}"
+
+
+def _iso(ns: int) -> str:
+    """time.time_ns() 값을 로컬 시간 ISO 문자열로 변환"""
+    return datetime.fromtimestamp(ns / 1e9).isoformat()
+
+
+def quote_crypto_amount(amount_usd: float, exchange_rate: float, symbol: str) -> Tuple[int, str]:
+    """USD 금액을 (최소 단위 정수, 표시용 금액 문자열)로 환산 - 부동소수 없이 Decimal로 한 번만 계산"""
+    amount = (Decimal(str(amount_usd)) / Decimal(str(exchange_rate))).quantize(AMOUNT_QUANTUM)
+    base_units = int(amount.scaleb(TOKEN_DECIMALS.get(symbol, 18)))
+    return base_units, format(amount.normalize(), "f")
+
+
+def is_price_fresh(price: float, fetched_at: float) -> bool:
+    """캐시된 환율이 아직 유효한지 (0은 NEGATIVE_PRICE_TTL 동안만 유효)"""
+    ttl = CRYPTO_PRICE_TTL if price else NEGATIVE_PRICE_TTL
+    return time.monotonic() - fetched_at < ttl
+
+
+def _configure_stripe_http_client():
+    """Stripe SDK가 요청마다 세션을 만들지 않도록 공용 RequestsClient를 한 번만 지정"""
+    global _stripe_client_configured
+    if _stripe_client_configured:
+        return
+    try:
+        import stripe
+        stripe.default_http_client = stripe.http_client.RequestsClient()
+    except (ImportError, AttributeError) as e:
+        logger.debug("Stripe HTTP client not configured: %s", e)
+    _stripe_client_configured = True
+
 
 class CryptoPaymentSystem:
     """암호화페 결제 시스템 - Stripe Crypto + WalletConnect"""
@@ -18,57 +102,87 @@ class CryptoPaymentSystem:
         self.stripe_secret_key = os.getenv("STRIPE_SECRET_KEY")
         self.wallet_address = os.getenv("WALLET_ADDRESS")
         self.crypto_apis_key = os.getenv("CRYPTO_APIS_KEY")
+        self._intent_cache: Dict[str, tuple] = {}  # order_id -> (result, created_at_monotonic)
+        if self.stripe_secret_key:
+            _configure_stripe_http_client()
         
     def create_crypto_payment_intent(self, amount_usd: float, metadata: Dict = None) -> Dict:
         """Stripe Crypto 결제 생성"""
         if not self.stripe_secret_key:
             return {"success": False, "error": "Stripe key not configured"}
         
+        order_id = (metadata or {}).get("order_id")
+        if order_id:
+            cached = self._intent_cache.get(order_id)
+            if cached and time.monotonic() - cached[1] < INTENT_CACHE_TTL:
+                return cached[0]
+        
         try:
             import stripe
             stripe.api_key = self.stripe_secret_key
             
+            # 주문 단위 멱등 키 - 재시도해도 Stripe 쪽에서 중복 intent가 생기지 않음
+            idempotency = {"idempotency_key": f"order-{order_id}"} if order_id else {}
             intent = stripe.PaymentIntent.create(
                 amount=int(amount_usd * 100),  # cents
                 currency="usd",
                 payment_method_types=["crypto"],
-                metadata=metadata or {}
+                metadata=metadata or {},
+                **idempotency
             )
             
-            return {
+            result = {
                 "success": True,
                 "client_secret": intent.client_secret,
                 "payment_intent_id": intent.id,
                 "crypto_url": f"https://crypto.stripe.com/pay/{intent.id}"
             }
+            if order_id:
+                self._intent_cache[order_id] = (result, time.monotonic())
+            return result
             
         except Exception as e:
-            logger.error(f"Stripe crypto payment error: {e}")
+            logger.error("Stripe crypto payment error: %s", e)
             return {"success": False, "error": str(e)}
     
     def get_crypto_exchange_rate(self, crypto: str = "ETH", currency: str = "USD") -> float:
-        """암호화페 환율 조회"""
+        """암호화페 환율 조회 (CRYPTO_PRICE_TTL 동안 캐시)"""
+        key = (crypto, currency)
+        cached = _exchange_rate_cache.get(key)
+        if cached and is_price_fresh(*cached):
+            return cached[0]
+        
+        price = self._fetch_exchange_rate(crypto, currency)
+        _exchange_rate_cache[key] = (price, time.monotonic())
+        return price
+    
+    def _fetch_exchange_rate(self, crypto: str, currency: str) -> float:
+        """cryptocompare에서 환율 조회 (실패 시 0)"""
         try:
-            response = requests.get(
+            response = get_api_session().get(
                 f"https://min-api.cryptocompare.com/data/price",
-                params={"fsym": crypto, "tsyms": currency}
+                params={"fsym": crypto, "tsyms": currency},
+                timeout=API_TIMEOUT
             )
-            data = response.json()
+            data = loads_json(response.content)
             return data.get(currency, 0)
             
         except Exception as e:
-            logger.error(f"Error getting exchange rate: {e}")
+            logger.error("Error getting exchange rate: %s", e)
             return 0
     
     def create_wallet_payment_request(self, amount_usd: float, order_id: str, crypto: str = "USDC") -> Dict:
         """지갑 결제 요청 생성"""
         exchange_rate = self.get_crypto_exchange_rate(crypto)
-        crypto_amount = Decimal(str(amount_usd)) / Decimal(str(exchange_rate))
+        if not exchange_rate:
+            return {"success": False, "error": f"Exchange rate unavailable for {crypto}"}
+        base_units, display_amount = quote_crypto_amount(amount_usd, exchange_rate, crypto)
         
         payment_data = {
             "order_id": order_id,
             "crypto": crypto,
-            "crypto_amount": round(float(crypto_amount), 6),
+            "crypto_amount": float(display_amount),
+            "crypto_amount_base_units": base_units,
             "usd_amount": amount_usd,
             "exchange_rate": exchange_rate,
             "wallet_address": self.wallet_address,
@@ -77,12 +191,13 @@ class CryptoPaymentSystem:
             "created_at": datetime.now().isoformat()
         }
         
-        logger.info(f"Wallet payment request created: {payment_data}")
+        logger.info("Wallet payment request created: order=%s crypto=%s amount=%s",
+                    order_id, crypto, display_amount)
         
         return {
             "success": True,
             "payment_data": payment_data,
-            "payment_url": f"crypto:{self.wallet_address}?amount={payment_data['crypto_amount']}"
+            "payment_url": f"crypto:{self.wallet_address}?amount={display_amount}"
         }
     
     def check_transaction_status(self, tx_hash: str, network: str = "ethereum") -> Dict:
@@ -90,17 +205,18 @@ class CryptoPaymentSystem:
         try:
             if network == "ethereum":
                 # Etherscan API 활용
-                response = requests.get(
+                response = get_api_session().get(
                     f"https://api.etherscan.io/api",
                     params={
                         "module": "proxy",
                         "action": "eth_getTransactionReceipt",
                         "txhash": tx_hash,
                         "apikey": os.getenv("ETHERSCAN_API_KEY", "")
-                    }
+                    },
+                    timeout=API_TIMEOUT
                 )
                 
-                if response.json().get("result"):
+                if loads_json(response.content).get("result"):
                     return {
                         "status": "confirmed",
                         "tx_hash": tx_hash,
@@ -116,11 +232,100 @@ class CryptoPaymentSystem:
             return {"status": "unknown", "tx_hash": tx_hash}
             
         except Exception as e:
-            logger.error(f"Error checking transaction: {e}")
+            logger.error("Error checking transaction: %s", e)
             return {"status": "error", "error": str(e)}
     
-    def process_webhook_payment(self, webhook_data: Dict) -> Dict:
-        """웹훅을 통한 결제 처리"""
+    def check_transaction_statuses(self, tx_hashes: List[str], network: str = "ethereum") -> List[Dict]:
+        """여러 트랜잭션 상태를 확인 (입력 순서대로 반환)
+        ETH_RPC_URL이 있으면 JSON-RPC 배치로 묶어 조회하고, 배치에서 답을 못 받은 건만 개별 조회"""
+        results: Dict[str, Dict] = {}
+        rpc_url = os.getenv("ETH_RPC_URL")
+        if network == "ethereum" and rpc_url and len(tx_hashes) > 1:
+            for start in range(0, len(tx_hashes), RPC_BATCH_SIZE):
+                results.update(self._check_receipts_batch(rpc_url, tx_hashes[start:start + RPC_BATCH_SIZE]))
+        
+        remaining = [tx_hash for tx_hash in dict.fromkeys(tx_hashes) if tx_hash not in results]
+        if len(remaining) == 1:
+            results[remaining[0]] = self.check_transaction_status(remaining[0], network)
+        elif remaining:
+            with ThreadPoolExecutor(max_workers=min(MAX_LOOKUP_WORKERS, len(remaining))) as executor:
+                statuses = executor.map(lambda tx_hash: self.check_transaction_status(tx_hash, network), remaining)
+                results.update(zip(remaining, statuses))
+        
+        return [results[tx_hash] for tx_hash in tx_hashes]
+    
+    def _check_receipts_batch(self, rpc_url: str, tx_hashes: List[str]) -> Dict[str, Dict]:
+        """eth_getTransactionReceipt 배치 요청 한 번 - 오류 응답이나 누락된 항목은 결과에서 제외"""
+        batch = [
+            {"jsonrpc": "2.0", "id": i, "method": "eth_getTransactionReceipt", "params": [tx_hash]}
+            for i, tx_hash in enumerate(tx_hashes)
+        ]
+        try:
+            response = post_json(get_api_session(), rpc_url, batch, timeout=API_TIMEOUT)
+            replies = loads_json(response.content) if response.status_code == 200 else None
+        except Exception as e:
+            logger.warning("JSON-RPC batch receipt check failed, falling back to single lookups: %s", e)
+            return {}
+        if not isinstance(replies, list):
+            logger.warning("JSON-RPC batch receipt check rejected (HTTP %s), falling back to single lookups",
+                           response.status_code)
+            return {}
+        
+        results = {}
+        for reply in replies:
+            index = reply.get("id")
+            if "error" in reply or not isinstance(index, int) or not 0 <= index < len(tx_hashes):
+                continue
+            tx_hash = tx_hashes[index]
+            receipt = reply.get("result")
+            results[tx_hash] = {
+                "status": "confirmed" if receipt and receipt.get("blockNumber") else "pending",
+                "tx_hash": tx_hash,
+                "network": "ethereum"
+            }
+        return results
+    
+    def watch_transaction(self, tx_hash: str, on_confirm: Callable[[Dict], None],
+                          network: str = "ethereum", timeout: float = TX_WATCH_TIMEOUT) -> threading.Thread:
+        """백그라운드에서 트랜잭션 확정을 기다렸다가 on_confirm(status) 호출 (호출 쪽 폴링 루프 대체)"""
+        watcher = threading.Thread(
+            target=self._watch_transaction,
+            args=(tx_hash, on_confirm, network, timeout),
+            name=f"tx-watch-{tx_hash[:10]}",
+            daemon=True
+        )
+        watcher.start()
+        return watcher
+    
+    def _watch_transaction(self, tx_hash: str, on_confirm: Callable[[Dict], None], network: str, timeout: float):
+        deadline = time.monotonic() + timeout
+        interval = TX_POLL_INTERVAL
+        misses = 0
+        
+        while time.monotonic() < deadline:
+            status = self.check_transaction_status(tx_hash, network)
+            if status["status"] == "confirmed":
+                try:
+                    on_confirm(status)
+                except Exception as e:
+                    logger.error("Transaction confirm callback failed for %s: %s", tx_hash, e)
+                return
+            if status["status"] == "unknown":
+                logger.warning("Cannot watch transaction %s on unsupported network %s", tx_hash, network)
+                return
+            
+            misses += 1
+            if misses >= TX_POLL_BACKOFF_AFTER:
+                interval = min(interval * 2, TX_POLL_MAX_INTERVAL)
+            time.sleep(min(interval, max(0, deadline - time.monotonic())))
+        
+        logger.warning("Transaction %s not confirmed within %ss", tx_hash, timeout)
+    
+    def process_webhook_payment(self, webhook_data: Union[Dict, bytes, str]) -> Dict:
+        """웹훅을 통한 결제 처리 (원본 본문이 오면 한 번만 파싱)"""
+        if isinstance(webhook_data, (bytes, str)):
+            webhook_data = loads_json(webhook_data)
+        
         event_type = webhook_data.get("type")
         data = webhook_data.get("data", {}).get("object", {})
         
@@ -149,16 +354,31 @@ class AccountingSystem:
     def __init__(self):
         self.transactions = []
         self.ledger = {}
+        # 보고서용 누적 집계 (거래 기록 시 갱신)
+        self._total_revenue = 0
+        self._by_year = defaultdict(lambda: {"total_income": 0, "transaction_count": 0})
         
     def record_transaction(self, transaction: Dict):
-        """거래 기록"""
+        """거래 기록 (recorded_at: 기존 형식의 ISO 문자열, recorded_at_ns: 정렬/계산용 정수 시각)"""
+        recorded_at_ns = time.time_ns()
         self.transactions.append({
             **transaction,
-            "recorded_at": datetime.now().isoformat()
+            "recorded_at": _iso(recorded_at_ns),
+            "recorded_at_ns": recorded_at_ns
         })
         
         # 원장에 업데이트
         self._update_ledger(transaction)
+        self._update_aggregates(transaction, time.localtime(recorded_at_ns // 1_000_000_000).tm_year)
+    
+    def _update_aggregates(self, transaction: Dict, year: int):
+        """총매출/연도별 집계 갱신"""
+        year_totals = self._by_year[year]
+        year_totals["transaction_count"] += 1
+        if transaction.get("type") == "credit":
+            amount = transaction.get("amount", 0)
+            year_totals["total_income"] += amount
+            self._total_revenue += amount
         
     def _update_ledger(self, transaction: Dict):
         """원장 업데이트"""
@@ -179,14 +399,8 @@ class AccountingSystem:
     
     def get_financial_summary(self) -> Dict:
         """재무 요약"""
-        total_revenue = sum(
-            t.get("amount", 0) 
-            for t in self.transactions 
-            if t.get("type") == "credit"
-        )
-        
         return {
-            "total_revenue": total_revenue,
+            "total_revenue": self._total_revenue,
             "transaction_count": len(self.transactions),
             "ledger": self.ledger,
             "period": {
@@ -200,21 +414,12 @@ class AccountingSystem:
         if year is None:
             year = datetime.now().year
         
-        year_transactions = [
-            t for t in self.transactions
-            if t.get("recorded_at", "").startswith(str(year))
-        ]
-        
-        total_income = sum(
-            t.get("amount", 0)
-            for t in year_transactions
-            if t.get("type") == "credit"
-        )
+        year_totals = self._by_year.get(year, {"total_income": 0, "transaction_count": 0})
         
         return {
             "tax_year": year,
-            "total_income": total_income,
-            "transaction_count": len(year_transactions),
+            "total_income": year_totals["total_income"],
+            "transaction_count": year_totals["transaction_count"],
             "currency": "USD",
             "generated_at": datetime.now().isoformat(),
             "note": "For tax purposes. Consult a professional accountant."
@@ -231,7 +436,7 @@ class PaymentAutomation:
     def process_payment(self, order_data: Dict) -> Dict:
         """결제 처리 자동화"""
         amount_usd = order_data.get("amount_usd", 0)
-        order_id = order_data.get("order_id", str(datetime.now().timestamp()))
+        order_id = order_data.get("order_id") or new_order_id()
         
         # Stripe Crypto 결제 생성
         stripe_result = self.crypto.create_crypto_payment_intent(
@@ -252,6 +457,8 @@ class PaymentAutomation:
             amount_usd, 
             order_id
         )
+        if not wallet_result["success"]:
+            return {**wallet_result, "order_id": order_id}
         
         return {
             "success": True,
@@ -271,11 +478,30 @@ class PaymentAutomation:
             "description": f"Template sale - {order_id}"
         })
         
-        logger.info(f"Order fulfilled: {order_id}")
+        logger.info("Order fulfilled: %s", order_id)
         
         return {"success": True, "order_id": order_id}
 
 
-# Export
-payment_automation = PaymentAutomation()
-accounting_system = AccountingSystem()
+# Export - 최초 사용 시 생성 (import만으로 Stripe 키/HTTP 세션을 준비하지 않음)
+@lru_cache(maxsize=1)
+def get_payment_automation() -> PaymentAutomation:
+    return PaymentAutomation()
+
+
+@lru_cache(maxsize=1)
+def get_accounting_system() -> AccountingSystem:
+    return AccountingSystem()
+
+
+_LAZY_EXPORTS = {
+    "payment_automation": get_payment_automation,
+    "accounting_system": get_accounting_system
+}
+
+
+def __getattr__(name):
+    # 기존 `from payments.crypto_payments import payment_automation` 호환
+    if name in _LAZY_EXPORTS:
+        return _LAZY_EXPORTS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,17 @@
 """Advanced Crypto Payment System - Multi-Wallet Network Support"""
 import os
 import json
-import requests
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 import logging
 
+from core.http import loads_json
+from payments.crypto_payments import API_TIMEOUT, get_api_session, new_order_id, is_price_fresh, quote_crypto_amount
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,32 +27,39 @@ class CryptoNetwork(Enum):
     AVALANCHE = "avalanche"
 
 
+class CryptoInfo(NamedTuple):
+    """암호화페 정보 (네트워크, 심볼, 표시 이름)"""
+    network: CryptoNetwork
+    symbol: str
+    name: str
+
+
 class CryptoCurrency(Enum):
     """지원 암호화페"""
     # Ethereum/ERC-20
-    ETH = {"network": CryptoNetwork.ETHEREUM, "symbol": "ETH", "name": "Ethereum"}
-    USDC_ETH = {"network": CryptoNetwork.ETHEREUM, "symbol": "USDC", "name": "USD Coin (ETH)"}
-    USDT_ETH = {"network": CryptoNetwork.ETHEREUM, "symbol": "USDT", "name": "Tether (ETH)"}
+    ETH = CryptoInfo(CryptoNetwork.ETHEREUM, "ETH", "Ethereum")
+    USDC_ETH = CryptoInfo(CryptoNetwork.ETHEREUM, "USDC", "USD Coin (ETH)")
+    USDT_ETH = CryptoInfo(CryptoNetwork.ETHEREUM, "USDT", "Tether (ETH)")
     
     # Solana
-    SOL = {"network": CryptoNetwork.SOLANA, "symbol": "SOL", "name": "Solana"}
-    USDC_SOL = {"network": CryptoNetwork.SOLANA, "symbol": "USDC", "name": "USD Coin (SOL)"}
+    SOL = CryptoInfo(CryptoNetwork.SOLANA, "SOL", "Solana")
+    USDC_SOL = CryptoInfo(CryptoNetwork.SOLANA, "USDC", "USD Coin (SOL)")
     
     # Bitcoin
-    BTC = {"network": CryptoNetwork.BITCOIN, "symbol": "BTC", "name": "Bitcoin"}
+    BTC = CryptoInfo(CryptoNetwork.BITCOIN, "BTC", "Bitcoin")
     
     # BSC
-    BNB = {"network": CryptoNetwork.BSC, "symbol": "BNB", "name": "BNB"}
-    USDT_BSC = {"network": CryptoNetwork.BSC, "symbol": "USDT", "name": "Tether (BSC)"}
+    BNB = CryptoInfo(CryptoNetwork.BSC, "BNB", "BNB")
+    USDT_BSC = CryptoInfo(CryptoNetwork.BSC, "USDT", "Tether (BSC)")
     
     # Polygon
-    MATIC = {"network": CryptoNetwork.POLYGON, "symbol": "MATIC", "name": "Polygon"}
-    USDC_POL = {"network": CryptoNetwork.POLYGON, "symbol": "USDC", "name": "USD Coin (POL)"}
+    MATIC = CryptoInfo(CryptoNetwork.POLYGON, "MATIC", "Polygon")
+    USDC_POL = CryptoInfo(CryptoNetwork.POLYGON, "USDC", "USD Coin (POL)")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WalletConfig:
-    """지갑 설정"""
+    """지갑 설정 (불변 - 변경이 필요하면 dataclasses.replace 사용)"""
     name: str
     network: CryptoNetwork
     address: str
@@ -57,43 +68,110 @@ class WalletConfig:
     memo: str = ""
 
 
-# 플랫폼별 지원 암호화페 매핑
+# 동일한 지갑 설정은 인스턴스 하나를 공유
+_wallet_cache: Dict[WalletConfig, WalletConfig] = {}
+
+
+def _intern_wallet(wallet: WalletConfig) -> WalletConfig:
+    return _wallet_cache.setdefault(wallet, wallet)
+
+
+# 심볼 -> 암호화페 (같은 심볼이 여러 네트워크에 있으면 먼저 정의된 ETH 쪽이 기본)
+_SYMBOL_INDEX: Dict[str, CryptoCurrency] = {}
+# (심볼, 네트워크) -> 암호화페 (USDC_SOL처럼 ETH가 아닌 네트워크의 토큰 조회용)
+_SYMBOL_NETWORK_INDEX: Dict[Tuple[str, str], CryptoCurrency] = {}
+for _crypto in CryptoCurrency:
+    _SYMBOL_INDEX.setdefault(_crypto.value.symbol, _crypto)
+    _SYMBOL_NETWORK_INDEX[(_crypto.value.symbol, _crypto.value.network.value)] = _crypto
+del _crypto
+
+# EIP-681 체인 ID
+_EVM_CHAIN_IDS = {
+    CryptoNetwork.ETHEREUM: 1,
+    CryptoNetwork.POLYGON: 137,
+}
+
+# ERC-20 토큰 컨트랙트 - 토큰 송금 QR은 지갑 주소가 아닌 컨트랙트의 transfer 호출
+# (BSC USDT는 소수 18자리라 TOKEN_DECIMALS의 USDT(6)와 맞지 않아 제외)
+_ERC20_CONTRACTS = {
+    CryptoCurrency.USDC_ETH: "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+    CryptoCurrency.USDT_ETH: "0xdAC17F958D2ee523a2206206994597C13D831ec7",
+    CryptoCurrency.USDC_POL: "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",
+}
+
+# Solana Pay SPL 토큰 민트 주소
+_SPL_TOKEN_MINTS = {
+    CryptoCurrency.USDC_SOL: "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+}
+
+# 네트워크별 우선순위 지갑 키
+_PRIORITY_WALLETS = {
+    CryptoNetwork.ETHEREUM: ("ETH", "TRUST_ETH"),
+    CryptoNetwork.SOLANA: ("PHANTOM_SOL", "TRUST_SOL"),
+    CryptoNetwork.BITCOIN: ("BTC",),
+    CryptoNetwork.BSC: ("BSC",),
+    CryptoNetwork.POLYGON: ("TRUST_ETH",),  # Polygon은 ETH 지갑 사용 가능
+    CryptoNetwork.ARBITRUM: ("ETH",),  # Arbitrum은 ETH 지갑 사용 가능
+    CryptoNetwork.OPTIMISM: ("ETH",),  # Optimism은 ETH 지갑 사용 가능
+}
+
+
+# 플랫폼별 지원 암호화페 매핑 (같은 심볼도 네트워크별로 구분되도록 CryptoCurrency로 보관)
+# (LTC, DOGE 등 CryptoCurrency에 없는 코인은 추가할 때 함께 넣을 것)
 PLATFORM_CRYPTO_SUPPORT = {
-    "stripe": [
-        CryptoCurrency.USDC_ETH.value["symbol"],
-        CryptoCurrency.USDT_ETH.value["symbol"],
-        CryptoCurrency.ETH.value["symbol"],
-        CryptoCurrency.USDC_SOL.value["symbol"]
-    ],
-    "coinbase_commerce": [
-        CryptoCurrency.BTC.value["symbol"],
-        CryptoCurrency.ETH.value["symbol"],
-        CryptoCurrency.USDC_ETH.value["symbol"],
-        CryptoCurrency.LTC.value["symbol"] if hasattr(CryptoCurrency, 'LTC') else None
-    ],
-    "bitpay": [
-        CryptoCurrency.BTC.value["symbol"],
-        CryptoCurrency.ETH.value["symbol"],
-        CryptoCurrency.USDC_ETH.value["symbol"],
-        CryptoCurrency.DOGE.value["symbol"] if hasattr(CryptoCurrency, 'DOGE') else None
-    ],
-    "manual_wallet": [  # 직접 지갑 송금
-        CryptoCurrency.ETH.value["symbol"],
-        CryptoCurrency.USDC_ETH.value["symbol"],
-        CryptoCurrency.USDT_ETH.value["symbol"],
-        CryptoCurrency.SOL.value["symbol"],
-        CryptoCurrency.USDC_SOL.value["symbol"],
-        CryptoCurrency.BTC.value["symbol"]
-    ]
+    "stripe": (CryptoCurrency.USDC_ETH, CryptoCurrency.USDT_ETH, CryptoCurrency.ETH, CryptoCurrency.USDC_SOL),
+    "coinbase_commerce": (CryptoCurrency.BTC, CryptoCurrency.ETH, CryptoCurrency.USDC_ETH),
+    "bitpay": (CryptoCurrency.BTC, CryptoCurrency.ETH, CryptoCurrency.USDC_ETH),
+    "manual_wallet": (  # 직접 지갑 송금
+        CryptoCurrency.ETH, CryptoCurrency.USDC_ETH, CryptoCurrency.USDT_ETH,
+        CryptoCurrency.SOL, CryptoCurrency.USDC_SOL, CryptoCurrency.BTC
+    ),
 }
 
 
+# 결제 안내 템플릿 (memo_block은 메모가 필요한 지갑에서만 채움)
+_INSTRUCTIONS_TEMPLATE = """
+**{crypto_name} 결제 안내**
+
+1. **암호화페**: {symbol}
+2. **네트워크**: {network}
+3. **지갑**: {wallet_name}
+
+**송금 주소:**
+```{address}```
+
+**송금 금액**: {amount} {symbol}
+
+{memo_block}
+**주의사항**:
+- 잘못된 네트워크로 전송 시 자금이 손실될 수 있습니다.
+- 정확한 금액을 송금해 주세요.
+- 네트워크 확인 후 10-30분 내 도착합니다.
+"""
+
+
+@lru_cache(maxsize=256)
+def _render_payment_instructions(crypto_name: str, symbol: str, network: str, wallet_name: str,
+                                 address: str, amount: str, memo_block: str) -> str:
+    """결제 안내 렌더링 (같은 지갑/암호화페/금액 조합은 캐시에서 반환)"""
+    return _INSTRUCTIONS_TEMPLATE.format_map({
+        "crypto_name": crypto_name,
+        "symbol": symbol,
+        "network": network,
+        "wallet_name": wallet_name,
+        "address": address,
+        "amount": amount,
+        "memo_block": memo_block
+    })
+
+
 class MultiWalletPaymentSystem:
     """다중 지갑 암호화페 결제 시스템"""
     
     def __init__(self):
         self.wallets = self._load_wallet_configs()
-        self.exchange_rates = {}
+        self._network_wallets = self._resolve_network_wallets()
+        self.exchange_rates: Dict[str, Tuple[float, float]] = {}  # symbol -> (price, fetched_at)
     
     def _load_wallet_configs(self) -> Dict[str, WalletConfig]:
         """지갑 설정 로드"""
@@ -147,7 +225,17 @@ class MultiWalletPaymentSystem:
                 address=os.getenv("TRUSTWALLET_BSC_ADDRESS")
             )
         
-        return wallets
+        return {key: _intern_wallet(wallet) for key, wallet in wallets.items()}
+    
+    def _resolve_network_wallets(self) -> Dict[CryptoNetwork, WalletConfig]:
+        """네트워크별로 사용할 지갑을 우선순위에 따라 미리 결정"""
+        resolved = {}
+        for network, wallet_keys in _PRIORITY_WALLETS.items():
+            for wallet_key in wallet_keys:
+                if wallet_key in self.wallets:
+                    resolved[network] = self.wallets[wallet_key]
+                    break
+        return resolved
     
     def get_supported_crypto_list(self) -> List[Dict]:
         """지원되는 암호화페 목록 반환"""
@@ -157,9 +245,9 @@ class MultiWalletPaymentSystem:
             wallet = self._get_wallet_for_crypto(crypto)
             if wallet:
                 supported.append({
-                    "symbol": crypto.value["symbol"],
-                    "name": crypto.value["name"],
-                    "network": crypto.value["network"].value,
+                    "symbol": crypto.value.symbol,
+                    "name": crypto.value.name,
+                    "network": crypto.value.network.value,
                     "wallet_name": wallet.name,
                     "wallet_address": wallet.address
                 })
@@ -168,168 +256,172 @@ class MultiWalletPaymentSystem:
     
     def _get_wallet_for_crypto(self, crypto: CryptoCurrency) -> Optional[WalletConfig]:
         """암호화페에 맞는 지갑 반환"""
-        crypto_info = crypto.value
-        network = crypto_info["network"]
-        
-        # 네트워크별 우선순위 지갑 선택
-        priority_wallets = {
-            CryptoNetwork.ETHEREUM: ["ETH", "TRUST_ETH"],
-            CryptoNetwork.SOLANA: ["PHANTOM_SOL", "TRUST_SOL"],
-            CryptoNetwork.BITCOIN: ["BTC"],
-            CryptoNetwork.BSC: ["BSC"],
-            CryptoNetwork.POLYGON: ["TRUST_ETH"],  # Polygon은 ETH 지갑 사용 가능
-            CryptoNetwork.ARBITRUM: ["ETH"],  # Arbitrum은 ETH 지갑 사용 가능
-            CryptoNetwork.OPTIMISM: ["ETH"],  # Optimism은 ETH 지갑 사용 가능
-        }
-        
-        priority = priority_wallets.get(network, [])
-        
-        for wallet_key in priority:
-            if wallet_key in self.wallets:
-                return self.wallets[wallet_key]
-        
-        return None
+        return self._network_wallets.get(crypto.value.network)
     
-    def create_payment_request(self, amount_usd: float, crypto_symbol: str, order_id: str) -> Dict:
-        """결제 요청 생성"""
+    def create_payment_request(self, amount_usd: float, crypto_symbol: str, order_id: str,
+                               network: Optional[str] = None) -> Dict:
+        """결제 요청 생성 (network: 같은 심볼이 여러 네트워크에 있을 때 선택, 기본은 ETH 쪽)"""
         # 암호화페 찾기
-        crypto = self._find_crypto_by_symbol(crypto_symbol)
+        crypto = self._find_crypto_by_symbol(crypto_symbol, network)
         if not crypto:
             return {"success": False, "error": f"Unsupported crypto: {crypto_symbol}"}
         
         # 지갑 찾기
         wallet = self._get_wallet_for_crypto(crypto)
         if not wallet:
-            return {"success": False, "error": f"No wallet configured for {crypto.value['name']}"}
+            return {"success": False, "error": f"No wallet configured for {crypto.value.name}"}
         
         # 환율 조회
-        exchange_rate = self._get_exchange_rate(crypto.value["symbol"])
-        crypto_amount = round(amount_usd / exchange_rate, 6)
+        symbol = crypto.value.symbol
+        exchange_rate = self._get_exchange_rate(symbol)
+        if not exchange_rate:
+            return {"success": False, "error": f"Exchange rate unavailable for {symbol}"}
+        base_units, display_amount = quote_crypto_amount(amount_usd, exchange_rate, symbol)
         
         payment_data = {
             "order_id": order_id,
-            "crypto": crypto.value["symbol"],
-            "crypto_name": crypto.value["name"],
+            "crypto": symbol,
+            "crypto_name": crypto.value.name,
             "network": wallet.network.value,
-            "crypto_amount": crypto_amount,
+            "crypto_amount": float(display_amount),
+            "crypto_amount_base_units": base_units,
             "usd_amount": amount_usd,
             "exchange_rate": exchange_rate,
             "wallet_name": wallet.name,
             "wallet_address": wallet.address,
-            "qr_code": self._generate_qr_code(wallet.address, crypto_amount, crypto.value["symbol"]),
+            "qr_code": self._generate_qr_code(wallet.address, base_units, display_amount, crypto),
             "memo_required": wallet.memo_required,
             "memo": wallet.memo if wallet.memo_required else "",
             "status": "pending",
             "created_at": datetime.now().isoformat(),
-            "instructions": self._generate_payment_instructions(wallet, crypto, crypto_amount)
+            "instructions": self._generate_payment_instructions(wallet, crypto, display_amount)
         }
         
-        logger.info(f"Payment request created: {payment_data}")
+        logger.info("Payment request created: order=%s crypto=%s amount=%s",
+                    order_id, symbol, display_amount)
         
         return {
             "success": True,
             "payment_data": payment_data
         }
     
-    def _find_crypto_by_symbol(self, symbol: str) -> Optional[CryptoCurrency]:
-        """심볼로 암호화페 찾기"""
-        symbol_upper = symbol.upper()
-        
-        for crypto in CryptoCurrency:
-            if crypto.value["symbol"] == symbol_upper:
-                return crypto
-        
-        # USDT/USDC는 네트워크 확인 필요
-        if symbol_upper in ["USDT", "USDC"]:
-            # 기본적으로 ETH 네트워크 사용
-            if symbol_upper == "USDC":
-                return CryptoCurrency.USDC_ETH
-            else:
-                return CryptoCurrency.USDT_ETH
-        
-        return None
+    def _find_crypto_by_symbol(self, symbol: str, network: Optional[str] = None) -> Optional[CryptoCurrency]:
+        """심볼로 암호화페 찾기 (network가 없으면 USDT/USDC는 ETH 네트워크 기본)"""
+        if network:
+            return _SYMBOL_NETWORK_INDEX.get((symbol.upper(), network))
+        return _SYMBOL_INDEX.get(symbol.upper())
     
     def _get_exchange_rate(self, crypto_symbol: str) -> float:
-        """환율 조회"""
+        """환율 조회 (CRYPTO_PRICE_TTL 동안 캐시)"""
+        cached = self.exchange_rates.get(crypto_symbol)
+        if cached and is_price_fresh(*cached):
+            return cached[0]
+        
+        price = self._fetch_exchange_rate(crypto_symbol)
+        self.exchange_rates[crypto_symbol] = (price, time.monotonic())
+        return price
+    
+    def _fetch_exchange_rate(self, crypto_symbol: str) -> float:
+        """cryptocompare에서 단일 심볼 환율 조회 (실패 시 0)"""
         try:
-            response = requests.get(
+            response = get_api_session().get(
                 f"https://min-api.cryptocompare.com/data/price",
-                params={"fsym": crypto_symbol, "tsyms": "USD"}
+                params={"fsym": crypto_symbol, "tsyms": "USD"},
+                timeout=API_TIMEOUT
             )
-            data = response.json()
+            data = loads_json(response.content)
             return data.get("USD", 0)
         except Exception as e:
-            logger.error(f"Error getting exchange rate for {crypto_symbol}: {e}")
+            logger.error("Error getting exchange rate for %s: %s", crypto_symbol, e)
             return 0
     
-    def _generate_qr_code(self, address: str, amount: float, crypto: str) -> str:
-        """QR 코드 생성 (암호화페 URI 스킴)"""
-        # Crypto URI 스킴 생성
-        if crypto in ["BTC"]:
+    def _get_exchange_rates_bulk(self, symbols: List[str]) -> Dict[str, float]:
+        """여러 심볼 환율을 pricemulti 한 번으로 조회 (캐시에 없는 심볼만 요청)"""
+        rates = {}
+        missing = set()
+        for symbol in symbols:
+            cached = self.exchange_rates.get(symbol)
+            if cached and is_price_fresh(*cached):
+                rates[symbol] = cached[0]
+            else:
+                missing.add(symbol)
+        
+        if missing:
+            try:
+                response = get_api_session().get(
+                    "https://min-api.cryptocompare.com/data/pricemulti",
+                    params={"fsyms": ",".join(sorted(missing)), "tsyms": "USD"},
+                    timeout=API_TIMEOUT
+                )
+                data = loads_json(response.content)
+            except Exception as e:
+                logger.error("Error getting exchange rates for %s: %s", ",".join(sorted(missing)), e)
+                data = {}
+            
+            fetched_at = time.monotonic()
+            for symbol in missing:
+                quote = data.get(symbol)
+                price = quote.get("USD", 0) if isinstance(quote, dict) else 0
+                self.exchange_rates[symbol] = (price, fetched_at)
+                rates[symbol] = price
+        
+        return rates
+    
+    def _generate_qr_code(self, address: str, base_units: int, amount: str, crypto: CryptoCurrency) -> str:
+        """QR 코드 생성 (암호화페 URI 스킴 - EIP-681은 최소 단위 정수, BIP-21/Solana Pay는 십진 금액)"""
+        # ERC-20은 value(네이티브 ETH, wei)가 아니라 토큰 컨트랙트의 transfer(address, uint256)
+        contract = _ERC20_CONTRACTS.get(crypto)
+        if contract:
+            chain_id = _EVM_CHAIN_IDS[crypto.value.network]
+            return f"ethereum:{contract}@{chain_id}/transfer?address={address}&uint256={base_units}"
+        if crypto is CryptoCurrency.ETH:
+            return f"ethereum:{address}?value={base_units}"
+        if crypto is CryptoCurrency.BTC:
             return f"bitcoin:{address}?amount={amount}"
-        elif crypto in ["ETH", "USDC", "USDT"]:
-            return f"ethereum:{address}?value={int(amount * 1e18)}"
-        elif crypto in ["SOL", "USDC_SOL"]:
+        if crypto is CryptoCurrency.SOL:
             return f"solana:{address}?amount={amount}"
-        else:
-            return address
+        if crypto in _SPL_TOKEN_MINTS:
+            return f"solana:{address}?amount={amount}&spl-token={_SPL_TOKEN_MINTS[crypto]}"
+        return address
     
-    def _generate_payment_instructions(self, wallet: WalletConfig, crypto: CryptoCurrency, amount: float) -> str:
+    def _generate_payment_instructions(self, wallet: WalletConfig, crypto: CryptoCurrency, amount: str) -> str:
         """결제 안내 생성"""
-        network = wallet.network.value
         crypto_info = crypto.value
+        memo_block = f"**메모 (필수)**: `{wallet.memo}`\n" if wallet.memo_required else ""
         
-        instructions = f"""
-**{crypto_info['name']} 결제 안내**
-
-1. **암호화페**: {crypto_info['symbol']}
-2. **네트워크**: {network.upper()}
-3. **지갑**: {wallet.name}
-
-**송금 주소:**
-```{wallet.address}```
-
-**송금 금액**: {amount} {crypto_info['symbol']}
-
-"""
-        
-        if wallet.memo_required:
-            instructions += f"**메모 (필수)**: `{wallet.memo}`\n"
-        
-        instructions += """
-**주의사항**:
-- 잘못된 네트워크로 전송 시 자금이 손실될 수 있습니다.
-- 정확한 금액을 송금해 주세요.
-- 네트워크 확인 후 10-30분 내 도착합니다.
-"""
-        
-        return instructions
+        return _render_payment_instructions(
+            crypto_info.name, crypto_info.symbol, wallet.network.value.upper(),
+            wallet.name, wallet.address, amount, memo_block
+        )
     
     def get_optimal_crypto_for_platform(self, platform: str) -> List[Dict]:
         """플랫폼별 최적 암호화페 반환"""
         if platform not in PLATFORM_CRYPTO_SUPPORT:
             platform = "manual_wallet"
         
-        supported_symbols = PLATFORM_CRYPTO_SUPPORT[platform]
-        optimal = []
-        
-        for symbol in supported_symbols:
-            if symbol:  # None이 아닌 경우
-                crypto = self._find_crypto_by_symbol(symbol)
-                if crypto:
-                    wallet = self._get_wallet_for_crypto(crypto)
-                    if wallet:
-                        exchange_rate = self._get_exchange_rate(symbol)
-                        optimal.append({
-                            "symbol": symbol,
-                            "crypto_name": crypto.value["name"],
-                            "network": crypto.value["network"].value,
-                            "wallet_name": wallet.name,
-                            "wallet_address": wallet.address,
-                            "estimated_usd_per_1_unit": exchange_rate
-                        })
-        
-        return optimal
+        candidates = []
+        for crypto in PLATFORM_CRYPTO_SUPPORT[platform]:
+            wallet = self._get_wallet_for_crypto(crypto)
+            if wallet:
+                candidates.append((crypto.value.symbol, crypto, wallet))
+        
+        if not candidates:
+            return []
+        
+        # 환율은 후보 심볼 전체를 한 번에 조회
+        rates = self._get_exchange_rates_bulk([symbol for symbol, _, _ in candidates])
+        
+        return [
+            {
+                "symbol": symbol,
+                "crypto_name": crypto.value.name,
+                "network": crypto.value.network.value,
+                "wallet_name": wallet.name,
+                "wallet_address": wallet.address,
+                "estimated_usd_per_1_unit": rates.get(symbol, 0)
+            }
+            for symbol, crypto, wallet in candidates
+        ]
     
     def check_payment_status(self, order_id: str, crypto_symbol: str, tx_hash: str = None) -> Dict:
         """결제 상태 확인"""
@@ -377,7 +469,8 @@ class CryptoPaymentOptimizer:
         payment_result = self.payment_system.create_payment_request(
             amount_usd,
             best_option["symbol"],
-            f"order_{datetime.now().timestamp()}"
+            new_order_id(),
+            best_option["network"]
         )
         
         if payment_result["success"]:
@@ -433,6 +526,25 @@ python src/main.py test
         return guide
 
 
-# Export
-crypto_payment_system = MultiWalletPaymentSystem()
-crypto_optimizer = CryptoPaymentOptimizer()
+# Export - 최초 사용 시 생성 (import만으로 지갑 환경 변수를 읽지 않음)
+@lru_cache(maxsize=1)
+def get_crypto_payment_system() -> MultiWalletPaymentSystem:
+    return MultiWalletPaymentSystem()
+
+
+@lru_cache(maxsize=1)
+def get_crypto_optimizer() -> CryptoPaymentOptimizer:
+    return CryptoPaymentOptimizer()
+
+
+_LAZY_EXPORTS = {
+    "crypto_payment_system": get_crypto_payment_system,
+    "crypto_optimizer": get_crypto_optimizer
+}
+
+
+def __getattr__(name):
+    # 기존 `from payments.multi_wallet_crypto import crypto_optimizer` 호환
+    if name in _LAZY_EXPORTS:
+        return _LAZY_EXPORTS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
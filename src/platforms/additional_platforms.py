@@ -1,34 +1,120 @@
 """Additional Platforms Module - Etsy, Payhip Integration"""
 import os
 import json
-import requests
-from typing import Dict, List, Optional
+import bisect
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 from datetime import datetime
+from functools import lru_cache
 import logging
 
+from core.http import dumps_json
+from platforms.base import PlatformAPI
+
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _etsy_credentials() -> tuple:
+    """Etsy 인증 정보 (api_key, client_id, client_secret, shop_id) - 프로세스당 한 번만 읽음"""
+    return (
+        os.getenv("ETSY_API_KEY"),
+        os.getenv("ETSY_CLIENT_ID"),
+        os.getenv("ETSY_CLIENT_SECRET"),
+        os.getenv("ETSY_SHOP_ID")
+    )
+
+
+@lru_cache(maxsize=1)
+def _payhip_api_key() -> Optional[str]:
+    return os.getenv("PAYHIP_API_KEY")
+
+
+# 플랫폼별 제목 최대 길이
+_MAX_TITLE_LEN = {"etsy": 140, "gumroad": 200, "payhip": 140, "lemon_squeezy": 255}
+
+_ETSY_MATERIALS = ("Digital", "Downloadable", "Template")
+_ETSY_STYLE = ("Modern", "Professional")
+
+
+def _adapt_etsy(adapted: Dict, template_data: Dict):
+    adapted["tags"] = adapted["tags"][:13]
+    adapted["taxonomy_id"] = 66  # Digital Downloads
+    adapted["materials"] = _ETSY_MATERIALS
+    adapted["style"] = _ETSY_STYLE
+
+
+def _adapt_payhip(adapted: Dict, template_data: Dict):
+    price = adapted["price"]
+    adapted["variants"] = [
+        {"name": "Basic", "price": price},
+        {"name": "Premium", "price": price * 1.5}
+    ]
 
-class EtsyAPI:
+
+# 가격대별 최적 플랫폼 - 가격이 _PRICE_TIER_LIMITS[i] 이하이면 _PRICE_TIER_PLATFORMS[i]
+_PRICE_TIER_LIMITS = (19, 79)
+_PRICE_TIER_PLATFORMS = (
+    ("etsy", "payhip"),             # 저가
+    ("gumroad", "payhip"),          # 중가
+    ("gumroad", "lemon_squeezy"),   # 고가
+)
+
+# 공통 필드 외에 플랫폼별로 추가/변경할 항목
+_ADAPTERS = {
+    "etsy": _adapt_etsy,
+    "payhip": _adapt_payhip
+}
+
+
+# 플랫폼 비교 분석 (정적 데이터)
+_PLATFORM_COMPARISON: Mapping[str, Mapping] = MappingProxyType({
+    "gumroad": MappingProxyType({
+        "fees": "10% + $0.50",
+        "pros": ("간편", "다양한 결제", "대형 커뮤니티"),
+        "cons": ("높은 수수료", "제한적 커스터마이징"),
+        "best_for": "일반 디지털 제품"
+    }),
+    "etsy": MappingProxyType({
+        "fees": "6.5% + $0.20/listing",
+        "pros": ("대형 마켓플레이스", "SEO 유리", "국제 노출"),
+        "cons": ("경쟁 심함", "신규 셀러 제한"),
+        "best_for": "디자인 중심 제품"
+    }),
+    "payhip": MappingProxyType({
+        "fees": "5% (무료플랜)",
+        "pros": ("저렴", "간편", "제휴 시스템"),
+        "cons": ("소규모 마켓플레이스", "제한적 분석"),
+        "best_for": "간편한 디지털 판매"
+    }),
+    "lemon_squeezy": MappingProxyType({
+        "fees": "5% + $0.50",
+        "pros": ("세금 자동 처리", "구독 지원", "다양한 통화"),
+        "cons": ("상대적으로 신규", "미국 중심"),
+        "best_for": "국제 판매"
+    })
+})
+
+
+class EtsyAPI(PlatformAPI):
     """Etsy 플랫폼 자동화"""
     
+    __slots__ = ("api_key", "client_id", "client_secret", "shop_id", "_listings_url", "_shop_listings_url")
+    
     BASE_URL = "https://openapi.etsy.com/v3"
     
     def __init__(self):
-        self.api_key = os.getenv("ETSY_API_KEY")
-        self.client_id = os.getenv("ETSY_CLIENT_ID")
-        self.client_secret = os.getenv("ETSY_CLIENT_SECRET")
-        self.shop_id = os.getenv("ETSY_SHOP_ID")
-        self.headers = {
+        self.api_key, self.client_id, self.client_secret, self.shop_id = _etsy_credentials()
+        super().__init__({
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
             "x-api-key": self.client_id
-        }
+        })
+        self._listings_url = f"{self.BASE_URL}/applications/listings"
+        self._shop_listings_url = f"{self.BASE_URL}/applications/shops/{self.shop_id}/listings"
     
     def create_listing(self, listing_data: Dict) -> Dict:
         """Etsy 리스팅 생성"""
-        endpoint = f"{self.BASE_URL}/applications/listings"
-        
         payload = {
             "quantity": 1,
             "title": listing_data.get("title", "")[:140],
@@ -45,69 +131,71 @@ class EtsyAPI:
             "style": listing_data.get("style", [])
         }
         
-        try:
-            response = requests.post(
-                endpoint, 
-                json=payload, 
-                headers=self.headers
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.info(f"Etsy listing created: {result.get('listing_id')}")
-            
-            return {
-                "success": True,
-                "listing_id": result.get("listing_id"),
-                "url": f"https://www.etsy.com/listing/{result.get('listing_id')}",
-                "data": result
-            }
-            
-        except Exception as e:
-            logger.error(f"Etsy listing error: {e}")
-            return {"success": False, "error": str(e)}
+        response = self._request("POST", self._listings_url, "Etsy listing error", data=dumps_json(payload))
+        if not response["success"]:
+            return response
+        
+        result = response["data"]
+        logger.info("Etsy listing created: %s", result.get('listing_id'))
+        
+        return {
+            "success": True,
+            "listing_id": result.get("listing_id"),
+            "url": f"https://www.etsy.com/listing/{result.get('listing_id')}",
+            "data": result
+        }
     
     def upload_listing_images(self, listing_id: str, image_urls: List[str]) -> Dict:
         """리스팅 이미지 업로드"""
-        endpoint = f"{self.BASE_URL}/applications/listings/{listing_id}/images"
+        endpoint = f"{self._listings_url}/{listing_id}/images"
+        
+        image_urls = image_urls[:10]  # Max 10 images
+        if not image_urls:
+            return {"success": True, "images_uploaded": 0}
+        
+        # 이미지마다 독립 요청이므로 동시에 업로드 (rank로 순서 유지)
+        with ThreadPoolExecutor(max_workers=len(image_urls)) as executor:
+            futures = [executor.submit(self._upload_image, endpoint, rank, url)
+                       for rank, url in enumerate(image_urls, 1)]
+            uploaded = sum(1 for future in as_completed(futures) if future.result()["success"])
+        
+        return {"success": True, "images_uploaded": uploaded}
+    
+    def _upload_image(self, endpoint: str, rank: int, url: str) -> Dict:
+        return self._request("POST", endpoint, "Etsy image upload error",
+                             data=dumps_json({"url": url, "rank": rank}))
+    
+    def publish_listing(self, listing_data: Dict, image_urls: List[str] = (), inventory: Dict = None) -> Dict:
+        """리스팅 생성 후 이미지 업로드와 재고 설정을 한 번에 동시 전송 (리스팅 생성 실패 시 즉시 반환)"""
+        listing = self.create_listing(listing_data)
+        if not listing["success"]:
+            return listing
+        
+        listing_id = listing["listing_id"]
+        image_urls = list(image_urls)[:10]  # Max 10 images
+        images_endpoint = f"{self._listings_url}/{listing_id}/images"
         
-        images = []
-        for i, url in enumerate(image_urls[:10]):  # Max 10 images
-            try:
-                response = requests.post(
-                    endpoint,
-                    json={"url": url, "rank": i + 1},
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                images.append(response.json())
-            except Exception as e:
-                logger.error(f"Etsy image upload error: {e}")
+        # 이후 요청은 listing_id만 필요하므로 이미지와 재고 요청을 같은 세션 풀로 동시에 보냄
+        with ThreadPoolExecutor(max_workers=len(image_urls) + 1) as executor:
+            inventory_future = executor.submit(self.update_inventory, listing_id, inventory or {})
+            image_futures = [executor.submit(self._upload_image, images_endpoint, rank, url)
+                             for rank, url in enumerate(image_urls, 1)]
+            uploaded = sum(1 for future in image_futures if future.result()["success"])
+            inventory_result = inventory_future.result()
         
-        return {"success": True, "images_uploaded": len(images)}
+        return {
+            **listing,
+            "images_uploaded": uploaded,
+            "inventory_updated": inventory_result["success"]
+        }
     
     def get_listings(self, status: str = "active") -> Dict:
         """리스팅 목록 조회"""
-        endpoint = f"{self.BASE_URL}/applications/shops/{self.shop_id}/listings"
-        
-        try:
-            response = requests.get(
-                endpoint,
-                params={"status": status, "limit": 100},
-                headers=self.headers
-            )
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Etsy listings error: {e}")
-            return {"success": False, "error": str(e)}
+        return self._get(self._shop_listings_url, "Etsy listings error",
+                         params={"status": status, "limit": 100})
     
     def update_inventory(self, listing_id: str, inventory: Dict) -> Dict:
         """재고 업데이트"""
-        endpoint = f"{self.BASE_URL}/applications/listings/{listing_id}/inventory"
-        
         payload = {
             "products": [{
                 "sku": inventory.get("sku", ""),
@@ -120,33 +208,26 @@ class EtsyAPI:
             }]
         }
         
-        try:
-            response = requests.put(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True, "data": response.json()}
-            
-        except Exception as e:
-            logger.error(f"Etsy inventory error: {e}")
-            return {"success": False, "error": str(e)}
+        return self._request("PUT", f"{self._listings_url}/{listing_id}/inventory", "Etsy inventory error",
+                             data=dumps_json(payload))
 
 
-class PayhipAPI:
+class PayhipAPI(PlatformAPI):
     """Payhip 플랫폼 자동화"""
     
+    __slots__ = ("api_key",)
+    
     BASE_URL = "https://api.payhip.com/v1"
     
     def __init__(self):
-        self.api_key = os.getenv("PAYHIP_API_KEY")
-        self.headers = {
+        self.api_key = _payhip_api_key()
+        super().__init__({
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
-        }
+        })
     
     def create_product(self, product_data: Dict) -> Dict:
         """Payhip 제품 생성"""
-        endpoint = f"{self.BASE_URL}/product"
-        
         payload = {
             "name": product_data.get("name"),
             "desc": product_data.get("description", ""),
@@ -162,28 +243,23 @@ class PayhipAPI:
             })
         }
         
-        try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.info(f"Payhip product created: {result.get('id')}")
-            
-            return {
-                "success": True,
-                "product_id": result.get("id"),
-                "url": result.get("url"),
-                "data": result
-            }
-            
-        except Exception as e:
-            logger.error(f"Payhip product error: {e}")
-            return {"success": False, "error": str(e)}
+        response = self._request("POST", f"{self.BASE_URL}/product", "Payhip product error",
+                                 data=dumps_json(payload))
+        if not response["success"]:
+            return response
+        
+        result = response["data"]
+        logger.info("Payhip product created: %s", result.get('id'))
+        
+        return {
+            "success": True,
+            "product_id": result.get("id"),
+            "url": result.get("url"),
+            "data": result
+        }
     
     def create_link(self, product_id: str, link_data: Dict) -> Dict:
         """유료 링크 생성 (개인화 결제 링크)"""
-        endpoint = f"{self.BASE_URL}/link"
-        
         payload = {
             "product_id": product_id,
             "custom_price": link_data.get("custom_price", 0),
@@ -192,44 +268,33 @@ class PayhipAPI:
             "max_count": link_data.get("max_count", 1)
         }
         
-        try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            return {
-                "success": True,
-                "link_id": response.json().get("id"),
-                "url": response.json().get("url")
-            }
-            
-        except Exception as e:
-            logger.error(f"Payhip link error: {e}")
-            return {"success": False, "error": str(e)}
+        response = self._request("POST", f"{self.BASE_URL}/link", "Payhip link error", data=dumps_json(payload))
+        if not response["success"]:
+            return response
+        
+        result = response["data"]
+        return {
+            "success": True,
+            "link_id": result.get("id"),
+            "url": result.get("url")
+        }
     
     def get_sales(self, start_date: str = None, end_date: str = None) -> Dict:
         """매출 조회"""
-        endpoint = f"{self.BASE_URL}/sales"
         params = {}
-        
         if start_date:
             params["start_date"] = start_date
         if end_date:
             params["end_date"] = end_date
         
-        try:
-            response = requests.get(endpoint, params=params, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Payhip sales error: {e}")
-            return {"success": False, "error": str(e)}
+        return self._get(f"{self.BASE_URL}/sales", "Payhip sales error", params=params)
 
 
 class PlatformExpansionManager:
     """플랫폼 확장 관리자"""
     
+    __slots__ = ("etsy", "payhip", "gumroad", "lemon_squeezy", "platform_configs")
+    
     def __init__(self):
         self.etsy = EtsyAPI()
         self.payhip = PayhipAPI()
@@ -277,36 +342,41 @@ class PlatformExpansionManager:
         price = template_data.get("price", 49)
         
         # 가격대별 최적 플랫폼 결정
-        if price <= 19:
-            # 저가: Etsy + Payhip
-            platforms = ["etsy", "payhip"]
-        elif price <= 79:
-            # 중가: Gumroad + Payhip + Etsy
-            platforms = ["gumroad", "payhip"]
-        else:
-            # 고가: Gumroad + Lemon Squeezy
-            platforms = ["gumroad", "lemon_squeezy"]
+        platforms = _PRICE_TIER_PLATFORMS[bisect.bisect_left(_PRICE_TIER_LIMITS, price)]
         
+        jobs = []
         for platform in platforms:
             config = self.platform_configs.get(platform)
             if not config:
                 continue
             
-            # 플랫폼별 데이터 변환
-            platform_data = self._adapt_for_platform(template_data, platform)
-            
-            # 배포 실행
+            # 배포 함수 선택
             if platform == "etsy":
-                result = self.etsy.create_listing(platform_data)
+                publish = self.etsy.create_listing
             elif platform == "payhip":
-                result = self.payhip.create_product(platform_data)
+                publish = self.payhip.create_product
             elif platform == "gumroad" and self.gumroad:
-                result = self.gumroad.publish_template(platform_data)
+                publish = self.gumroad.publish_template
             elif platform == "lemon_squeezy" and self.lemon_squeezy:
-                result = self.lemon_squeezy.publish_template(platform_data)
+                publish = self.lemon_squeezy.publish_template
             else:
                 continue
             
+            # 플랫폼별 데이터 변환
+            jobs.append((platform, publish, self._adapt_for_platform(template_data, platform)))
+        
+        # 플랫폼마다 다른 호스트이므로 동시에 배포 (소요 시간 = 가장 느린 플랫폼)
+        outcomes = []
+        if jobs:
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                futures = [executor.submit(publish, data) for _, publish, data in jobs]
+                for (platform, _, _), future in zip(jobs, futures):
+                    try:
+                        outcomes.append((platform, future.result()))
+                    except Exception as e:
+                        logger.error("Deployment to %s failed: %s", platform, e)
+        
+        for platform, result in outcomes:
             if result.get("success"):
                 results["deployments"].append({
                     "platform": platform,
@@ -314,63 +384,31 @@ class PlatformExpansionManager:
                     "product_id": result.get("product_id") or result.get("listing_id")
                 })
         
-        logger.info(f"Template distributed to {len(results['deployments'])} platforms")
+        logger.info("Template distributed to %s platforms", len(results['deployments']))
         
         return results
     
     def _adapt_for_platform(self, template_data: Dict, platform: str) -> Dict:
         """플랫폼별 데이터 변환"""
+        get = template_data.get
         adapted = {
-            "name": template_data.get("name", "")[:platform.get("max_title_length", 140)],
-            "description": template_data.get("description", ""),
-            "price": template_data.get("price", 0),
-            "tags": template_data.get("tags", [])[:13] if platform == "etsy" else template_data.get("tags", []),
-            "file_url": template_data.get("file_url", ""),
-            "preview_url": template_data.get("preview_url", "")
+            "name": get("name", "")[:_MAX_TITLE_LEN.get(platform, 140)],
+            "description": get("description", ""),
+            "price": get("price", 0),
+            "tags": get("tags", []),
+            "file_url": get("file_url", ""),
+            "preview_url": get("preview_url", "")
         }
         
-        if platform == "etsy":
-            adapted["taxonomy_id"] = 66  # Digital Downloads
-            adapted["materials"] = ["Digital", "Downloadable", "Template"]
-            adapted["style"] = ["Modern", "Professional"]
-        
-        elif platform == "payhip":
-            adapted["variants"] = [
-                {"name": "Basic", "price": template_data.get("price", 0)},
-                {"name": "Premium", "price": template_data.get("price", 0) * 1.5}
-            ]
+        adapter = _ADAPTERS.get(platform)
+        if adapter:
+            adapter(adapted, template_data)
         
         return adapted
     
     def get_platform_comparison(self) -> Dict:
         """플랫폼 비교 분석"""
-        return {
-            "gumroad": {
-                "fees": "10% + $0.50",
-                "pros": ["간편", "다양한 결제", "대형 커뮤니티"],
-                "cons": ["높은 수수료", "제한적 커스터마이징"],
-                "best_for": "일반 디지털 제품"
-            },
-            "etsy": {
-                "fees": "6.5% + $0.20/listing",
-                "pros": ["대형 마켓플레이스", "SEO 유리", "국제 노출"],
-                "cons": ["경쟁 심함", "신규 셀러 제한"],
-                "best_for": "디자인 중심 제품"
-            },
-            "payhip": {
-                "fees": "5% (무료플랜)",
-                "pros": ["저렴", "간편", "제휴 시스템"],
-                "cons": ["소규모 마켓플레이스", "제한적 분석"],
-                "best_for": "간편한 디지털 판매"
-            },
-            "lemon_squeezy": {
-                "fees": "5% + $0.50",
-                "pros": ["세금 자동 처리", "구독 지원", "다양한 통화"],
-                "cons": ["상대적으로 신규", "미국 중심"],
-                "best_for": "국제 판매"
-            }
-        }
-
+        return {platform: dict(info) for platform, info in _PLATFORM_COMPARISON.items()}
 
 # Export
 platform_expansion = PlatformExpansionManager()
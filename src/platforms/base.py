@@ -0,0 +1,55 @@
+"""Platform API base - 마켓플레이스 클라이언트 공통 세션/캐시/요청 처리"""
+import logging
+from typing import Any, Dict
+
+from core.http import IDEMPOTENT_METHODS, KEEPALIVE_SOCKET_OPTIONS, ResponseCache, create_session, loads_json
+
+logger = logging.getLogger(__name__)
+
+# (연결, 읽기) 타임아웃 - 한 번의 시도(최대 25초)가 main.py의 deploy_timeout(30초) 안에 끝나도록
+REQUEST_TIMEOUT = (5, 20)
+# 첫 실패 후 이 시간 안에 시작할 수 있는 재시도만 수행 (마지막 시도는 REQUEST_TIMEOUT만큼 더 걸릴 수 있음)
+RETRY_TIME_BUDGET = 20
+
+
+class PlatformAPI:
+    """플랫폼 REST 클라이언트 기반 클래스 (재시도 세션, GET 응답 캐시, 공통 오류 처리)"""
+
+    __slots__ = ("headers", "session", "_cache")
+
+    BASE_URL = ""
+
+    def __init__(self, headers: Dict[str, str], cache_ttl: float = 60):
+        self.headers = headers
+        # 429/5xx는 지수 백오프로 재시도 - 상품 생성 POST는 중복 생성을 막기 위해 연결 실패와
+        # Retry-After가 있는 429/503만 재시도, 읽기 타임아웃은 이미 시간을 다 썼으므로 재시도하지 않음
+        self.session = create_session(pool_connections=20, pool_maxsize=20, retries=5, backoff_factor=0.5,
+                                      status_forcelist=(429, 500, 502, 503, 504),
+                                      retry_methods=IDEMPOTENT_METHODS,
+                                      socket_options=KEEPALIVE_SOCKET_OPTIONS,
+                                      read_retries=0, retry_budget=RETRY_TIME_BUDGET)
+        self.session.headers.update(headers)
+        self._cache = ResponseCache(ttl=cache_ttl)
+
+    def _request(self, method: str, endpoint: str, error_label: str, **kwargs) -> Dict[str, Any]:
+        """API 호출 후 {"success": True, "data": 응답 JSON} 반환, 실패 시 error_label로 로그를 남기고 {"success": False, "error"} 반환
+        (GET은 캐시 사용, 그 외 메서드는 성공하면 캐시 무효화)"""
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        try:
+            if method == "GET":
+                data = self._cache.get_json(self.session, endpoint, **kwargs)
+            else:
+                response = self.session.request(method, endpoint, **kwargs)
+                response.raise_for_status()
+                self._cache.clear()
+                data = loads_json(response.content) if response.content else {}
+            return {"success": True, "data": data}
+
+        except Exception as e:
+            logger.error("%s: %s", error_label, e)
+            return {"success": False, "error": str(e)}
+
+    def _get(self, endpoint: str, error_label: str, **kwargs) -> Dict[str, Any]:
+        """조회 응답 JSON을 그대로 반환 (실패 시 오류 dict)"""
+        result = self._request("GET", endpoint, error_label, **kwargs)
+        return result["data"] if result["success"] else result
@@ -1,32 +1,79 @@
 """Platform Automation Module - Gumroad Integration"""
 import os
 import json
-import requests
+import secrets
 from typing import Dict, List, Optional
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 import logging
 
+from core.http import dumps_json
+from platforms.base import PlatformAPI
+
 logger = logging.getLogger(__name__)
 
 
-class GumroadAPI:
+@lru_cache(maxsize=1)
+def _gumroad_api_key() -> Optional[str]:
+    """환경 변수의 Gumroad API 키 (프로세스당 한 번만 읽음)"""
+    return os.getenv("GUMROAD_API_KEY")
+
+
+class _MultipartFileStream:
+    """파일 하나짜리 multipart/form-data 본문 - 디스크에서 청크 단위로 읽어 보내므로 파일 전체를 메모리에 올리지 않음"""
+    
+    __slots__ = ("boundary", "_head", "_tail", "_path", "_length")
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, field: str, file_path: str, content_type: str = "application/octet-stream"):
+        self.boundary = secrets.token_hex(16)
+        filename = os.path.basename(file_path).replace('"', "%22")
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+        self._path = file_path
+        self._length = len(self._head) + os.path.getsize(file_path) + len(self._tail)
+    
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+    
+    def __len__(self) -> int:
+        # requests가 Content-Length를 채우도록 전체 길이 제공 (chunked 전송 회피)
+        return self._length
+    
+    def __iter__(self):
+        # 재시도 시에도 처음부터 다시 읽을 수 있도록 반복할 때마다 파일을 새로 엶
+        yield self._head
+        with open(self._path, "rb") as f:
+            while chunk := f.read(self.CHUNK_SIZE):
+                yield chunk
+        yield self._tail
+
+
+class GumroadAPI(PlatformAPI):
     """Gumroad 플랫폼 자동화"""
     
+    __slots__ = ("api_key", "_products_url")
+    
     BASE_URL = "https://api.gumroad.com/v2"
     
     def __init__(self, api_key: str = None):
-        self.api_key = api_key or os.getenv("GUMROAD_API_KEY")
-        self.headers = {
+        self.api_key = api_key or _gumroad_api_key()
+        super().__init__({
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
-        }
+        })
+        self._products_url = f"{self.BASE_URL}/products"
     
     def create_product(self, product_data: Dict) -> Dict:
         """제품 생성 (템플릿 등록)"""
-        endpoint = f"{self.BASE_URL}/products"
-        
         payload = {
             "name": product_data.get("name"),
             "description": product_data.get("description"),
@@ -40,125 +87,65 @@ class GumroadAPI:
             "variants": product_data.get("variants", [])
         }
         
-        try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.info(f"Product created on Gumroad: {result.get('product', {}).get('name')}")
-            
-            return {
-                "success": True,
-                "product_id": result.get("product", {}).get("id"),
-                "url": result.get("product", {}).get("url"),
-                "data": result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating Gumroad product: {e}")
-            return {"success": False, "error": str(e)}
+        response = self._request("POST", self._products_url, "Error creating Gumroad product",
+                                 data=dumps_json(payload))
+        if not response["success"]:
+            return response
+        
+        result = response["data"]
+        product = result.get("product", {})
+        logger.info("Product created on Gumroad: %s", product.get('name'))
+        
+        return {
+            "success": True,
+            "product_id": product.get("id"),
+            "url": product.get("url"),
+            "data": result
+        }
     
     def upload_file(self, product_id: str, file_path: str) -> Dict:
         """제품 파일 업로드"""
-        endpoint = f"{self.BASE_URL}/products/{product_id}/upload"
-        
         try:
-            with open(file_path, "rb") as f:
-                files = {"file": f}
-                response = requests.post(
-                    endpoint, 
-                    files=files,
-                    headers={"Authorization": f"Bearer {self.api_key}"}
-                )
-                response.raise_for_status()
-                
-                return {"success": True, "data": response.json()}
-                
-        except Exception as e:
-            logger.error(f"Error uploading file to Gumroad: {e}")
+            body = _MultipartFileStream("file", file_path)
+        except OSError as e:
+            logger.error("Error uploading file to Gumroad: %s", e)
             return {"success": False, "error": str(e)}
+        
+        return self._request("POST", f"{self._products_url}/{product_id}/upload",
+                             "Error uploading file to Gumroad",
+                             data=body, headers={"Content-Type": body.content_type})
     
     def get_products(self, page: int = 1, limit: int = 100) -> Dict:
         """제품 목록 조회"""
-        endpoint = f"{self.BASE_URL}/products"
-        params = {"page": page, "limit": limit}
-        
-        try:
-            response = requests.get(endpoint, params=params, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Error getting Gumroad products: {e}")
-            return {"success": False, "error": str(e)}
+        return self._get(self._products_url, "Error getting Gumroad products",
+                         params={"page": page, "limit": limit})
     
     def update_product(self, product_id: str, update_data: Dict) -> Dict:
         """제품 업데이트"""
-        endpoint = f"{self.BASE_URL}/products/{product_id}"
-        
-        try:
-            response = requests.put(endpoint, json=update_data, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True, "data": response.json()}
-            
-        except Exception as e:
-            logger.error(f"Error updating Gumroad product: {e}")
-            return {"success": False, "error": str(e)}
+        return self._request("PUT", f"{self._products_url}/{product_id}", "Error updating Gumroad product",
+                             data=dumps_json(update_data))
     
     def delete_product(self, product_id: str) -> Dict:
         """제품 삭제"""
-        endpoint = f"{self.BASE_URL}/products/{product_id}"
-        
-        try:
-            response = requests.delete(endpoint, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True}
-            
-        except Exception as e:
-            logger.error(f"Error deleting Gumroad product: {e}")
-            return {"success": False, "error": str(e)}
+        result = self._request("DELETE", f"{self._products_url}/{product_id}", "Error deleting Gumroad product")
+        return {"success": True} if result["success"] else result
     
     def get_sales(self, start_date: str = None, end_date: str = None) -> Dict:
         """매출 조회"""
-        endpoint = f"{self.BASE_URL}/sales"
         params = {}
-        
         if start_date:
             params["started_after"] = start_date
         if end_date:
             params["started_before"] = end_date
         
-        try:
-            response = requests.get(endpoint, params=params, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Error getting Gumroad sales: {e}")
-            return {"success": False, "error": str(e)}
+        return self._get(f"{self.BASE_URL}/sales", "Error getting Gumroad sales", params=params)
     
     def get_earnings(self) -> Dict:
         """수익 조회"""
-        endpoint = f"{self.BASE_URL}/earnings"
-        
-        try:
-            response = requests.get(endpoint, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Error getting Gumroad earnings: {e}")
-            return {"success": False, "error": str(e)}
+        return self._get(f"{self.BASE_URL}/earnings", "Error getting Gumroad earnings")
     
     def create_subscription(self, product_id: str, subscription_data: Dict) -> Dict:
         """구독 제품 생성"""
-        endpoint = f"{self.BASE_URL}/products"
-        
         payload = {
             "name": subscription_data.get("name"),
             "description": subscription_data.get("description"),
@@ -169,60 +156,33 @@ class GumroadAPI:
             "template_id": subscription_data.get("template_id", ""),
         }
         
-        try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True, "data": response.json()}
-            
-        except Exception as e:
-            logger.error(f"Error creating subscription: {e}")
-            return {"success": False, "error": str(e)}
+        return self._request("POST", self._products_url, "Error creating subscription",
+                             data=dumps_json(payload))
     
     def get_webhook_subscriptions(self) -> List[Dict]:
         """웹훅 구독 목록 조회"""
-        endpoint = f"{self.BASE_URL}/webhook_subscriptions"
-        
-        try:
-            response = requests.get(endpoint, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json().get("webhook_subscriptions", [])
-            
-        except Exception as e:
-            logger.error(f"Error getting webhook subscriptions: {e}")
-            return []
+        result = self._request("GET", f"{self.BASE_URL}/webhook_subscriptions",
+                               "Error getting webhook subscriptions")
+        return result["data"].get("webhook_subscriptions", []) if result["success"] else []
     
     def register_webhook(self, url: str, events: List[str]) -> Dict:
         """웹훅 등록"""
-        endpoint = f"{self.BASE_URL}/webhook_subscriptions"
-        
-        payload = {
-            "url": url,
-            "events": events
-        }
-        
-        try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True, "data": response.json()}
-            
-        except Exception as e:
-            logger.error(f"Error registering webhook: {e}")
-            return {"success": False, "error": str(e)}
+        return self._request("POST", f"{self.BASE_URL}/webhook_subscriptions", "Error registering webhook",
+                             data=dumps_json({"url": url, "events": events}))
 
 
 class GumroadAutomation:
     """Gumroad 자동화 오케스트레이터"""
     
+    __slots__ = ("api", "daily_published_count")
+    
     def __init__(self, api_key: str = None):
         self.api = GumroadAPI(api_key)
         self.daily_published_count = 0
         
     def publish_template(self, template_data: Dict, file_path: str = None) -> Dict:
         """템플릿 자동 게시"""
-        logger.info(f"Publishing template to Gumroad: {template_data.get('name')}")
+        logger.info("Publishing template to Gumroad: %s", template_data.get('name'))
         
         # 1. 제품 생성
         product_result = self.api.create_product(template_data)
@@ -237,7 +197,7 @@ class GumroadAutomation:
                 file_path
             )
             if not upload_result.get("success"):
-                logger.warning(f"File upload failed: {upload_result.get('error')}")
+                logger.warning("File upload failed: %s", upload_result.get('error'))
         
         self.daily_published_count += 1
         
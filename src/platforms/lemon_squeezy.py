@@ -1,27 +1,44 @@
 """Platform Automation Module - Lemon Squeezy Integration"""
 import os
 import json
-import requests
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 
+from core.http import ResponseCache, dumps_json
+from platforms.base import REQUEST_TIMEOUT, PlatformAPI
+
 logger = logging.getLogger(__name__)
 
+# 일괄 게시 시 동시에 보내는 요청 수 상한
+BATCH_PUBLISH_WORKERS = 10
+
+# 조회 응답 캐시 유지 시간(초) - 스토어는 거의 바뀌지 않고, 제품/주문은 짧게
+STORES_CACHE_TTL = 600
+RESOURCE_CACHE_TTL = 30
+
 
-class LemonSqueezyAPI:
+class LemonSqueezyAPI(PlatformAPI):
     """Lemon Squeezy 플랫폼 자동화 - MoR (Merchant of Record) 세금 처리"""
     
+    __slots__ = ("api_key", "_stores_cache")
+    
     BASE_URL = "https://api.lemonsqueezy.com/v1"
     
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv("LEMON_SQUEEZY_API_KEY")
-        self.headers = {
+        super().__init__({
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/vnd.api+json",
             "Accept": "application/vnd.api+json"
-        }
+        }, cache_ttl=RESOURCE_CACHE_TTL)
+        self._stores_cache = ResponseCache(ttl=STORES_CACHE_TTL)
+    
+    def close(self):
+        """연결 풀 반환"""
+        self.session.close()
     
     def create_product(self, product_data: Dict) -> Dict:
         """제품 생성 (템플릿 등록)"""
@@ -65,23 +82,25 @@ class LemonSqueezyAPI:
             }
         }
         
-        try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.info(f"Product created on Lemon Squeezy: {result['data']['attributes']['name']}")
-            
-            return {
-                "success": True,
-                "product_id": result['data']['id'],
-                "buy_url": result['data']['attributes']['buy_url'],
-                "data": result
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating Lemon Squeezy product: {e}")
-            return {"success": False, "error": str(e)}
+        response = self._request("POST", endpoint, "Error creating Lemon Squeezy product", data=dumps_json(payload))
+        if not response["success"]:
+            return response
+        
+        result = response["data"]
+        product = result.get("data") if isinstance(result, dict) else None
+        if not isinstance(product, dict) or not product.get("id"):
+            logger.error("Error creating Lemon Squeezy product: unexpected response %.200s", result)
+            return {"success": False, "error": "Unexpected Lemon Squeezy response", "data": result}
+        
+        attributes = product.get("attributes") or {}
+        logger.info("Product created on Lemon Squeezy: %s", attributes.get('name'))
+        
+        return {
+            "success": True,
+            "product_id": product["id"],
+            "buy_url": attributes.get("buy_url"),
+            "data": result
+        }
     
     def create_variant(self, product_id: str, variant_data: Dict) -> Dict:
         """변형(가격 옵션) 생성"""
@@ -107,15 +126,7 @@ class LemonSqueezyAPI:
             }
         }
         
-        try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True, "data": response.json()}
-            
-        except Exception as e:
-            logger.error(f"Error creating variant: {e}")
-            return {"success": False, "error": str(e)}
+        return self._request("POST", endpoint, "Error creating variant", data=dumps_json(payload))
     
     def get_products(self, store_id: str = None, page: int = 1) -> Dict:
         """제품 목록 조회"""
@@ -125,15 +136,7 @@ class LemonSqueezyAPI:
         if store_id:
             params["filter[store]"] = store_id
         
-        try:
-            response = requests.get(endpoint, params=params, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Error getting Lemon Squeezy products: {e}")
-            return {"success": False, "error": str(e)}
+        return self._get(endpoint, "Error getting Lemon Squeezy products", params=params)
     
     def update_product(self, product_id: str, update_data: Dict) -> Dict:
         """제품 업데이트"""
@@ -147,63 +150,42 @@ class LemonSqueezyAPI:
             }
         }
         
-        try:
-            response = requests.patch(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True, "data": response.json()}
-            
-        except Exception as e:
-            logger.error(f"Error updating Lemon Squeezy product: {e}")
-            return {"success": False, "error": str(e)}
+        return self._request("PATCH", endpoint, "Error updating Lemon Squeezy product", data=dumps_json(payload))
     
     def delete_product(self, product_id: str) -> Dict:
         """제품 삭제"""
         endpoint = f"{self.BASE_URL}/products/{product_id}"
         
-        try:
-            response = requests.delete(endpoint, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True}
-            
-        except Exception as e:
-            logger.error(f"Error deleting Lemon Squeezy product: {e}")
-            return {"success": False, "error": str(e)}
+        response = self._request("DELETE", endpoint, "Error deleting Lemon Squeezy product")
+        return {"success": True} if response["success"] else response
     
-    def get_orders(self, store_id: str = None, status: str = None) -> Dict:
+    def get_orders(self, store_id: str = None, status: str = None, page: int = 1) -> Dict:
         """주문 목록 조회"""
         endpoint = f"{self.BASE_URL}/orders"
-        params = {"page": 1}
+        params = {"page": page}
         
         if store_id:
             params["filter[store]"] = store_id
         if status:
             params["filter[status]"] = status
         
-        try:
-            response = requests.get(endpoint, params=params, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Error getting orders: {e}")
-            return {"success": False, "error": str(e)}
+        return self._get(endpoint, "Error getting orders", params=params)
+    
+    def iter_orders(self, store_id: str = None, status: str = None) -> Iterator[Dict]:
+        """모든 페이지의 주문을 차례로 반환 (links.next가 없거나 조회 실패 시 중단)"""
+        page = 1
+        while True:
+            orders = self.get_orders(store_id, status, page)
+            yield from orders.get("data", [])
+            if not (orders.get("links") or {}).get("next"):
+                return
+            page += 1
     
     def get_order(self, order_id: str) -> Dict:
         """특정 주문 조회"""
         endpoint = f"{self.BASE_URL}/orders/{order_id}"
         
-        try:
-            response = requests.get(endpoint, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Error getting order: {e}")
-            return {"success": False, "error": str(e)}
+        return self._get(endpoint, "Error getting order")
     
     def create_subscription(self, variant_id: str, subscription_data: Dict) -> Dict:
         """구독 생성"""
@@ -224,15 +206,7 @@ class LemonSqueezyAPI:
             }
         }
         
-        try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True, "data": response.json()}
-            
-        except Exception as e:
-            logger.error(f"Error creating subscription: {e}")
-            return {"success": False, "error": str(e)}
+        return self._request("POST", endpoint, "Error creating subscription", data=dumps_json(payload))
     
     def get_license_keys(self, order_id: str = None) -> Dict:
         """라이선스 키 조회"""
@@ -242,15 +216,7 @@ class LemonSqueezyAPI:
         if order_id:
             params["filter[order]"] = order_id
         
-        try:
-            response = requests.get(endpoint, params=params, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Error getting license keys: {e}")
-            return {"success": False, "error": str(e)}
+        return self._get(endpoint, "Error getting license keys", params=params)
     
     def create_webhook(self, webhook_data: Dict) -> Dict:
         """웹훅 생성"""
@@ -268,28 +234,18 @@ class LemonSqueezyAPI:
             }
         }
         
-        try:
-            response = requests.post(endpoint, json=payload, headers=self.headers)
-            response.raise_for_status()
-            
-            return {"success": True, "data": response.json()}
-            
-        except Exception as e:
-            logger.error(f"Error creating webhook: {e}")
-            return {"success": False, "error": str(e)}
+        return self._request("POST", endpoint, "Error creating webhook", data=dumps_json(payload))
     
     def get_stores(self) -> Dict:
         """스토어 목록 조회"""
         endpoint = f"{self.BASE_URL}/stores"
         
         try:
-            response = requests.get(endpoint, headers=self.headers)
-            response.raise_for_status()
-            
-            return response.json()
+            # 스토어는 긴 TTL의 별도 캐시 사용
+            return self._stores_cache.get_json(self.session, endpoint, timeout=REQUEST_TIMEOUT)
             
         except Exception as e:
-            logger.error(f"Error getting stores: {e}")
+            logger.error("Error getting stores: %s", e)
             return {"success": False, "error": str(e)}
 
 
@@ -307,7 +263,7 @@ class LemonSqueezyAutomation:
         
         if stores.get("data"):
             self.store_id = stores["data"][0]["id"]
-            logger.info(f"Using Lemon Squeezy store: {self.store_id}")
+            logger.info("Using Lemon Squeezy store: %s", self.store_id)
             return True
         
         logger.error("No Lemon Squeezy store found")
@@ -319,7 +275,30 @@ class LemonSqueezyAutomation:
             if not self.initialize_store():
                 return {"success": False, "error": "Store not initialized"}
         
-        logger.info(f"Publishing template to Lemon Squeezy: {template_data.get('name')}")
+        result = self._create_product(template_data, file_path)
+        
+        if result.get("success"):
+            self.daily_published_count += 1
+        
+        return result
+    
+    def publish_templates_batch(self, items: List[Dict]) -> List[Dict]:
+        """여러 템플릿을 동시에 게시 (각 항목의 "file_path" 사용, 결과는 입력 순서)"""
+        if not items:
+            return []
+        if not self.store_id:
+            if not self.initialize_store():
+                return [{"success": False, "error": "Store not initialized"} for _ in items]
+        
+        with ThreadPoolExecutor(max_workers=min(BATCH_PUBLISH_WORKERS, len(items))) as executor:
+            results = list(executor.map(lambda item: self._create_product(item, item.get("file_path")), items))
+        
+        # 카운터는 워커 스레드가 아닌 여기서 한 번에 갱신
+        self.daily_published_count += sum(1 for result in results if result.get("success"))
+        return results
+    
+    def _create_product(self, template_data: Dict, file_path: Optional[str]) -> Dict:
+        logger.info("Publishing template to Lemon Squeezy: %s", template_data.get('name'))
         
         # 제품 데이터 준비
         product_data = {
@@ -331,26 +310,20 @@ class LemonSqueezyAutomation:
             "file_path": file_path or ""
         }
         
-        result = self.api.create_product(product_data)
-        
-        if result.get("success"):
-            self.daily_published_count += 1
-        
-        return result
+        return self.api.create_product(product_data)
     
     def get_performance_stats(self) -> Dict:
         """성능 통계"""
-        orders = self.api.get_orders()
-        
-        total_orders = len(orders.get("data", []))
-        total_revenue = sum(
-            order["attributes"]["total_formatted"]
-            for order in orders.get("data", [])
-        )
+        # total_formatted("$12.34")는 표시용 문자열이므로 센트 단위 정수 total로 합산
+        total_orders = 0
+        total_cents = 0
+        for order in self.api.iter_orders():
+            total_orders += 1
+            total_cents += int(order["attributes"].get("total") or 0)
         
         return {
             "total_orders": total_orders,
-            "total_revenue": total_revenue,
+            "total_revenue": total_cents / 100,
             "currency": "USD",
             "published_today": self.daily_published_count,
             "store_id": self.store_id
@@ -1,14 +1,171 @@
 """Quality Assurance Module - Template Validation and Risk Management"""
 import os
+import re
+import atexit
 import hashlib
+import importlib.util
 import json
-from typing import Dict, List, Tuple, Optional
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Sequence, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 import logging
 
+from core.config import RiskThresholds
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# imagehash(numpy/scipy 포함)와 PIL은 설치 여부만 확인하고, 첫 중복 검사 때 한 번만 import
+IMAGEHASH_AVAILABLE = (importlib.util.find_spec("imagehash") is not None
+                       and importlib.util.find_spec("PIL") is not None)
+
+# 이 거리 미만이면 유사 이미지로 판단 (64비트 phash 기준)
+SIMILARITY_THRESHOLD = 5
+
+
+class _KeywordMatcher:
+    """텍스트를 한 번만 훑어 여러 키워드를 동시에 찾는 매처 (pyahocorasick이 있으면 Aho-Corasick, 없으면 정규식)"""
+    
+    __slots__ = ("keywords", "_automaton", "_pattern", "_prefixes")
+    
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = tuple(keywords)
+        self._automaton = None
+        self._pattern = None
+        self._prefixes = {}
+        
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            # 전방 탐색으로 모든 위치에서 매칭해 겹치는 키워드도 놓치지 않음
+            alternation = "|".join(map(re.escape, sorted(self.keywords, key=len, reverse=True)))
+            self._pattern = re.compile(f"(?=({alternation}))")
+            # 한 위치에서는 가장 긴 키워드만 잡히므로, 그 키워드의 접두사인 키워드도 함께 발견된 것으로 처리
+            for keyword in self.keywords:
+                prefixes = tuple(k for k in self.keywords if k != keyword and keyword.startswith(k))
+                if prefixes:
+                    self._prefixes[keyword] = prefixes
+    
+    def find(self, text_lower: str) -> List[str]:
+        """text_lower에 포함된 키워드 목록 (정의 순서, 중복 없음)"""
+        if self._automaton is not None:
+            found = {keyword for _, keyword in self._automaton.iter(text_lower)}
+        else:
+            found = set(self._pattern.findall(text_lower))
+            for keyword in [k for k in found if k in self._prefixes]:
+                found.update(self._prefixes[keyword])
+        
+        if not found:
+            return []
+        return [keyword for keyword in self.keywords if keyword in found]
+
+
+class _BKTree:
+    """해밍 거리 BK-트리 - 거리 임계값 이내의 해시를 전체 비교 없이 탐색"""
+    
+    __slots__ = ("_root",)
+    
+    def __init__(self):
+        self._root = None  # [해시 값, 경로, {거리: 자식 노드}]
+    
+    def add(self, value: int, path: str):
+        node = [value, path, {}]
+        if self._root is None:
+            self._root = node
+            return
+        
+        current = self._root
+        while True:
+            distance = (value ^ current[0]).bit_count()
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+    
+    def find(self, value: int, max_distance: int) -> Optional[Tuple[str, int]]:
+        """max_distance 이하인 해시 하나의 (경로, 거리) 반환 - 없으면 None"""
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node_value, path, children = stack.pop()
+            distance = (value ^ node_value).bit_count()
+            if distance <= max_distance:
+                return path, distance
+            # 삼각 부등식상 |distance - 자식 거리| <= max_distance인 가지에만 후보가 있음
+            for child_distance in range(max(0, distance - max_distance), distance + max_distance + 1):
+                child = children.get(child_distance)
+                if child is not None:
+                    stack.append(child)
+        return None
+    
+    def find_all(self, value: int, max_distance: int) -> List[Tuple[str, int]]:
+        """max_distance 이하인 모든 해시의 (경로, 거리) 목록"""
+        matches = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node_value, path, children = stack.pop()
+            distance = (value ^ node_value).bit_count()
+            if distance <= max_distance:
+                matches.append((path, distance))
+            for child_distance in range(max(0, distance - max_distance), distance + max_distance + 1):
+                child = children.get(child_distance)
+                if child is not None:
+                    stack.append(child)
+        return matches
+
+
+# 일괄 검증 동시 작업 수 (이미지 디코딩/phash는 GIL을 풀기 때문에 코어 수만큼)
+MAX_VALIDATION_WORKERS = min(8, os.cpu_count() or 1)
+
+# 해시 로그 기록 배치 (최대 건수, 첫 항목 이후 모으는 시간(초))
+HASH_WRITE_BATCH_SIZE = 128
+HASH_WRITE_WINDOW = 0.1
+
+# SEO 키워드 밀도 계산용 단어 토큰
+_WORD_RE = re.compile(r"\w+")
+
+# Lemon Squeezy 금지 콘텐츠 키워드
+_LEMON_SQUEEZY_PROHIBITED = _KeywordMatcher(('nft', 'crypto', 'gambling', 'adult', 'weapon'))
+
+# AI 생성 문구 지표 (발견된 지표 하나당 0.1점)
+_AI_INDICATORS = _KeywordMatcher((
+    "as an ai", "i cannot", "as a language model",
+    "please note that", "it is important to note"
+))
+
+
+@lru_cache(maxsize=1)
+def _image_modules():
+    """(imagehash, PIL.Image) - 처음 호출할 때 import한 모듈을 이후 검사에서 재사용"""
+    import imagehash
+    from PIL import Image
+    return imagehash, Image
+
+
+def _file_digest(file_path: str) -> str:
+    """파일 내용의 BLAKE2b 다이제스트 (청크 단위로 읽어 파일 전체를 메모리에 올리지 않음)"""
+    # hashlib.file_digest는 3.11+ 전용이므로 3.10에서도 동작하도록 직접 읽음
+    digest = hashlib.blake2b(digest_size=8)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 @dataclass
 class QAReport:
@@ -26,9 +183,17 @@ class QualityAssuranceSystem:
     """품질 보장 시스템 - 모든 배포 전 필수 검증"""
     
     def __init__(self):
-        self.known_hashes_db = "template_hashes.json"
+        self.known_hashes_db = "template_hashes.jsonl"
+        self.legacy_hashes_db = "template_hashes.json"
+        self.content_hashes_db = "template_content_hashes.jsonl"
         self.forbidden_keywords = self._load_forbidden_keywords()
+        self._trademark_matcher = _KeywordMatcher(self.forbidden_keywords)
+        self._hash_lock = threading.Lock()  # 해시 조회~추가를 한 단위로 (일괄 검증 시 동시 삽입 방지)
+        self._write_queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
         self.load_hash_database()
+        atexit.register(self.flush)
     
     def _load_forbidden_keywords(self) -> List[str]:
         """상표권 침해 키워드 로드"""
@@ -41,81 +206,214 @@ class QualityAssuranceSystem:
         ]
     
     def load_hash_database(self):
-        """해시 데이터베이스 로드"""
+        """해시 데이터베이스 로드 (JSONL: 한 줄에 {경로: phash} 하나, 나중 줄이 우선)"""
         if os.path.exists(self.known_hashes_db):
-            try:
-                with open(self.known_hashes_db, 'r') as f:
-                    self.existing_hashes = json.load(f)
-            except:
-                self.existing_hashes = {}
+            self.existing_hashes = self._read_jsonl_map(self.known_hashes_db)
         else:
             self.existing_hashes = {}
+            self._migrate_legacy_hash_database()
+        
+        # 파일 내용 다이제스트 -> 경로 (완전히 같은 파일은 phash 계산 전에 걸러냄)
+        self.content_hashes = self._read_jsonl_map(self.content_hashes_db)
+        
+        # 파일에는 경로→해시 목록만 저장하고, 로드할 때 64비트 정수 BK-트리로 색인
+        self._hash_index = _BKTree()
+        for path, hex_hash in self.existing_hashes.items():
+            try:
+                self._hash_index.add(int(hex_hash, 16), path)
+            except (TypeError, ValueError):
+                logger.warning("Invalid hash in database for %s", path)
+    
+    def rebuild_index(self, paths: Sequence[str], hashes: Sequence[str]) -> List[Tuple[str, str, int]]:
+        """해시 데이터베이스를 주어진 (경로, phash) 목록으로 교체하고 색인 재구성
+        
+        외부 템플릿 묶음을 가져온 뒤 사용한다. 목록 안에서 임계값 미만으로 겹치는
+        (기존 경로, 새 경로, 거리) 쌍을 반환하며, 쌍 탐색은 BK-트리로 해 전체 쌍 비교를 피한다.
+        """
+        index = _BKTree()
+        entries = {}
+        similar_pairs = []
+        for path, hex_hash in zip(paths, hashes):
+            try:
+                value = int(hex_hash, 16)
+            except (TypeError, ValueError):
+                logger.warning("Invalid hash skipped during rebuild: %s", path)
+                continue
+            similar_pairs.extend((other, path, distance)
+                                 for other, distance in index.find_all(value, SIMILARITY_THRESHOLD - 1))
+            index.add(value, path)
+            entries[path] = hex_hash
+        
+        with self._hash_lock:
+            self.existing_hashes = entries
+            # 목록에 없는 경로의 내용 다이제스트는 더 이상 유효하지 않음
+            self.content_hashes = {digest: path for digest, path in self.content_hashes.items() if path in entries}
+            self._hash_index = index
+            self.save_hash_database()
+        
+        logger.info("Rebuilt hash index: %s templates, %s similar pairs", len(entries), len(similar_pairs))
+        return similar_pairs
+    
+    def _read_jsonl_map(self, file_path: str) -> Dict[str, str]:
+        """JSONL 맵 파일 읽기 - 잘린 줄이 있으면 건너뛰고 파일을 정리"""
+        entries = {}
+        if not os.path.exists(file_path):
+            return entries
+        
+        corrupted = False
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entries.update(json.loads(line))
+                except ValueError:
+                    corrupted = True  # 중단된 쓰기로 잘린 줄은 건너뜀
+        
+        if corrupted:
+            logger.warning("Skipped corrupted lines in %s", file_path)
+            self._write_jsonl_map(file_path, entries)
+        return entries
+    
+    def _migrate_legacy_hash_database(self):
+        """구버전 template_hashes.json을 JSONL 형식으로 변환"""
+        if not os.path.exists(self.legacy_hashes_db):
+            return
+        try:
+            with open(self.legacy_hashes_db, 'r') as f:
+                self.existing_hashes = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Legacy hash database unreadable, starting empty (%s: %s)", type(e).__name__, e)
+            return
+        self._write_jsonl_map(self.known_hashes_db, self.existing_hashes)
     
     def save_hash_database(self):
-        """해시 데이터베이스 저장"""
-        with open(self.known_hashes_db, 'w') as f:
-            json.dump(self.existing_hashes, f, indent=2)
+        """해시 데이터베이스 전체를 다시 작성 (대기 중인 추가 기록을 먼저 반영)"""
+        self.flush()
+        self._write_jsonl_map(self.known_hashes_db, self.existing_hashes)
+        self._write_jsonl_map(self.content_hashes_db, self.content_hashes)
+    
+    def _write_jsonl_map(self, file_path: str, entries: Dict[str, str]):
+        """임시 파일에 쓴 뒤 교체 (도중에 중단되어도 기존 파일이 손상되지 않음)"""
+        tmp_file = file_path + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps({key: value}) + "\n" for key, value in entries.items())
+        os.replace(tmp_file, file_path)
+    
+    def _append_hash(self, image_path: str, hex_hash: str, content_hash: str):
+        """새 해시를 쓰기 대기열에 추가 (백그라운드 스레드가 묶어서 파일 끝에 추가하므로 검사가 디스크 쓰기를 기다리지 않음)"""
+        self._write_queue.put((image_path, hex_hash, content_hash))
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._writer_loop, name="qa-hash-writer", daemon=True)
+                    self._writer.start()
+    
+    def flush(self):
+        """대기 중인 해시 기록이 모두 파일에 쓰일 때까지 대기"""
+        if self._writer is not None:
+            self._write_queue.join()
+    
+    def _writer_loop(self):
+        while True:
+            batch = self._next_write_batch()
+            try:
+                with open(self.known_hashes_db, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps({path: hex_hash}) + "\n" for path, hex_hash, _ in batch)
+                with open(self.content_hashes_db, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps({content_hash: path}) + "\n" for path, _, content_hash in batch)
+            except OSError as e:
+                logger.error("Failed to write %s template hashes: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
+    def _next_write_batch(self) -> List[Tuple[str, str, str]]:
+        """첫 기록을 기다린 뒤 HASH_WRITE_WINDOW 동안 최대 HASH_WRITE_BATCH_SIZE건까지 모음"""
+        batch = [self._write_queue.get()]
+        deadline = time.monotonic() + HASH_WRITE_WINDOW
+        while len(batch) < HASH_WRITE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._write_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
     
     def check_duplicate_similarity(self, image_path: str = None) -> Tuple[bool, float]:
-        """중복/유사 이미지 검사 (phash 알고리즘)"""
+        """중복/유사 이미지 검사 (내용 다이제스트로 완전 중복을 먼저 거르고, 나머지는 phash 알고리즘)"""
         # 이미지 경로가 없거나 파일이 존재하지 않으면 검사 건너뛰기
         if not image_path or not os.path.exists(image_path):
             logger.info("No image file provided or file not found, skipping duplicate check")
             return True, 0
             
         try:
-            import imagehash
-            from PIL import Image
+            # 재업로드처럼 내용이 같은 파일은 이미지 디코딩 없이 바로 판정
+            content_hash = _file_digest(image_path)
+            duplicate_path = self.content_hashes.get(content_hash)
+            if duplicate_path:
+                logger.warning("Identical template found: %s", duplicate_path)
+                return False, 0
+            
+            if not IMAGEHASH_AVAILABLE:
+                logger.warning("imagehash not available, skipping duplicate check")
+                return True, 0
+            imagehash, Image = _image_modules()
             
             # 이미지 해시 계산
             with Image.open(image_path) as img:
                 phash = imagehash.phash(img)
                 current_hash = str(phash)
             
-            # 기존 해시와 비교
-            for existing_path, existing_hash in self.existing_hashes.items():
-                distance = self._hamming_distance(current_hash, existing_hash)
+            current_value = int(current_hash, 16)
+            with self._hash_lock:
+                # 디코딩하는 동안 다른 스레드가 같은 파일을 등록했을 수 있으므로 다시 확인
+                duplicate_path = self.content_hashes.get(content_hash)
+                if duplicate_path:
+                    logger.warning("Identical template found: %s", duplicate_path)
+                    return False, 0
                 
-                if distance < 5:  # 유사도 임계값
-                    logger.warning(f"Similar template found: {existing_path}")
+                # 기존 해시와 비교 (XOR 후 1인 비트 수 = 해밍 거리)
+                similar = self._hash_index.find(current_value, SIMILARITY_THRESHOLD - 1)
+                if similar:
+                    existing_path, distance = similar
+                    logger.warning("Similar template found: %s", existing_path)
                     return False, distance
-            
-            # 새 해시 저장
-            self.existing_hashes[image_path] = current_hash
-            self.save_hash_database()
+                
+                # 새 해시 저장
+                self.existing_hashes[image_path] = current_hash
+                self.content_hashes[content_hash] = image_path
+                self._hash_index.add(current_value, image_path)
+                self._append_hash(image_path, current_hash, content_hash)
             
             return True, 0
             
-        except ImportError:
-            logger.warning("imagehash not available, skipping duplicate check")
-            return True, 0
         except Exception as e:
-            logger.error(f"Error in duplicate check: {e}")
+            logger.error("Error in duplicate check: %s", e)
             return True, 0  # 에러 시 통과
     
     def _hamming_distance(self, hash1: str, hash2: str) -> int:
         """해밍 거리 계산 (phash 비교)"""
         try:
-            h1 = imagehash.hex_to_hash(hash1)
-            h2 = imagehash.hex_to_hash(hash2)
-            return abs(h1 - h2)
-        except:
+            return (int(hash1, 16) ^ int(hash2, 16)).bit_count()
+        except (TypeError, ValueError):
             return 10  # 에러 시 거리가 먼 것으로 처리
     
-    def check_trademark_keywords(self, text: str) -> List[str]:
-        """상표권 키워드 검사"""
-        text_lower = text.lower()
+    def check_trademark_keywords(self, text: str, text_lower: str = None) -> List[str]:
+        """상표권 키워드 검사 (text_lower: 이미 소문자로 바꾼 text가 있으면 재사용)"""
         issues = []
         
-        for keyword in self.forbidden_keywords:
-            if keyword in text_lower:
-                issues.append(f"상표권 키워드 발견: {keyword}")
-                logger.warning(f"Trademark keyword found: {keyword}")
+        for keyword in self._trademark_matcher.find(text_lower if text_lower is not None else text.lower()):
+            issues.append(f"상표권 키워드 발견: {keyword}")
+            logger.warning("Trademark keyword found: %s", keyword)
         
         return issues
     
-    def check_platform_policy_compliance(self, template_data: Dict, platform: str) -> Tuple[bool, List[str]]:
-        """플랫폼 정책 준수 검사"""
+    def check_platform_policy_compliance(self, template_data: Dict, platform: str,
+                                         description_lower: str = None) -> Tuple[bool, List[str]]:
+        """플랫폼 정책 준수 검사 (description_lower: 소문자 설명 재사용)"""
         issues = []
         
         # Gumroad 정책
@@ -142,34 +440,27 @@ class QualityAssuranceSystem:
         
         # Lemon Squeezy 정책
         elif platform == "lemon_squeezy":
-            prohibited = ['nft', 'crypto', 'gambling', 'adult', 'weapon']
-            for item in prohibited:
-                if item in template_data.get("description", "").lower():
-                    issues.append(f"Lemon Squeezy: 금지된 콘텐츠 ({item})")
+            if description_lower is None:
+                description_lower = template_data.get("description", "").lower()
+            for item in _LEMON_SQUEEZY_PROHIBITED.find(description_lower):
+                issues.append(f"Lemon Squeezy: 금지된 콘텐츠 ({item})")
         
         return len(issues) == 0, issues
     
-    def check_ai_generated_content(self, content: str) -> Tuple[bool, float]:
+    def check_ai_generated_content(self, content: str, content_lower: str = None) -> Tuple[bool, float]:
         """AI 생성 콘텐츠 검사 (Copyleaks API 활용 권장)"""
         # 기본적인 키워드 기반 검사
-        ai_indicators = [
-            "as an ai", "i cannot", "as a language model",
-            "please note that", "it is important to note"
-        ]
-        
-        score = 0
-        for indicator in ai_indicators:
-            if indicator in content.lower():
-                score += 0.1
+        score = 0.1 * len(_AI_INDICATORS.find(content_lower if content_lower is not None else content.lower()))
         
         # 임계값 (30%)
         passed = score < 0.30
-        logger.info(f"AI content score: {score:.2%}, Passed: {passed}")
+        logger.info("AI content score: %.2f%%, Passed: %s", score * 100, passed)
         
         return passed, score
     
-    def check_seo_optimization(self, template_data: Dict) -> Tuple[bool, List[str]]:
-        """SEO 최적화 검사"""
+    def check_seo_optimization(self, template_data: Dict, title_lower: str = None,
+                               description_lower: str = None) -> Tuple[bool, List[str]]:
+        """SEO 최적화 검사 (title_lower/description_lower: 소문자 제목/설명 재사용)"""
         issues = []
         
         title = template_data.get("name", "")
@@ -186,9 +477,16 @@ class QualityAssuranceSystem:
             issues.append("태그가 부족합니다 (최소 3개 권장)")
         
         # 키워드 밀도
-        important_words = title.lower().split()
+        if title_lower is None:
+            title_lower = title.lower()
+        if description_lower is None:
+            description_lower = description.lower()
+        
+        # 설명은 단어 집합으로 한 번만 만들어 제목 단어마다 O(1)로 확인
+        important_words = _WORD_RE.findall(title_lower)
         if important_words:
-            matches = sum(1 for word in important_words if word in description.lower())
+            description_words = set(_WORD_RE.findall(description_lower))
+            matches = sum(1 for word in important_words if word in description_words)
             if matches / len(important_words) < 0.3:
                 issues.append("제목 키워드가 설명에 충분히 포함되지 않았습니다")
         
@@ -196,11 +494,15 @@ class QualityAssuranceSystem:
     
     def validate_template(self, template_data: Dict, image_path: str = None, platform: str = "gumroad") -> QAReport:
         """템플릿 전체 검증"""
-        logger.info(f"Validating template: {template_data.get('name')}")
+        logger.info("Validating template: %s", template_data.get('name'))
         
-        checks = {}
-        issues = []
-        recommendations = []
+        # 검사마다 다시 lower()하지 않도록 소문자 텍스트를 한 번만 만들어 전달
+        title = template_data.get('name', '')
+        description = template_data.get('description', '')
+        title_lower = title.lower()
+        description_lower = description.lower()
+        full_text = f"{title} {description}"
+        full_text_lower = f"{title_lower} {description_lower}"
         
         # 1. 중복 검사
         duplicate_passed = True
@@ -208,65 +510,61 @@ class QualityAssuranceSystem:
         if image_path:
             duplicate_passed, similarity_score = self.check_duplicate_similarity(image_path)
         
-        checks["duplicate_check"] = {
-            "passed": duplicate_passed,
-            "similarity_score": similarity_score,
-            "details": "중복/유사 템플릿 검사"
-        }
-        
-        if not duplicate_passed:
-            issues.append("유사한 템플릿이 이미 존재합니다")
-            recommendations.append("더 차별화된 템플릿을 제작하세요")
-        
         # 2. 상표권 키워드 검사
-        full_text = f"{template_data.get('name', '')} {template_data.get('description', '')}"
-        trademark_issues = self.check_trademark_keywords(full_text)
-        
-        checks["trademark_check"] = {
-            "passed": len(trademark_issues) == 0,
-            "issues": trademark_issues,
-            "details": "상표권 키워드 검사"
-        }
-        
-        issues.extend(trademark_issues)
+        trademark_issues = self.check_trademark_keywords(full_text, full_text_lower)
+        trademark_passed = not trademark_issues
         
         # 3. 플랫폼 정책 준수
-        policy_passed, policy_issues = self.check_platform_policy_compliance(template_data, platform)
-        
-        checks["policy_check"] = {
-            "passed": policy_passed,
-            "issues": policy_issues,
-            "details": f"{platform} 정책 준수"
-        }
-        
-        issues.extend(policy_issues)
+        policy_passed, policy_issues = self.check_platform_policy_compliance(template_data, platform, description_lower)
         
         # 4. AI 콘텐츠 검사
-        ai_passed, ai_score = self.check_ai_generated_content(full_text)
+        ai_passed, ai_score = self.check_ai_generated_content(full_text, full_text_lower)
         
-        checks["ai_content_check"] = {
-            "passed": ai_passed,
-            "ai_score": ai_score,
-            "details": "AI 생성 콘텐츠 검사"
+        # 5. SEO 최적화
+        seo_passed, seo_issues = self.check_seo_optimization(template_data, title_lower, description_lower)
+        
+        checks = {
+            "duplicate_check": {
+                "passed": duplicate_passed,
+                "similarity_score": similarity_score,
+                "details": "중복/유사 템플릿 검사"
+            },
+            "trademark_check": {
+                "passed": trademark_passed,
+                "issues": trademark_issues,
+                "details": "상표권 키워드 검사"
+            },
+            "policy_check": {
+                "passed": policy_passed,
+                "issues": policy_issues,
+                "details": f"{platform} 정책 준수"
+            },
+            "ai_content_check": {
+                "passed": ai_passed,
+                "ai_score": ai_score,
+                "details": "AI 생성 콘텐츠 검사"
+            },
+            "seo_check": {
+                "passed": seo_passed,
+                "issues": seo_issues,
+                "details": "SEO 최적화 검사"
+            }
         }
         
+        issues = []
+        recommendations = []
+        if not duplicate_passed:
+            issues.append("유사한 템플릿이 이미 존재합니다")
+            recommendations.append("더 차별화된 템플릿을 제작하세요")
+        issues.extend(trademark_issues)
+        issues.extend(policy_issues)
         if not ai_passed:
             issues.append(f"AI 생성 콘텐츠 비율이 높습니다 ({ai_score:.1%})")
             recommendations.append("더 인간적인 언어로 재작성하세요")
-        
-        # 5. SEO 최적화
-        seo_passed, seo_issues = self.check_seo_optimization(template_data)
-        
-        checks["seo_check"] = {
-            "passed": seo_passed,
-            "issues": seo_issues,
-            "details": "SEO 최적화 검사"
-        }
-        
         issues.extend(seo_issues)
         
         # 종합 결과
-        all_passed = all(check["passed"] for check in checks.values())
+        all_passed = duplicate_passed and trademark_passed and policy_passed and ai_passed and seo_passed
         
         # 리스크 점수 계산
         risk_score = (
@@ -276,19 +574,32 @@ class QualityAssuranceSystem:
             (0.2 if not ai_passed else 0)
         )
         
+        now = datetime.now()
         return QAReport(
-            template_id=template_data.get("template_id", str(datetime.now().timestamp())),
+            template_id=template_data.get("template_id", str(now.timestamp())),
             passed=all_passed,
             checks=checks,
             issues_found=issues,
             recommendations=recommendations,
-            created_at=datetime.now(),
+            created_at=now,
             risk_score=min(1.0, risk_score)
         )
     
+    def validate_batch(self, templates: Sequence[Dict], image_paths: Sequence[Optional[str]] = None,
+                       platform: str = "gumroad") -> List[QAReport]:
+        """여러 템플릿 동시 검증 (image_paths는 templates와 같은 순서, 결과도 입력 순서)"""
+        if not templates:
+            return []
+        if image_paths is None:
+            image_paths = [None] * len(templates)
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_VALIDATION_WORKERS, len(templates))) as executor:
+            return list(executor.map(lambda data, path: self.validate_template(data, path, platform),
+                                     templates, image_paths))
+    
     def generate_qa_report_summary(self, report: QAReport) -> str:
         """QA 보고서 요약 생성"""
-        summary = f"""
+        parts = [f"""
 === 품질 검증 보고서 ===
 템플릿 ID: {report.template_id}
 검증 시간: {report.created_at.strftime('%Y-%m-%d %H:%M:%S')}
@@ -297,22 +608,52 @@ class QualityAssuranceSystem:
 리스크 점수: {report.risk_score:.2%}
 
 === 개별 검사 결과 ===
-"""
-        for check_name, check_result in report.checks.items():
-            status = '✅' if check_result['passed'] else '❌'
-            summary += f"{status} {check_result['details']}\n"
+"""]
+        parts.extend(f"{'✅' if check_result['passed'] else '❌'} {check_result['details']}\n"
+                     for check_result in report.checks.values())
         
         if report.issues_found:
-            summary += f"\n=== 발견된 이슈 ({len(report.issues_found)}개) ===\n"
-            for issue in report.issues_found:
-                summary += f"• {issue}\n"
+            parts.append(f"\n=== 발견된 이슈 ({len(report.issues_found)}개) ===\n")
+            parts.extend(f"• {issue}\n" for issue in report.issues_found)
         
         if report.recommendations:
-            summary += f"\n=== 권장사항 ===\n"
-            for rec in report.recommendations:
-                summary += f"• {rec}\n"
+            parts.append("\n=== 권장사항 ===\n")
+            parts.extend(f"• {rec}\n" for rec in report.recommendations)
         
-        return summary
+        return "".join(parts)
+
+# 플랫폼별 기본 리스크
+_PLATFORM_RISKS: Mapping[str, float] = MappingProxyType({
+    "gumroad": 0.3,
+    "etsy": 0.6,  # 더 엄격한 정책
+    "lemon_squeezy": 0.25,
+    "payhip": 0.3
+})
+
+# 시나리오별 자율 대응
+_AUTONOMOUS_RESPONSES: Mapping[str, Mapping] = MappingProxyType({
+    "ai_quality_degrade": MappingProxyType({
+        "action": "adjust_ai_parameters",
+        "steps": ("increase_creativity_param", "add_human_review_step", "update_training_data")
+    }),
+    "platform_api_error": MappingProxyType({
+        "action": "retry_with_backoff",
+        "steps": ("exponential_backoff", "switch_alternative_platform", "manual_alert")
+    }),
+    "sales_decline": MappingProxyType({
+        "action": "marketing_intervention",
+        "steps": ("price_optimize", "update_descriptions", "social_media_promo")
+    }),
+    "copyright_claim": MappingProxyType({
+        "action": "immediate_takedown",
+        "steps": ("hide_product", "alert_owner", "document_incident")
+    }),
+    "account_suspension_risk": MappingProxyType({
+        "action": "risk_mitigation",
+        "steps": ("reduce_posting_frequency", "diversify_content", "backup_platform_focus")
+    })
+})
+_DEFAULT_RESPONSE: Mapping = MappingProxyType({"action": "manual_review", "steps": ("alert_operator",)})
 
 
 class RiskManagementSystem:
@@ -325,14 +666,7 @@ class RiskManagementSystem:
     
     def assess_platform_risk(self, platform: str) -> float:
         """플랫폼 리스크 평가"""
-        platform_risks = {
-            "gumroad": 0.3,
-            "etsy": 0.6,  # 더 엄격한 정책
-            "lemon_squeezy": 0.25,
-            "payhip": 0.3
-        }
-        
-        base_risk = platform_risks.get(platform, 0.5)
+        base_risk = _PLATFORM_RISKS.get(platform, 0.5)
         
         # 에러 이력 반영
         error_count = self.error_counts.get(platform, 0)
@@ -343,8 +677,6 @@ class RiskManagementSystem:
     
     def should_adjust_strategy(self, metrics: Dict) -> Dict:
         """전략 조정 필요 여부 판단 (RiskThresholds 활용)"""
-        from ..core.config import RiskThresholds
-        
         adjustments = {}
         
         # AI 감지율太高
@@ -372,30 +704,7 @@ class RiskManagementSystem:
     
     def autonomous_response(self, scenario: str, context: Dict) -> Dict:
         """자율 대응 결정"""
-        responses = {
-            "ai_quality_degrade": {
-                "action": "adjust_ai_parameters",
-                "steps": ["increase_creativity_param", "add_human_review_step", "update_training_data"]
-            },
-            "platform_api_error": {
-                "action": "retry_with_backoff",
-                "steps": ["exponential_backoff", "switch_alternative_platform", "manual_alert"]
-            },
-            "sales_decline": {
-                "action": "marketing_intervention",
-                "steps": ["price_optimize", "update_descriptions", "social_media_promo"]
-            },
-            "copyright_claim": {
-                "action": "immediate_takedown",
-                "steps": ["hide_product", "alert_owner", "document_incident"]
-            },
-            "account_suspension_risk": {
-                "action": "risk_mitigation",
-                "steps": ["reduce_posting_frequency", "diversify_content", "backup_platform_focus"]
-            }
-        }
-        
-        return responses.get(scenario, {"action": "manual_review", "steps": ["alert_operator"]})
+        return dict(_AUTONOMOUS_RESPONSES.get(scenario, _DEFAULT_RESPONSE))
 
 
 # Export
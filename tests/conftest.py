@@ -0,0 +1,7 @@
+"""pytest 설정 - src 모듈을 main.py와 같은 방식으로 import"""
+import sys
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
@@ -0,0 +1,64 @@
+"""결제 QR URI (EIP-681 / BIP-21 / Solana Pay) 테스트"""
+import pytest
+
+from payments.multi_wallet_crypto import CryptoCurrency, MultiWalletPaymentSystem
+
+RECIPIENT = "0x1111111111111111111111111111111111111111"
+
+
+@pytest.fixture
+def payments(monkeypatch):
+    monkeypatch.setenv("METAMASK_ETH_ADDRESS", RECIPIENT)
+    system = MultiWalletPaymentSystem()
+    monkeypatch.setattr(system, "_get_exchange_rate", lambda symbol: 1.0)
+    return system
+
+
+@pytest.mark.parametrize("crypto, expected", [
+    (CryptoCurrency.ETH, f"ethereum:{RECIPIENT}?value=49000000000000000000"),
+    (CryptoCurrency.USDC_ETH,
+     f"ethereum:0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48@1/transfer?address={RECIPIENT}&uint256=49000000"),
+    (CryptoCurrency.USDT_ETH,
+     f"ethereum:0xdAC17F958D2ee523a2206206994597C13D831ec7@1/transfer?address={RECIPIENT}&uint256=49000000"),
+    (CryptoCurrency.USDC_POL,
+     f"ethereum:0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359@137/transfer?address={RECIPIENT}&uint256=49000000"),
+])
+def test_evm_qr_uri(payments, crypto, expected):
+    base_units = 49 * 10 ** (18 if crypto is CryptoCurrency.ETH else 6)
+    assert payments._generate_qr_code(RECIPIENT, base_units, "49", crypto) == expected
+
+
+@pytest.mark.parametrize("crypto, expected", [
+    (CryptoCurrency.BTC, "bitcoin:addr?amount=0.5"),
+    (CryptoCurrency.SOL, "solana:addr?amount=0.5"),
+    (CryptoCurrency.USDC_SOL, "solana:addr?amount=0.5&spl-token=EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"),
+])
+def test_decimal_amount_qr_uri(payments, crypto, expected):
+    assert payments._generate_qr_code("addr", 0, "0.5", crypto) == expected
+
+
+@pytest.mark.parametrize("symbol", ["USDC", "USDT"])
+def test_stablecoin_payment_request_uses_token_transfer(payments, symbol):
+    payment = payments.create_payment_request(49, symbol, "ord_1")["payment_data"]
+    assert payment["qr_code"].endswith(f"/transfer?address={RECIPIENT}&uint256=49000000")
+    assert "value=" not in payment["qr_code"]
+
+
+@pytest.mark.parametrize("platform", ["stripe", "manual_wallet"])
+def test_platform_options_are_unique_per_network(monkeypatch, platform):
+    monkeypatch.setenv("METAMASK_ETH_ADDRESS", RECIPIENT)
+    monkeypatch.setenv("PHANTOM_SOL_ADDRESS", "sol-addr")
+    system = MultiWalletPaymentSystem()
+    monkeypatch.setattr(system, "_get_exchange_rates_bulk", lambda symbols: dict.fromkeys(symbols, 1.0))
+    options = [(opt["symbol"], opt["network"]) for opt in system.get_optimal_crypto_for_platform(platform)]
+    assert len(options) == len(set(options))
+    assert ("USDC", "ethereum") in options and ("USDC", "solana") in options
+
+
+def test_payment_request_resolves_symbol_on_requested_network(payments, monkeypatch):
+    monkeypatch.setenv("PHANTOM_SOL_ADDRESS", "sol-addr")
+    system = MultiWalletPaymentSystem()
+    monkeypatch.setattr(system, "_get_exchange_rate", lambda symbol: 1.0)
+    payment = system.create_payment_request(49, "USDC", "ord_1", "solana")["payment_data"]
+    assert payment["network"] == "solana"
+    assert payment["qr_code"].endswith("&spl-token=EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v")
@@ -0,0 +1,52 @@
+"""TranslationEngine 긴 텍스트 청크 분할 회귀 테스트"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from ai.multilingual import _MAX_CHUNK, _chunk_text, Language, TranslationEngine
+
+
+class FakeCompletions:
+    """단일/일괄 요청 모두 대문자로 '번역'하는 OpenAI 대체"""
+
+    def __init__(self):
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        content = kwargs["messages"][-1]["content"]
+        if "response_format" in kwargs:
+            items = json.loads(content)["items"]
+            content = json.dumps({"items": [{"i": item["i"], "t": item["t"].upper()} for item in items]})
+        else:
+            content = content.upper()
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = TranslationEngine()
+    engine.cache_file = str(tmp_path / engine.cache_file)  # atexit 저장도 임시 디렉터리로
+    completions = FakeCompletions()
+    engine.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    engine.completions = completions
+    return engine
+
+
+UNSPLITTABLE = pytest.mark.parametrize("text", ["a" * 5000, "word " * 400], ids=["no-whitespace", "no-punctuation"])
+
+
+@UNSPLITTABLE
+def test_unsplittable_text_is_hard_split(text):
+    chunks = _chunk_text(text)
+    assert "".join(body + trail for body, trail in chunks) == text
+    assert all(len(body) <= _MAX_CHUNK for body, _ in chunks)
+
+
+@UNSPLITTABLE
+def test_translate_text_without_sentence_breaks(engine, text):
+    translated = engine.translate_text(text, Language.SPANISH)
+    assert translated == text.upper()
+    assert engine.completions.requests